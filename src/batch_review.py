@@ -0,0 +1,168 @@
+"""Asynchronous review through the Anthropic Message Batches API.
+
+When a run finds more candidates than it can safely review inside the
+Lambda timeout, they are submitted as one message batch and the batch id is
+saved to the state store. Later invocations collect finished batches and
+write the results to the sheet.
+"""
+
+import logging
+import time
+from dataclasses import dataclass
+from typing import Callable, Iterable, Protocol
+import anthropic
+from src.models import Listing, ReviewResult
+from src.reviewer import TokenUsage, build_request, parse_review
+from src.storage import Store, load_json, save_json
+
+logger = logging.getLogger(__name__)
+
+PENDING_KEY = "pending_batches.json"
+
+
+@dataclass
+class BatchEntry:
+    custom_id: str
+    succeeded: bool
+    text: str = ""
+    usage: object = None
+
+
+class BatchBackend(Protocol):
+    def submit(self, requests: list[dict]) -> str: ...
+
+    def is_done(self, batch_id: str) -> bool: ...
+
+    def results(self, batch_id: str) -> Iterable[BatchEntry]: ...
+
+
+class AnthropicBatchBackend:
+    def __init__(self, client: anthropic.Anthropic):
+        self.client = client
+
+    def submit(self, requests: list[dict]) -> str:
+        return self.client.messages.batches.create(requests=requests).id
+
+    def is_done(self, batch_id: str) -> bool:
+        return self.client.messages.batches.retrieve(batch_id).processing_status == "ended"
+
+    def results(self, batch_id: str) -> Iterable[BatchEntry]:
+        for item in self.client.messages.batches.results(batch_id):
+            if item.result.type != "succeeded":
+                yield BatchEntry(custom_id=item.custom_id, succeeded=False)
+                continue
+            message = item.result.message
+            yield BatchEntry(
+                custom_id=item.custom_id,
+                succeeded=True,
+                text=message.content[0].text if message.content else "",
+                usage=message.usage,
+            )
+
+
+class LocalBatchBackend:
+    """Offline stand-in for the Batches API.
+
+    Each request's params are passed to `respond`, which returns the text
+    Claude would have answered (or None to simulate an errored request).
+    Batches report done after `polls_until_done` is_done() calls.
+    """
+
+    def __init__(self, respond: Callable[[dict], str | None], polls_until_done: int = 0):
+        self.respond = respond
+        self.polls_until_done = polls_until_done
+        self.batches: dict[str, dict] = {}
+
+    def submit(self, requests: list[dict]) -> str:
+        batch_id = f"local-batch-{len(self.batches) + 1}"
+        self.batches[batch_id] = {"requests": requests, "polls": 0}
+        return batch_id
+
+    def is_done(self, batch_id: str) -> bool:
+        batch = self.batches[batch_id]
+        batch["polls"] += 1
+        return batch["polls"] > self.polls_until_done
+
+    def results(self, batch_id: str) -> Iterable[BatchEntry]:
+        for request in self.batches[batch_id]["requests"]:
+            text = self.respond(request["params"])
+            yield BatchEntry(
+                custom_id=request["custom_id"],
+                succeeded=text is not None,
+                text=text or "",
+            )
+
+
+class BatchReviewer:
+    """Submits candidates as message batches and collects them on later runs.
+
+    Collected batches stay in the pending list until finish_collected() is
+    called, once their results are safely in the sheet.
+    """
+
+    def __init__(self, backend: BatchBackend, store: Store, clock=time.time):
+        self.backend = backend
+        self.store = store
+        self.clock = clock
+        self.collected_ids: set[str] = set()
+
+    def _pending(self) -> list[dict]:
+        return load_json(self.store, PENDING_KEY, [])
+
+    def pending_links(self) -> set[str]:
+        """Links already submitted in a batch that hasn't been collected yet."""
+        return {l["link"] for batch in self._pending() for l in batch["listings"]}
+
+    def submit(self, listings: list[Listing]) -> str:
+        requests = [
+            {"custom_id": f"listing-{i}", "params": build_request(listing)}
+            for i, listing in enumerate(listings)
+        ]
+        batch_id = self.backend.submit(requests)
+        pending = self._pending()
+        pending.append(
+            {
+                "batch_id": batch_id,
+                "submitted_at": self.clock(),
+                "listings": [listing.to_dict() for listing in listings],
+            }
+        )
+        save_json(self.store, PENDING_KEY, pending)
+        logger.info(f"Submitted {len(listings)} listings as batch {batch_id}")
+        return batch_id
+
+    def collect(self, usage: TokenUsage | None = None) -> list[tuple[Listing, ReviewResult]]:
+        """Results from every finished batch; unfinished batches stay pending.
+
+        Listings whose request errored are dropped, so they come back as new
+        candidates on the next scrape.
+        """
+        reviewed: list[tuple[Listing, ReviewResult]] = []
+        for batch in self._pending():
+            batch_id = batch["batch_id"]
+            if not self.backend.is_done(batch_id):
+                logger.info(f"Batch {batch_id} still processing")
+                continue
+
+            listings = {f"listing-{i}": Listing.from_dict(d) for i, d in enumerate(batch["listings"])}
+            collected = 0
+            for entry in self.backend.results(batch_id):
+                listing = listings.get(entry.custom_id)
+                if listing is None or not entry.succeeded:
+                    continue
+                if usage is not None and entry.usage is not None:
+                    usage.add(entry.usage)
+                reviewed.append((listing, parse_review(entry.text)))
+                collected += 1
+            logger.info(f"Collected batch {batch_id}: {collected} of {len(listings)} reviewed")
+            self.collected_ids.add(batch_id)
+        return reviewed
+
+    def finish_collected(self) -> None:
+        """Forget the batches collected this run; call after their results are written."""
+        if not self.collected_ids:
+            return
+        # Re-read so batches submitted during this run are kept
+        pending = [b for b in self._pending() if b["batch_id"] not in self.collected_ids]
+        save_json(self.store, PENDING_KEY, pending)
+        self.collected_ids.clear()
@@ -0,0 +1,113 @@
+import logging
+import threading
+import time
+from dataclasses import asdict
+from src.models import Listing, ReviewResult
+from src.storage import Store, load_json, save_json
+
+logger = logging.getLogger(__name__)
+
+CHECKPOINT_KEY = "checkpoint.json"
+
+
+class Checkpoint:
+    """Progress of an unfinished run: its candidates and the reviews done so far.
+
+    The candidate list is saved once scraping and filtering are done. Finished
+    reviews are saved every save_every results or save_interval seconds,
+    whichever comes first, and on flush(), so a run that dies part way (API
+    error, timeout) can be resumed by the next invocation without scraping
+    again and repeats at most a handful of API calls. The checkpoint is
+    cleared once the results are in the sheet.
+    """
+
+    def __init__(
+        self,
+        store: Store,
+        max_age_hours: float = 48,
+        save_every: int = 10,
+        save_interval: float = 30,
+        clock=time.time,
+    ):
+        self.store = store
+        self.max_age_seconds = max_age_hours * 3600
+        self.save_every = save_every
+        self.save_interval = save_interval
+        self.clock = clock
+        self.candidates: list[Listing] = []
+        self.results: dict[str, dict] = {}
+        self._created_at = clock()
+        self._unsaved = 0
+        self._saved_at = clock()
+        self._lock = threading.Lock()
+        # Held while writing, so reviews keep recording during a slow PUT
+        self._save_lock = threading.Lock()
+
+    def load(self) -> bool:
+        """Load a saved checkpoint; False when there is none or it's too old to trust."""
+        state = load_json(self.store, CHECKPOINT_KEY)
+        if not state or not state.get("candidates"):
+            return False
+        if self.clock() - state["created_at"] > self.max_age_seconds:
+            logger.info("Discarding stale checkpoint")
+            return False
+        self.candidates = [Listing.from_dict(d) for d in state["candidates"]]
+        self.results = state["results"]
+        self._created_at = state["created_at"]
+        return True
+
+    def start(self, candidates: list[Listing]) -> None:
+        self.candidates = list(candidates)
+        self.results = {}
+        self._created_at = self._saved_at = self.clock()
+        self._save()
+
+    def record(self, listing: Listing, result: ReviewResult) -> None:
+        with self._lock:
+            self.results[listing.unique_key] = asdict(result)
+            self._unsaved += 1
+            due = (
+                self._unsaved >= self.save_every
+                or self.clock() - self._saved_at >= self.save_interval
+            )
+        if due:
+            # If another thread is already writing, its successor picks this up
+            self.flush(wait=False)
+
+    def flush(self, wait: bool = True) -> None:
+        """Write any recorded reviews that haven't been saved yet."""
+        if not self._save_lock.acquire(blocking=wait):
+            return
+        try:
+            with self._lock:
+                if not self._unsaved:
+                    return
+                self._unsaved = 0
+                self._saved_at = self.clock()
+                state = self._state()
+            save_json(self.store, CHECKPOINT_KEY, state)
+        finally:
+            self._save_lock.release()
+
+    def result_for(self, listing: Listing) -> ReviewResult | None:
+        data = self.results.get(listing.unique_key)
+        return ReviewResult(**data) if data else None
+
+    def finish(self, remaining: list[Listing] | None = None) -> None:
+        """Clear the checkpoint, or narrow it to the listings still to review."""
+        with self._save_lock:
+            with self._lock:
+                self.candidates = list(remaining or [])
+                self.results = {}
+                self._unsaved = 0
+            self._save()
+
+    def _state(self) -> dict:
+        return {
+            "created_at": self._created_at,
+            "candidates": [l.to_dict() for l in self.candidates],
+            "results": dict(self.results),
+        }
+
+    def _save(self) -> None:
+        save_json(self.store, CHECKPOINT_KEY, self._state())
@@ -0,0 +1,162 @@
+"""Secrets and API clients cached at module level across warm invocations.
+
+Lambda keeps the module loaded between invocations of a warm container, so
+anything stored here is reused by the next run instead of being fetched or
+authenticated again.
+"""
+
+import hashlib
+import json
+import logging
+import threading
+import time
+from typing import Callable
+from src.config import SECRETS_CONFIG
+
+logger = logging.getLogger(__name__)
+
+# key in the secrets dict -> (Secrets Manager id, JSON field or None for the whole document)
+SECRET_IDS = {
+    "google_creds": ("shop-seeker/google-creds", None),
+    "anthropic_key": ("shop-seeker/anthropic-key", "api_key"),
+    "sheet_id": ("shop-seeker/google-sheet-id", "sheet_id"),
+}
+
+
+def _secretsmanager_client():
+    import boto3
+
+    return boto3.client("secretsmanager")
+
+
+class SecretsCache:
+    """Fetches the app's secrets and keeps them for ttl_seconds.
+
+    With batched=True all secrets come back in one BatchGetSecretValue call;
+    if that call isn't available or is denied, each secret is fetched with
+    GetSecretValue instead.
+    """
+
+    def __init__(
+        self,
+        client_factory: Callable = _secretsmanager_client,
+        ttl_seconds: float = 900,
+        batched: bool = True,
+        clock=time.monotonic,
+    ):
+        self.client_factory = client_factory
+        self.ttl_seconds = ttl_seconds
+        self.batched = batched
+        self.clock = clock
+        self._client = None
+        self._secrets: dict | None = None
+        self._fetched_at = 0.0
+        self._lock = threading.Lock()
+
+    def get(self) -> dict:
+        with self._lock:
+            if self._secrets is None or self.clock() - self._fetched_at > self.ttl_seconds:
+                self._secrets = self._fetch()
+                self._fetched_at = self.clock()
+            return self._secrets
+
+    def clear(self) -> None:
+        with self._lock:
+            self._secrets = None
+
+    def _fetch(self) -> dict:
+        if self._client is None:
+            self._client = self.client_factory()
+        raw = None
+        if self.batched:
+            try:
+                raw = self._fetch_batched()
+            except Exception as e:
+                logger.warning(f"Batched secret fetch failed, fetching one by one: {e}")
+        if raw is None:
+            raw = {
+                secret_id: self._client.get_secret_value(SecretId=secret_id)["SecretString"]
+                for secret_id, _ in SECRET_IDS.values()
+            }
+
+        secrets = {}
+        for key, (secret_id, field) in SECRET_IDS.items():
+            value = json.loads(raw[secret_id])
+            secrets[key] = value if field is None else value[field]
+        return secrets
+
+    def _fetch_batched(self) -> dict[str, str] | None:
+        ids = [secret_id for secret_id, _ in SECRET_IDS.values()]
+        resp = self._client.batch_get_secret_value(SecretIdList=ids)
+        if resp.get("Errors"):
+            raise RuntimeError(resp["Errors"])
+        values = {v["Name"]: v["SecretString"] for v in resp["SecretValues"]}
+        missing = [i for i in ids if i not in values]
+        if missing:
+            raise RuntimeError(f"missing secrets {missing}")
+        return values
+
+
+_secrets = SecretsCache(
+    ttl_seconds=SECRETS_CONFIG["ttl_seconds"],
+    batched=SECRETS_CONFIG["batched"],
+)
+_clients: dict[tuple, object] = {}
+_clients_lock = threading.Lock()
+
+
+def get_secrets() -> dict:
+    return _secrets.get()
+
+
+def _fingerprint(value) -> str:
+    return hashlib.sha256(json.dumps(value, sort_keys=True).encode()).hexdigest()
+
+
+def get_sheets_client(credentials_dict: dict, sheet_id: str):
+    """A SheetsClient reused across warm invocations while the credentials stay the same."""
+    from src.sheets import SheetsClient
+
+    key = ("sheets", sheet_id, _fingerprint(credentials_dict))
+    with _clients_lock:
+        client = _clients.get(key)
+        if client is None:
+            client = _clients[key] = SheetsClient(credentials_dict=credentials_dict, sheet_id=sheet_id)
+        else:
+            client.refresh()
+    return client
+
+
+def get_anthropic_client(api_key: str):
+    """A shared Anthropic client with SDK retries off (ReviewEngine retries itself)."""
+    import anthropic
+
+    key = ("anthropic", _fingerprint(api_key))
+    with _clients_lock:
+        if key not in _clients:
+            _clients[key] = anthropic.Anthropic(api_key=api_key, max_retries=0)
+        return _clients[key]
+
+
+# HTTP statuses that mean the credentials themselves were rejected
+CREDENTIAL_ERROR_STATUS = {401, 403}
+
+
+def is_credential_error(e: Exception) -> bool:
+    """Whether e means a cached key or service account was rejected (rotated or revoked)."""
+    status = getattr(e, "status_code", None)
+    if status is None:
+        # gspread's APIError keeps the status on its response
+        status = getattr(getattr(e, "response", None), "status_code", None)
+    if status in CREDENTIAL_ERROR_STATUS:
+        return True
+    from google.auth.exceptions import RefreshError
+
+    return isinstance(e, RefreshError)
+
+
+def reset() -> None:
+    """Drop every cached secret and client (used by tests and after credential errors)."""
+    _secrets.clear()
+    with _clients_lock:
+        _clients.clear()
@@ -1,3 +1,4 @@
+import json
 import os
 
 SEARCH_CONFIG = {
@@ -7,4 +8,98 @@ SEARCH_CONFIG = {
     "max_price": float(os.environ.get("MAX_PRICE", "2400")),
     "min_sqft": float(os.environ.get("MIN_SQFT", "400")),
     "craigslist_region": os.environ.get("CRAIGSLIST_REGION", "sfbay"),
+    # "json" reads Craigslist's JSON search (with coordinates), falling back to
+    # the HTML results page; "html" uses the HTML page only
+    "craigslist_search_mode": os.environ.get("CRAIGSLIST_SEARCH_MODE", "json"),
+    # Optional polygons as JSON lists of [lat, lng] vertices. With include
+    # zones a listing must fall in one of them; exclude zones are never kept.
+    "include_zones": json.loads(os.environ.get("GEO_INCLUDE_ZONES", "[]")),
+    "exclude_zones": json.loads(os.environ.get("GEO_EXCLUDE_ZONES", "[]")),
+}
+
+# Wall-clock budget (seconds) each scraper gets in the concurrent scrape stage.
+SCRAPE_BUDGETS = {
+    "craigslist": float(os.environ.get("CRAIGSLIST_BUDGET_SECONDS", "240")),
+    "loopnet": float(os.environ.get("LOOPNET_BUDGET_SECONDS", "120")),
+    "commercialcafe": float(os.environ.get("COMMERCIALCAFE_BUDGET_SECONDS", "120")),
+}
+
+REVIEW_CONFIG = {
+    "concurrency": int(os.environ.get("REVIEW_CONCURRENCY", "8")),
+    "max_retries": int(os.environ.get("REVIEW_MAX_RETRIES", "5")),
+    "cache_ttl_days": float(os.environ.get("REVIEW_CACHE_TTL_DAYS", "30")),
+    # Listings packed into one review request; 1 reviews each listing on its own.
+    "batch_size": int(os.environ.get("REVIEW_BATCH_SIZE", "1")),
+    # Backlogs of at least this many reviews are sent to the Message Batches
+    # API and collected by a later run; 0 always reviews synchronously.
+    "async_threshold": int(os.environ.get("REVIEW_ASYNC_THRESHOLD", "150")),
+    # Starting guess for one review request's duration, refined as the run goes.
+    "estimate_seconds": float(os.environ.get("REVIEW_ESTIMATE_SECONDS", "15")),
+}
+
+# Seconds of the Lambda timeout held back for flushing writes and saving state.
+DEADLINE_RESERVE_SECONDS = float(os.environ.get("DEADLINE_RESERVE_SECONDS", "45"))
+
+# Where run-to-run state (seen index, caches, checkpoints) is kept. An S3 bucket
+# is used when STATE_BUCKET is set; otherwise files under STATE_DIR.
+STATE_CONFIG = {
+    "bucket": os.environ.get("STATE_BUCKET", ""),
+    "prefix": os.environ.get("STATE_PREFIX", "shop-seeker/"),
+    "dir": os.environ.get("STATE_DIR", "/tmp/shop-seeker"),
+}
+
+# Local rules stage: a listing is rejected without a Claude call only when it
+# is clearly out of bounds, i.e. its cheapest reading still costs more than
+# max_price * price_margin, or its largest reading is under min_sqft * sqft_margin.
+PREFILTER_CONFIG = {
+    "price_margin": float(os.environ.get("PREFILTER_PRICE_MARGIN", "1.25")),
+    "sqft_margin": float(os.environ.get("PREFILTER_SQFT_MARGIN", "0.75")),
+}
+
+# Spaces in the cross-source address index are forgotten after this many days
+# without being listed again.
+ADDRESS_INDEX_TTL_DAYS = float(os.environ.get("ADDRESS_INDEX_TTL_DAYS", "30"))
+
+# Address-only listings are placed by these resolvers (comma-separated names
+# from src.geocode.RESOLVERS); cached answers are kept this many days.
+GEOCODE_CONFIG = {
+    "resolvers": os.environ.get("GEOCODE_RESOLVERS", "zip"),
+    "cache_ttl_days": float(os.environ.get("GEOCODE_CACHE_TTL_DAYS", "90")),
+}
+
+# A checkpoint left by an unfinished run is resumed only if it is younger than this.
+CHECKPOINT_MAX_AGE_HOURS = float(os.environ.get("CHECKPOINT_MAX_AGE_HOURS", "48"))
+# Finished reviews are written to the checkpoint in groups of this many, or
+# after this many seconds, rather than one store write per review.
+CHECKPOINT_SAVE_EVERY = int(os.environ.get("CHECKPOINT_SAVE_EVERY", "10"))
+CHECKPOINT_SAVE_SECONDS = float(os.environ.get("CHECKPOINT_SAVE_SECONDS", "30"))
+
+SECRETS_CONFIG = {
+    # How long fetched secrets are reused by warm invocations.
+    "ttl_seconds": float(os.environ.get("SECRETS_TTL_SECONDS", "900")),
+    # Fetch all secrets with one BatchGetSecretValue call.
+    "batched": os.environ.get("SECRETS_BATCHED", "true").lower() == "true",
+}
+
+# Pacing and retries for every scraper request (see src/scrapers/scheduler.py).
+SCRAPER_CONFIG = {
+    "rate_per_second": float(os.environ.get("SCRAPER_RATE", "0.5")),
+    "max_in_flight": int(os.environ.get("SCRAPER_MAX_IN_FLIGHT", "2")),
+    # Random extra spacing added after each request to a host
+    "jitter_seconds": float(os.environ.get("SCRAPER_JITTER_SECONDS", "0.5")),
+    "max_retries": int(os.environ.get("SCRAPER_MAX_RETRIES", "2")),
+    # First retry delay when the server sends no Retry-After; doubles each retry
+    "backoff_seconds": float(os.environ.get("SCRAPER_BACKOFF_SECONDS", "2")),
+    # Most search result pages read per run by the paginated scrapers
+    "max_pages": int(os.environ.get("SCRAPER_MAX_PAGES", "5")),
+    # BeautifulSoup backend ("lxml" or "html.parser"); empty picks the fastest installed
+    "html_parser": os.environ.get("HTML_PARSER", ""),
+}
+
+# Craigslist detail pages are fetched by a small worker pool. The default rate
+# (plus SCRAPER_CONFIG jitter) keeps to the old 1-2s sleep between fetches.
+CRAIGSLIST_DETAIL_CONFIG = {
+    "rate_per_second": float(os.environ.get("CRAIGSLIST_DETAIL_RATE", "0.66")),
+    "max_in_flight": int(os.environ.get("CRAIGSLIST_DETAIL_MAX_IN_FLIGHT", "2")),
+    "workers": int(os.environ.get("CRAIGSLIST_DETAIL_WORKERS", "2")),
 }
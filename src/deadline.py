@@ -0,0 +1,31 @@
+import time
+
+
+class DeadlineExceeded(Exception):
+    """Raised when there isn't enough time left to start or retry a unit of work."""
+
+
+class Deadline:
+    """Remaining-time budget for a run, read from the Lambda context.
+
+    `reserve_seconds` is held back for wrapping up: flushing sheet writes,
+    saving state and returning the summary. Without a Lambda context (local
+    runs, tests) the deadline never expires.
+    """
+
+    def __init__(self, context=None, reserve_seconds: float = 30.0, clock=time.monotonic):
+        self.reserve_seconds = reserve_seconds
+        self.clock = clock
+        remaining_ms = getattr(context, "get_remaining_time_in_millis", None)
+        if callable(remaining_ms):
+            self._ends_at = clock() + remaining_ms() / 1000
+        else:
+            self._ends_at = float("inf")
+
+    def remaining(self) -> float:
+        """Seconds left before the reserve is reached."""
+        return self._ends_at - self.reserve_seconds - self.clock()
+
+    def can_start(self, estimated_seconds: float) -> bool:
+        """Whether work expected to take estimated_seconds would finish in time."""
+        return self.remaining() > estimated_seconds
@@ -1,4 +1,10 @@
 import math
+from dataclasses import dataclass, field
+
+EARTH_RADIUS_MILES = 3958.8
+
+# A zone is a polygon of (lat, lng) vertices; the closing edge is implied.
+Polygon = list[tuple[float, float]]
 
 
 def bounding_box(
@@ -15,6 +21,15 @@ def bounding_box(
     )
 
 
+def haversine_miles(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    """Great-circle distance between two points in miles."""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi = phi2 - phi1
+    dlmb = math.radians(lng2 - lng1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlmb / 2) ** 2
+    return 2 * EARTH_RADIUS_MILES * math.asin(math.sqrt(a))
+
+
 def is_within_radius(
     lat: float,
     lng: float,
@@ -22,6 +37,114 @@ def is_within_radius(
     center_lng: float,
     radius_miles: float,
 ) -> bool:
-    """Check if a point is within radius_miles of center using bounding box."""
-    south, north, west, east = bounding_box(center_lat, center_lng, radius_miles)
-    return south <= lat <= north and west <= lng <= east
+    """Check if a point is within radius_miles of center (true circle, not a box)."""
+    return haversine_miles(lat, lng, center_lat, center_lng) <= radius_miles
+
+
+def _point_in_polygon(lat: float, lng: float, polygon: Polygon) -> bool:
+    """Even-odd ray casting for one point."""
+    inside = False
+    j = len(polygon) - 1
+    for i in range(len(polygon)):
+        (yi, xi), (yj, xj) = polygon[i], polygon[j]
+        if (yi > lat) != (yj > lat) and lng < (xj - xi) * (lat - yi) / (yj - yi) + xi:
+            inside = not inside
+        j = i
+    return inside
+
+
+def _in_polygon(lats, lngs, polygon):
+    """Even-odd ray casting for every point at once."""
+    import numpy as np
+
+    ys, xs = polygon[:, 0], polygon[:, 1]
+    inside = np.zeros(lats.shape, dtype=bool)
+    j = len(polygon) - 1
+    with np.errstate(divide="ignore", invalid="ignore"):
+        for i in range(len(polygon)):
+            crosses = (ys[i] > lats) != (ys[j] > lats)
+            x_cross = (xs[j] - xs[i]) * (lats - ys[i]) / (ys[j] - ys[i]) + xs[i]
+            inside ^= crosses & (lngs < x_cross)
+            j = i
+    return inside
+
+
+@dataclass
+class SearchRegion:
+    """The area listings must fall in: a circle, optionally narrowed by zones.
+
+    A point is inside when it is within radius_miles of the center, inside
+    at least one include zone (if any are given) and outside every exclude
+    zone. A point known only to within some error (e.g. a ZIP centroid) is
+    inside if it could be: the radius is widened by its error, and zones
+    are not applied, since a rough location can't tell which side of a
+    zone's edge the listing is on. Whole batches are filtered with NumPy, which is imported on first
+    use so it stays out of the cold-start path; contains() checks a single
+    point in plain Python.
+    """
+
+    center_lat: float
+    center_lng: float
+    radius_miles: float
+    include: list[Polygon] = field(default_factory=list)
+    exclude: list[Polygon] = field(default_factory=list)
+
+    def __post_init__(self) -> None:
+        self._phi = math.radians(self.center_lat)
+        self._lmb = math.radians(self.center_lng)
+        self._cos_phi = math.cos(self._phi)
+        self._zones = None
+
+    def _zone_arrays(self):
+        import numpy as np
+
+        if self._zones is None:
+            self._zones = (
+                [np.asarray(p, dtype=float) for p in self.include],
+                [np.asarray(p, dtype=float) for p in self.exclude],
+            )
+        return self._zones
+
+    def distances(self, lats, lngs):
+        """Haversine distance in miles from the center for each point."""
+        import numpy as np
+
+        phi = np.radians(np.asarray(lats, dtype=float))
+        dphi = phi - self._phi
+        dlmb = np.radians(np.asarray(lngs, dtype=float)) - self._lmb
+        a = np.sin(dphi / 2) ** 2 + self._cos_phi * np.cos(phi) * np.sin(dlmb / 2) ** 2
+        return 2 * EARTH_RADIUS_MILES * np.arcsin(np.sqrt(a))
+
+    def filter(self, lats, lngs, errors=None):
+        """Return (inside mask, distances in miles) for a batch of points.
+
+        errors gives each point's location error in miles (0 for exact).
+        """
+        import numpy as np
+
+        lats = np.asarray(lats, dtype=float)
+        lngs = np.asarray(lngs, dtype=float)
+        errors = np.zeros(lats.shape) if errors is None else np.asarray(errors, dtype=float)
+        distances = self.distances(lats, lngs)
+        inside = distances <= self.radius_miles + errors
+
+        exact = errors == 0
+        include, exclude = self._zone_arrays()
+        if include:
+            in_any = np.zeros(lats.shape, dtype=bool)
+            for polygon in include:
+                in_any |= _in_polygon(lats, lngs, polygon)
+            inside &= in_any | ~exact
+        for polygon in exclude:
+            inside &= ~(_in_polygon(lats, lngs, polygon) & exact)
+        return inside, distances
+
+    def contains(self, lat: float, lng: float, error: float = 0.0) -> bool:
+        """Scalar check for one point, without building arrays."""
+        if haversine_miles(lat, lng, self.center_lat, self.center_lng) > self.radius_miles + error:
+            return False
+        if error:
+            return True
+        if self.include and not any(_point_in_polygon(lat, lng, p) for p in self.include):
+            return False
+        return not any(_point_in_polygon(lat, lng, p) for p in self.exclude)
@@ -0,0 +1,148 @@
+"""Give address-only listings coordinates so the geo filter can see them.
+
+LoopNet and CommercialCafe cards carry an address but no coordinates.
+Geocoder resolves those addresses through a pluggable resolver and keeps
+the answers (misses included) in a persistent cache, so a repeat run does
+no resolving at all for addresses it has already looked up.
+
+The bundled resolver is offline: it maps a ZIP code in the address to the
+ZIP's centroid. The table covers San Francisco and the ZIPs around it
+(north Peninsula, southern Marin, Oakland and the inner East Bay), so a
+listing just outside the city can be placed and dropped too. A centroid is
+coarse (a ZIP is a mile or more across) but it needs no API key and places
+a listing in the right part of the Bay. Every
+resolver reports how far off its answer may be, which is stored on the
+listing as location_error_miles so the geo filter doesn't treat a centroid
+as an exact spot.
+"""
+
+import csv
+import logging
+import re
+import time
+from functools import lru_cache
+from pathlib import Path
+from typing import Callable
+from src.models import Listing
+from src.storage import Store, load_json, save_json
+
+logger = logging.getLogger(__name__)
+
+CACHE_KEY = "geocode_cache.json"
+
+ZIP_CENTROIDS_PATH = Path(__file__).parent / "data" / "bay_area_zip_centroids.csv"
+
+_ZIP = re.compile(r"\b(9\d{4})(?:-\d{4})?\b")
+
+# (lat, lng, error in miles)
+Location = tuple[float, float, float]
+
+# Takes an address, returns its Location or None if it can't place it
+Resolver = Callable[[str], "Location | None"]
+
+
+def _normalize(address: str) -> str:
+    return re.sub(r"\s+", " ", address).strip().lower()
+
+
+@lru_cache(maxsize=None)
+def _zip_centroids(path: Path = ZIP_CENTROIDS_PATH) -> dict[str, Location]:
+    with open(path, newline="") as f:
+        return {
+            row["zip"]: (float(row["lat"]), float(row["lng"]), float(row["radius_miles"]))
+            for row in csv.DictReader(f)
+        }
+
+
+def zip_centroid(address: str) -> Location | None:
+    """Offline resolver: the centroid of the last known ZIP code in the address.
+
+    The error is the distance from the centroid to the ZIP's farthest edge.
+    """
+    table = _zip_centroids()
+    for code in reversed(_ZIP.findall(address)):
+        if code in table:
+            return table[code]
+    return None
+
+
+RESOLVERS: dict[str, Resolver] = {
+    "zip": zip_centroid,
+}
+
+
+def chain(*resolvers: Resolver) -> Resolver:
+    """Try each resolver in turn and use the first answer."""
+
+    def resolve(address: str) -> Location | None:
+        for resolver in resolvers:
+            location = resolver(address)
+            if location is not None:
+                return location
+        return None
+
+    return resolve
+
+
+def make_resolver(names: str) -> Resolver:
+    """Build a resolver from a comma-separated list of RESOLVERS names."""
+    resolvers = []
+    for name in (n.strip() for n in names.split(",")):
+        if not name:
+            continue
+        if name not in RESOLVERS:
+            raise ValueError(f"Unknown geocode resolver: {name}")
+        resolvers.append(RESOLVERS[name])
+    return chain(*resolvers)
+
+
+class Geocoder:
+    """Fill in lat/lng for listings that only have an address.
+
+    Results are cached by normalized address, including misses, so unplaceable
+    addresses aren't retried every run. Entries older than the TTL are evicted
+    on save, which lets a newly added resolver try old misses again.
+    """
+
+    def __init__(self, store: Store, resolver: Resolver, ttl_days: float = 90, clock=time.time):
+        self.store = store
+        self.resolver = resolver
+        self.ttl_seconds = ttl_days * 86400
+        self.clock = clock
+        self.entries: dict[str, dict] = load_json(store, CACHE_KEY, {})
+
+    def lookup(self, address: str) -> Location | None:
+        key = _normalize(address)
+        entry = self.entries.get(key)
+        if entry is None or self._expired(entry) or self._outdated(entry):
+            location = self.resolver(address)
+            entry = {"coords": list(location) if location else None, "stored_at": self.clock()}
+            self.entries[key] = entry
+        return tuple(entry["coords"]) if entry["coords"] else None
+
+    def locate(self, listings: list[Listing]) -> int:
+        """Set coordinates on listings that have an address but none yet; returns how many."""
+        located = 0
+        for listing in listings:
+            if (listing.lat is not None and listing.lng is not None) or not listing.address:
+                continue
+            location = self.lookup(listing.address)
+            if location:
+                listing.lat, listing.lng, listing.location_error_miles = location
+                located += 1
+        return located
+
+    def save(self) -> None:
+        before = len(self.entries)
+        self.entries = {k: v for k, v in self.entries.items() if not self._expired(v)}
+        if before != len(self.entries):
+            logger.info(f"Evicted {before - len(self.entries)} expired geocode cache entries")
+        save_json(self.store, CACHE_KEY, self.entries)
+
+    def _expired(self, entry: dict) -> bool:
+        return self.clock() - entry["stored_at"] > self.ttl_seconds
+
+    @staticmethod
+    def _outdated(entry: dict) -> bool:
+        # Entries cached before errors were recorded hold only [lat, lng]
+        return entry["coords"] is not None and len(entry["coords"]) != 3
@@ -1,142 +1,405 @@
 import json
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
 from datetime import date
-import boto3
-from src.config import SEARCH_CONFIG
-from src.geo import is_within_radius
-from src.models import Listing
-from src.scrapers.craigslist import CraigslistScraper
-from src.scrapers.loopnet import LoopNetScraper
-from src.scrapers.commercialcafe import CommercialCafeScraper
-from src.sheets import SheetsClient
-from src.reviewer import review_listing
+from functools import lru_cache
+from typing import TYPE_CHECKING
+from src.checkpoint import Checkpoint
+from src.clients import (
+    get_anthropic_client,
+    get_secrets,
+    get_sheets_client,
+    is_credential_error,
+    reset as reset_clients,
+)
+from src.config import (
+    ADDRESS_INDEX_TTL_DAYS,
+    CHECKPOINT_MAX_AGE_HOURS,
+    CHECKPOINT_SAVE_EVERY,
+    CHECKPOINT_SAVE_SECONDS,
+    CRAIGSLIST_DETAIL_CONFIG,
+    DEADLINE_RESERVE_SECONDS,
+    GEOCODE_CONFIG,
+    PREFILTER_CONFIG,
+    REVIEW_CONFIG,
+    SCRAPE_BUDGETS,
+    SEARCH_CONFIG,
+)
+from src.deadline import Deadline
+from src.geo import SearchRegion
+from src.geocode import Geocoder, make_resolver
+from src.identity import ListingIndex, merge_duplicates
+from src.listing_ids import listing_id
+from src.models import Listing, ReviewResult
+from src.prefilter import prefilter
+from src.scrape import scrape_all
+from src.scrapers.http_cache import ResponseCache
+from src.storage import get_store
+from src.review_cache import ReviewCache
+
+# boto3, gspread, anthropic, requests, curl_cffi and BeautifulSoup take most of
+# the cold-start time, so the modules that use them are imported inside the
+# functions that need them rather than when this module loads.
+if TYPE_CHECKING:
+    from src.sheets import SheetsClient
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
 
 
-def get_secrets() -> dict:
-    client = boto3.client("secretsmanager")
+def _write_result(sheets: "SheetsClient", listing: Listing, result: ReviewResult, today: str) -> None:
+    if result.approved:
+        sheets.append_approved(
+            title=listing.title,
+            price=listing.price,
+            sqft=listing.sqft,
+            address=listing.address,
+            link=listing.link,
+            date_found=today,
+            est_monthly_cost=result.est_monthly_cost,
+            suitability_score=str(result.suitability_score),
+            ai_notes=result.reasoning,
+        )
+    else:
+        sheets.append_rejected(
+            title=listing.title,
+            price=listing.price,
+            sqft=listing.sqft,
+            address=listing.address,
+            link=listing.link,
+            date_found=today,
+            est_monthly_cost=result.est_monthly_cost,
+            suitability_score=str(result.suitability_score),
+            rejection_reason=result.reasoning,
+        )
 
-    google_resp = client.get_secret_value(SecretId="shop-seeker/google-creds")
-    google_creds = json.loads(google_resp["SecretString"])
 
-    anthropic_resp = client.get_secret_value(SecretId="shop-seeker/anthropic-key")
-    anthropic_key = json.loads(anthropic_resp["SecretString"])["api_key"]
+@lru_cache(maxsize=1)
+def _search_region() -> SearchRegion:
+    """The search area, built once per process from SEARCH_CONFIG."""
+    return SearchRegion(
+        center_lat=SEARCH_CONFIG["center_lat"],
+        center_lng=SEARCH_CONFIG["center_lng"],
+        radius_miles=SEARCH_CONFIG["radius_miles"],
+        include=SEARCH_CONFIG["include_zones"],
+        exclude=SEARCH_CONFIG["exclude_zones"],
+    )
 
-    sheet_resp = client.get_secret_value(SecretId="shop-seeker/google-sheet-id")
-    sheet_id = json.loads(sheet_resp["SecretString"])["sheet_id"]
 
-    return {"google_creds": google_creds, "anthropic_key": anthropic_key, "sheet_id": sheet_id}
+def _in_radius(lat: float, lng: float) -> bool:
+    return _search_region().contains(lat, lng)
 
 
-def lambda_handler(event, context):
-    logger.info("Shop Seeker run starting")
+def _filter_by_area(listings: list[Listing]) -> list[Listing]:
+    """Drop listings outside the search area and sort the rest nearest first.
 
-    secrets = get_secrets()
-    sheets = SheetsClient(
-        credentials_dict=secrets["google_creds"],
-        sheet_id=secrets["sheet_id"],
+    Located listings are checked in one batch and get distance_miles set;
+    one with an approximate location is dropped only if it can't be inside
+    (see SearchRegion). Listings without coordinates are kept, after the
+    located ones.
+    """
+    located = [l for l in listings if l.lat is not None and l.lng is not None]
+    inside = set()
+    if located:
+        mask, distances = _search_region().filter(
+            [l.lat for l in located],
+            [l.lng for l in located],
+            [l.location_error_miles for l in located],
+        )
+        for listing, keep, distance in zip(located, mask, distances):
+            listing.distance_miles = float(distance)
+            if keep:
+                inside.add(id(listing))
+            else:
+                logger.info(f"Skipping out-of-area: {listing.title}")
+    kept = [l for l in listings if l.lat is None or l.lng is None or id(l) in inside]
+    return sorted(kept, key=lambda l: (l.distance_miles is None, l.distance_miles or 0.0))
+
+
+def _prefilter(listing: Listing) -> ReviewResult | None:
+    return prefilter(
+        listing,
+        max_price=SEARCH_CONFIG["max_price"],
+        min_sqft=SEARCH_CONFIG["min_sqft"],
+        price_margin=PREFILTER_CONFIG["price_margin"],
+        sqft_margin=PREFILTER_CONFIG["sqft_margin"],
     )
 
-    # Step 1: Get already-seen URLs
-    seen_urls = sheets.get_seen_urls()
-    logger.info(f"Found {len(seen_urls)} previously seen URLs")
 
-    # Step 2: Scrape all sources
-    all_listings: list[Listing] = []
+def _load_texts(listings: list[Listing], deadline: Deadline, budget: float) -> None:
+    """Run the deferred full_text fetches of listings that reached review.
+
+    The fetches get budget seconds (what is left of the Craigslist budget),
+    capped by the run's deadline. Workers only fetch; what they found is
+    applied here, and only for fetches that finished in time, so a late one
+    can't change a listing while it is merged, checkpointed or reviewed.
+    Listings whose text isn't in by then are reviewed without it.
+    """
+    pending = [l for l in listings if l.text_loader is not None]
+    if not pending:
+        return
+    budget = min(budget, deadline.remaining())
+    logger.info(f"Fetching text for {len(pending)} candidates")
+    stop = threading.Event()
+    pool = ThreadPoolExecutor(max_workers=CRAIGSLIST_DETAIL_CONFIG["workers"])
+    futures = [pool.submit(l.fetch_text, stop) for l in pending]
+    _, not_done = wait(futures, timeout=max(budget, 0.0))
+    if not_done:
+        stop.set()
+        logger.warning(f"Out of time: {len(not_done)} candidates reviewed without their text")
+    # Fetches already under way finish on their own; don't wait for them
+    pool.shutdown(wait=False, cancel_futures=True)
+
+    for listing, future in zip(pending, futures):
+        listing.text_loader = None
+        if future in not_done:
+            continue
+        try:
+            listing.update(future.result())
+        except Exception as e:
+            logger.error(f"Text fetch failed for {listing.link}: {e}")
+
 
-    logger.info("Starting Craigslist scraper")
+def _scrape_candidates(
+    seen_ids: set[str], deadline: Deadline, http_cache: ResponseCache, geocoder: Geocoder
+) -> tuple[list[Listing], list[Listing], list[Listing], float]:
+    """Scrape every source and return (all listings, new listings, review
+    candidates, seconds left of the Craigslist budget for deferred text)."""
+    from src.scrapers.craigslist import HOST_LIMITS as CRAIGSLIST_LIMITS, CraigslistScraper
+    from src.scrapers.loopnet import LoopNetScraper
+    from src.scrapers.commercialcafe import CommercialCafeScraper
+    from src.scrapers.scheduler import make_scheduler
+
+    # One scheduler for every scraper, so pacing and backoff are per host
+    # across the whole run; Craigslist keeps its own rate
+    scheduler = make_scheduler(host_limits=CRAIGSLIST_LIMITS)
+
+    # Scrape all sources concurrently, each within its own budget
     cl = CraigslistScraper(
         region=SEARCH_CONFIG["craigslist_region"],
         max_price=int(SEARCH_CONFIG["max_price"]),
+        is_seen=seen_ids.__contains__,
+        cache=http_cache,
+        search_mode=SEARCH_CONFIG["craigslist_search_mode"],
+        in_area=_in_radius,
+        scheduler=scheduler,
+    )
+    ln = LoopNetScraper(is_seen=seen_ids.__contains__, cache=http_cache, scheduler=scheduler)
+    cc = CommercialCafeScraper(is_seen=seen_ids.__contains__, cache=http_cache, scheduler=scheduler)
+    logger.info("Starting scrapers")
+    # No source may use more than what's left of the run
+    budgets = {name: min(b, deadline.remaining()) for name, b in SCRAPE_BUDGETS.items()}
+    scraped = scrape_all(
+        {"craigslist": cl.scrape, "loopnet": ln.scrape, "commercialcafe": cc.scrape},
+        budgets,
+        # Only sources that delivered their listings may mark pages as read
+        on_complete=http_cache.commit,
     )
-    all_listings.extend(cl.scrape())
-    logger.info(f"Craigslist done: {len(all_listings)} listings")
-
-    logger.info("Starting LoopNet scraper")
-    ln = LoopNetScraper()
-    ln_listings = ln.scrape()
-    all_listings.extend(ln_listings)
-    logger.info(f"LoopNet done: {len(ln_listings)} listings")
 
-    logger.info("Starting CommercialCafe scraper")
-    cc = CommercialCafeScraper()
-    cc_listings = cc.scrape()
-    all_listings.extend(cc_listings)
-    logger.info(f"CommercialCafe done: {len(cc_listings)} listings")
+    all_listings: list[Listing] = []
+    for source, listings in scraped.items():
+        logger.info(f"{source} done: {len(listings)} listings")
+        all_listings.extend(listings)
 
     logger.info(f"Scraped {len(all_listings)} total listings")
 
-    # Step 3: Filter
-    new_listings = [l for l in all_listings if l.unique_key not in seen_urls]
+    # Drop seen and out-of-area listings
+    new_listings = [l for l in all_listings if l.unique_key not in seen_ids]
     logger.info(f"{len(new_listings)} new listings after dedup")
 
-    candidates = []
-    for listing in new_listings:
-        if listing.lat is not None and listing.lng is not None:
-            if not is_within_radius(
-                listing.lat,
-                listing.lng,
-                SEARCH_CONFIG["center_lat"],
-                SEARCH_CONFIG["center_lng"],
-                SEARCH_CONFIG["radius_miles"],
-            ):
-                logger.info(f"Skipping out-of-radius: {listing.title}")
-                continue
-        candidates.append(listing)
+    # Address-only listings get coordinates so the area filter applies to them too
+    located = geocoder.locate(new_listings)
+    logger.info(f"Geocoded {located} address-only listings")
 
-    logger.info(f"{len(candidates)} candidates for Claude review")
+    candidates = _filter_by_area(new_listings)
+    text_budget = SCRAPE_BUDGETS["craigslist"] - cl.search_seconds
+
+    return all_listings, new_listings, candidates, text_budget
+
+
+def lambda_handler(event, context):
+    try:
+        return _run(event, context)
+    except Exception as e:
+        # A rotated or revoked key would otherwise keep failing from the warm
+        # cache until its TTL ran out; fetch everything fresh next time
+        if is_credential_error(e):
+            logger.error(f"Credentials rejected, dropping cached secrets and clients: {e}")
+            reset_clients()
+        raise
+
+
+def _run(event, context):
+    from src.batch_review import AnthropicBatchBackend, BatchReviewer
+    from src.reviewer import ReviewEngine
+    from src.seen_index import SeenIndex
+
+    logger.info("Shop Seeker run starting")
+    deadline = Deadline(context, reserve_seconds=DEADLINE_RESERVE_SECONDS)
+
+    # Secrets and clients are cached across warm invocations
+    secrets = get_secrets()
+    sheets = get_sheets_client(
+        credentials_dict=secrets["google_creds"],
+        sheet_id=secrets["sheet_id"],
+    )
+
+    # Step 1: Get already-seen listing ids
+    store = get_store()
+    seen_ids = sheets.get_seen_urls(index=SeenIndex(store))
+    logger.info(f"Found {len(seen_ids)} previously seen listings")
 
-    # Step 4: Claude review and write to sheets
     today = date.today().isoformat()
     approved_count = 0
     rejected_count = 0
+    cache = ReviewCache(store, ttl_days=REVIEW_CONFIG["cache_ttl_days"])
+    engine = ReviewEngine(
+        api_key=secrets["anthropic_key"],
+        concurrency=REVIEW_CONFIG["concurrency"],
+        max_retries=REVIEW_CONFIG["max_retries"],
+        batch_size=REVIEW_CONFIG["batch_size"],
+        estimate_seconds=REVIEW_CONFIG["estimate_seconds"],
+        client=get_anthropic_client(secrets["anthropic_key"]),
+    )
 
-    for i, listing in enumerate(candidates, 1):
-        logger.info(f"Reviewing {i}/{len(candidates)}: {listing.title}")
-        result = review_listing(listing, api_key=secrets["anthropic_key"])
+    # Collect any finished async review batches from earlier runs
+    batches = BatchReviewer(AnthropicBatchBackend(engine.client), store)
+    collected = batches.collect(usage=engine.usage)
+    for listing, result in collected:
+        cache.put(listing, result)
+        _write_result(sheets, listing, result, today)
+        if result.approved:
+            approved_count += 1
+        else:
+            rejected_count += 1
+        seen_ids.add(listing.unique_key)
+    # Listings still waiting in a batch must not be reviewed again
+    seen_ids.update(listing_id(link) for link in batches.pending_links())
+
+    # Step 2-3: Scrape and filter, unless an unfinished run left a checkpoint
+    checkpoint = Checkpoint(
+        store,
+        max_age_hours=CHECKPOINT_MAX_AGE_HOURS,
+        save_every=CHECKPOINT_SAVE_EVERY,
+        save_interval=CHECKPOINT_SAVE_SECONDS,
+    )
+    http_cache = ResponseCache(store)
+    address_index = ListingIndex(store, ttl_days=ADDRESS_INDEX_TTL_DAYS)
+    # Known copies of an indexed space are skipped before any detail fetch
+    seen_ids.update(address_index.copy_ids())
+    geocoder = Geocoder(
+        store,
+        make_resolver(GEOCODE_CONFIG["resolvers"]),
+        ttl_days=GEOCODE_CONFIG["cache_ttl_days"],
+    )
+    resumed = checkpoint.load()
+    if resumed:
+        all_listings, new_listings = [], []
+        duplicate_count = 0
+        candidates = [l for l in checkpoint.candidates if l.unique_key not in seen_ids]
+        logger.info(
+            f"Resuming checkpoint: {len(candidates)} candidates, "
+            f"{len(checkpoint.results)} already reviewed"
+        )
+    else:
+        all_listings, new_listings, candidates, text_budget = _scrape_candidates(
+            seen_ids, deadline, http_cache, geocoder
+        )
+        # Text is fetched only for listings the pre-filter lets through
+        _load_texts([l for l in candidates if _prefilter(l) is None], deadline, text_budget)
+        # One review per physical space: copies from other sources (or of a
+        # space reviewed in an earlier run) are merged or dropped here
+        candidates, duplicate_count = merge_duplicates(candidates, address_index)
+        logger.info(f"{duplicate_count} duplicate listings of the same space merged")
+        checkpoint.start(candidates)
+
+    logger.info(f"{len(candidates)} candidates for Claude review")
 
+    # Step 4: Claude review and write to sheets
+    # Obvious price/size misses are rejected locally without a Claude call
+    results = [_prefilter(listing) for listing in candidates]
+    prefiltered_count = sum(r is not None for r in results)
+    logger.info(f"{prefiltered_count} candidates rejected by pre-filter")
+
+    # Reposts of listings we've already reviewed reuse the cached result, and
+    # a resumed run reuses the reviews it finished before it stopped
+    for i, listing in enumerate(candidates):
+        if results[i] is None:
+            results[i] = cache.get(listing) or checkpoint.result_for(listing)
+    to_review = [l for l, r in zip(candidates, results) if r is None]
+    cached_count = len(candidates) - prefiltered_count - len(to_review)
+    logger.info(f"{cached_count} candidates already reviewed (cache or checkpoint)")
+
+    # A large backlog goes to the Message Batches API instead of being reviewed
+    # here, so it can't push the run past the Lambda timeout
+    threshold = REVIEW_CONFIG["async_threshold"]
+    submit_async = (event or {}).get("async_review") or (0 < threshold <= len(to_review))
+    if submit_async and to_review:
+        batches.submit(to_review)
+        submitted_count = len(to_review)
+    else:
+        submitted_count = 0
+        try:
+            fresh = iter(engine.review_all(to_review, deadline=deadline, on_result=checkpoint.record))
+        finally:
+            # Reviews recorded since the last periodic save, even if one failed
+            checkpoint.flush()
+        for i, listing in enumerate(candidates):
+            if results[i] is None:
+                results[i] = next(fresh)
+                if results[i] is not None:
+                    cache.put(listing, results[i])
+    cache.save()
+
+    # Anything without a result now was either submitted to a batch or
+    # deferred because the run is close to its deadline
+    deferred = [] if submitted_count else [l for l, r in zip(candidates, results) if r is None]
+    if deferred:
+        logger.warning(f"Out of time: deferred {len(deferred)} reviews to the next run")
+
+    for listing, result in zip(candidates, results):
+        if result is None:
+            continue
+        _write_result(sheets, listing, result, today)
         if result.approved:
-            sheets.append_approved(
-                title=listing.title,
-                price=listing.price,
-                sqft=listing.sqft,
-                address=listing.address,
-                link=listing.link,
-                date_found=today,
-                est_monthly_cost=result.est_monthly_cost,
-                suitability_score=str(result.suitability_score),
-                ai_notes=result.reasoning,
-            )
             approved_count += 1
         else:
-            sheets.append_rejected(
-                title=listing.title,
-                price=listing.price,
-                sqft=listing.sqft,
-                address=listing.address,
-                link=listing.link,
-                date_found=today,
-                est_monthly_cost=result.est_monthly_cost,
-                suitability_score=str(result.suitability_score),
-                rejection_reason=result.reasoning,
-            )
             rejected_count += 1
 
+    sheets.flush()
+    # Collected batch results are in the sheet, so their batches can go
+    batches.finish_collected()
+    # Results are in the sheet; only deferred listings carry over, and pages
+    # read this run can be skipped next time if they haven't changed
+    checkpoint.finish(remaining=deferred)
+    http_cache.save()
+    address_index.save()
+    geocoder.save()
+
     logger.info(
         f"Done. Approved: {approved_count}, Rejected: {rejected_count}"
     )
+    logger.info(f"Token usage: {engine.usage.as_dict()}")
 
     return {
         "statusCode": 200,
         "body": json.dumps(
             {
+                "resumed": resumed,
                 "scraped": len(all_listings),
                 "new": len(new_listings),
+                "duplicates": duplicate_count,
                 "candidates": len(candidates),
+                "prefiltered": prefiltered_count,
+                "cached": cached_count,
+                "batch_submitted": submitted_count,
+                "batch_collected": len(collected),
                 "approved": approved_count,
                 "rejected": rejected_count,
+                "usage": engine.usage.as_dict(),
+                "partial": bool(deferred),
+                "deferred": [l.link for l in deferred],
             }
         ),
     }
@@ -0,0 +1,180 @@
+"""Recognise the same physical space listed by more than one source.
+
+LoopNet, CommercialCafe and Craigslist often carry the same building under
+different links. Listings are matched on a normalized street address plus
+overlapping square footage, so two suites in one building stay separate.
+Only listings from different sources are matched; a repost on the same site
+is handled by the review cache instead.
+"""
+
+import logging
+import re
+import time
+from src.models import Listing
+from src.normalize import Range
+from src.storage import Store, load_json, save_json
+
+logger = logging.getLogger(__name__)
+
+INDEX_KEY = "address_index.json"
+
+# Sqft ranges this far apart (relative) still count as the same space
+SQFT_TOLERANCE = 0.1
+
+_SUFFIXES = {
+    "street": "st", "str": "st",
+    "avenue": "ave", "av": "ave",
+    "boulevard": "blvd",
+    "road": "rd",
+    "drive": "dr",
+    "place": "pl",
+    "lane": "ln",
+    "court": "ct",
+    "terrace": "ter",
+    "alley": "aly",
+    "highway": "hwy",
+    "parkway": "pkwy",
+    "square": "sq",
+    "plaza": "plz",
+    "north": "n", "south": "s", "east": "e", "west": "w",
+}
+_UNIT_RE = re.compile(
+    r"(?:\b(?:suite|ste|unit|apt|apartment|fl|floor|rm|room|bldg|building)\b\.?\s*#?\s*[\w-]*"
+    r"|#\s*[\w-]+"
+    r"|\b\d+(?:st|nd|rd|th)\s+(?:fl|floor)\b)",
+    re.IGNORECASE,
+)
+
+
+def normalize_address(address: str) -> str | None:
+    """Street line of an address in canonical form, e.g. "100 mission st".
+
+    City, state and zip (after the first comma), unit/suite/floor parts,
+    punctuation and casing are dropped and street suffixes abbreviated.
+    Returns None when there is no house number to anchor a match on.
+    """
+    street = address.split(",")[0].lower()
+    street = re.split(r"\s+(?:near|at|@|&)\s+", street)[0]
+    street = _UNIT_RE.sub(" ", street)
+    tokens = re.sub(r"[^\w\s-]", " ", street).split()
+    if not tokens or not tokens[0][0].isdigit():
+        return None
+    # "100-110 Mission St" is filed under its first number
+    tokens[0] = tokens[0].split("-")[0]
+    return " ".join(_SUFFIXES.get(t, t) for t in tokens)
+
+
+def _sqft_overlaps(a: Range | None, b: Range | None) -> bool:
+    if a is None or b is None:
+        return True
+    return a[0] <= b[1] * (1 + SQFT_TOLERANCE) and b[0] <= a[1] * (1 + SQFT_TOLERANCE)
+
+
+class ListingIndex:
+    """Known physical spaces by normalized address, persisted between runs.
+
+    A listing matches a space from another source at the same address whose
+    sqft overlaps (or where either sqft is unknown). The ids of copies that
+    were merged or dropped are kept with their space, so the next run can
+    skip them before fetching anything. Spaces are evicted on save
+    `ttl_days` after they were first indexed.
+    """
+
+    def __init__(self, store: Store, ttl_days: float = 30, clock=time.time):
+        self.store = store
+        self.ttl_seconds = ttl_days * 86400
+        self.clock = clock
+        self.spaces: dict[str, list[dict]] = load_json(store, INDEX_KEY, {})
+
+    def _find(self, listing: Listing) -> dict | None:
+        address = normalize_address(listing.address)
+        if address is None:
+            return None
+        sqft = listing.sqft_range
+        for space in self.spaces.get(address, []):
+            if space["source"] == listing.source:
+                continue
+            if _sqft_overlaps(sqft, tuple(space["sqft"]) if space["sqft"] else None):
+                return space
+        return None
+
+    def match(self, listing: Listing) -> str | None:
+        """Link of the known space this listing is a copy of, if any."""
+        space = self._find(listing)
+        return space["link"] if space else None
+
+    def add_copy(self, listing: Listing) -> None:
+        """Remember listing's id as a copy of the space it matches."""
+        space = self._find(listing)
+        if space is not None and listing.unique_key not in space.setdefault("copies", []):
+            space["copies"].append(listing.unique_key)
+
+    def copy_ids(self) -> set[str]:
+        """Ids of every listing known to be a copy of an indexed space."""
+        return {key for entries in self.spaces.values() for e in entries for key in e.get("copies", [])}
+
+    def add(self, listing: Listing) -> None:
+        address = normalize_address(listing.address)
+        if address is None:
+            return
+        sqft = listing.sqft_range
+        self.spaces.setdefault(address, []).append(
+            {
+                "sqft": list(sqft) if sqft else None,
+                "link": listing.link,
+                "source": listing.source,
+                "seen_at": self.clock(),
+            }
+        )
+
+    def save(self) -> None:
+        cutoff = self.clock() - self.ttl_seconds
+        spaces = {}
+        for address, entries in self.spaces.items():
+            fresh = [e for e in entries if e["seen_at"] >= cutoff]
+            if fresh:
+                spaces[address] = fresh
+        self.spaces = spaces
+        save_json(self.store, INDEX_KEY, spaces)
+
+
+def _merge_into(keep: Listing, other: Listing) -> None:
+    if len(other.full_text) > len(keep.full_text):
+        keep.full_text = other.full_text
+    for field in ("price", "sqft", "address"):
+        if not getattr(keep, field):
+            setattr(keep, field, getattr(other, field))
+    # Prefer the more precise location, e.g. real coordinates over a ZIP centroid
+    if other.lat is not None and other.lng is not None and (
+        keep.lat is None or keep.lng is None or other.location_error_miles < keep.location_error_miles
+    ):
+        keep.lat, keep.lng = other.lat, other.lng
+        keep.location_error_miles = other.location_error_miles
+
+
+def merge_duplicates(listings: list[Listing], index: ListingIndex) -> tuple[list[Listing], int]:
+    """Collapse listings of the same physical space; returns (unique listings, copies dropped).
+
+    Copies within this batch are merged into the first one seen, which keeps
+    the richest full_text. Copies of a space from an earlier run are dropped,
+    since that space was already reviewed. Either way the copy's id is kept in
+    the index, so later runs treat it as seen.
+    """
+    unique: list[Listing] = []
+    by_link: dict[str, Listing] = {}
+    dropped = 0
+    for listing in listings:
+        link = index.match(listing)
+        if link is None:
+            index.add(listing)
+            unique.append(listing)
+            by_link[listing.link] = listing
+            continue
+        dropped += 1
+        index.add_copy(listing)
+        if link in by_link:
+            logger.info(f"Merging duplicate {listing.link} into {link}")
+            _merge_into(by_link[link], listing)
+        else:
+            logger.info(f"Skipping {listing.link}: same space as earlier {link}")
+    return unique, dropped
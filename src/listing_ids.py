@@ -0,0 +1,82 @@
+"""Canonical listing ids, so one ad is recognised however its link is written.
+
+Each source has a key extractor that pulls its own listing id out of a link
+(a Craigslist post id, a LoopNet listing id, ...). Links no extractor
+understands fall back to a normalized URL: https, lowercase host without
+"www.", no trailing slash, no tracking parameters.
+"""
+
+import re
+from typing import Callable
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+TRACKING_PARAMS = {"fbclid", "gclid", "msclkid", "ref", "referrer", "src"}
+
+_CRAIGSLIST_POST_RE = re.compile(r"/(\d+)\.html?$")
+
+
+def _craigslist_id(path: str) -> str | None:
+    # Same post on sfbay.craigslist.org, sfbay.craigslist.org/sfc/... or a
+    # regional mirror: the numeric post id is the only stable part
+    match = _CRAIGSLIST_POST_RE.search(path)
+    return match.group(1) if match else None
+
+
+def _loopnet_id(path: str) -> str | None:
+    # /Listing/<id>/<slug>/ or /Listing/<slug>/<id>/
+    segments = [s for s in path.split("/") if s]
+    if not segments or segments[0].lower() != "listing":
+        return None
+    return next((s for s in segments[1:] if s.isdigit()), None)
+
+
+def _commercialcafe_id(path: str) -> str | None:
+    # /commercial-property/us/ca/san-francisco/<building-slug>/
+    path = path.lower().rstrip("/")
+    return path if path.startswith("/commercial-property/") else None
+
+
+KEY_EXTRACTORS: dict[str, Callable[[str], str | None]] = {
+    "craigslist": _craigslist_id,
+    "loopnet": _loopnet_id,
+    "commercialcafe": _commercialcafe_id,
+}
+
+_SOURCE_HOSTS = {
+    "craigslist.org": "craigslist",
+    "loopnet.com": "loopnet",
+    "commercialcafe.com": "commercialcafe",
+}
+
+
+def _source_for_host(host: str) -> str | None:
+    for domain, source in _SOURCE_HOSTS.items():
+        if host == domain or host.endswith("." + domain):
+            return source
+    return None
+
+
+def listing_id(link: str) -> str:
+    """Canonical id for a listing link, e.g. "craigslist:7712345678".
+
+    The source (and so the key extractor) is worked out from the host, so a
+    scraped listing and its link read back from the sheet get the same id.
+    """
+    link = link.strip()
+    parts = urlsplit(link)
+    if parts.scheme not in ("http", "https") or not parts.netloc:
+        return link
+    host = parts.netloc.lower().removeprefix("www.")
+
+    source = _source_for_host(host)
+    extractor = KEY_EXTRACTORS.get(source)
+    key = extractor(parts.path) if extractor else None
+    if key:
+        return f"{source}:{key}"
+
+    query = [
+        (k, v) for k, v in parse_qsl(parts.query)
+        if not k.lower().startswith("utm_") and k.lower() not in TRACKING_PARAMS
+    ]
+    url = f"https://{host}{parts.path.rstrip('/')}"
+    return f"{url}?{urlencode(sorted(query))}" if query else url
@@ -1,8 +1,25 @@
-from dataclasses import dataclass
+import threading
+from dataclasses import dataclass, field, fields
+from typing import Callable
+from src.listing_ids import listing_id
+from src.normalize import Range, parse_listing_sqft, parse_monthly_cost
 
+# Fields the parsed numbers are derived from
+_PARSED_FROM = frozenset({"title", "price", "sqft"})
 
-@dataclass
+
+@dataclass(slots=True)
 class Listing:
+    """One scraped listing.
+
+    The string fields are kept as scraped for the sheet; sqft_range and
+    monthly_cost are parsed from them once (and again if price, sqft or
+    title change), so filters compare numbers. A scraper can defer the
+    fetch that fills full_text by setting text_loader, which returns the
+    fields it found rather than setting them; load_text() runs it, so only
+    listings that reach review pay for the text.
+    """
+
     title: str
     price: str
     sqft: str
@@ -12,7 +29,70 @@ class Listing:
     lat: float | None = None
     lng: float | None = None
     full_text: str = ""
+    # How far lat/lng may be from the real spot, in miles; 0 for an exact
+    # location, more for a geocoded one such as a ZIP centroid
+    location_error_miles: float = 0.0
+    # Miles from the search center, set by the geo filter for sorting
+    distance_miles: float | None = None
+    text_loader: Callable[["Listing", threading.Event | None], dict] | None = field(
+        default=None, repr=False, compare=False
+    )
+    sqft_range: Range | None = field(init=False, repr=False, compare=False)
+    monthly_cost: Range | None = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        self._parse()
+
+    def __setattr__(self, name, value) -> None:
+        object.__setattr__(self, name, value)
+        # Keep the parsed numbers in step, once __post_init__ has set them
+        if name in _PARSED_FROM and hasattr(self, "monthly_cost"):
+            self._parse()
+
+    def _parse(self) -> None:
+        self.sqft_range = parse_listing_sqft(self.sqft, self.title)
+        self.monthly_cost = parse_monthly_cost(self.price, self.sqft_range)
 
     @property
     def unique_key(self) -> str:
-        return self.link
+        """Canonical id used for seen-listing matching (see src/listing_ids.py)."""
+        return listing_id(self.link)
+
+    def fetch_text(self, stop: threading.Event | None = None) -> dict:
+        """Run the deferred fetch, if one is attached, and return what it found.
+
+        The listing itself is left alone, so this is safe to call off the
+        thread that owns it; apply the result there with update().
+        """
+        if self.text_loader is None:
+            return {}
+        return self.text_loader(self, stop) or {}
+
+    def update(self, detail: dict) -> None:
+        for name, value in detail.items():
+            setattr(self, name, value)
+
+    def load_text(self, stop: threading.Event | None = None) -> None:
+        """Run the deferred full_text fetch once and apply it; stop cancels it."""
+        detail = self.fetch_text(stop)
+        self.text_loader = None
+        self.update(detail)
+
+    def to_dict(self) -> dict:
+        return {name: getattr(self, name) for name in _SERIALIZED}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Listing":
+        return cls(**{k: v for k, v in data.items() if k in _SERIALIZED})
+
+
+_SERIALIZED = tuple(f.name for f in fields(Listing) if f.init and f.name != "text_loader")
+
+
+@dataclass
+class ReviewResult:
+    approved: bool
+    est_monthly_cost: str
+    suitability_score: int
+    reasoning: str
+    error: bool = False  # True when Claude's response couldn't be parsed
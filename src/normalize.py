@@ -0,0 +1,76 @@
+"""Parse the free-text price and sqft strings scrapers return into numbers.
+
+Scraped values look like "$1,800", "$2.50/SF/MO", "$24 - $36 /SF/YR",
+"$36,000/yr", "1,200 SF" or "500 - 1,200 Sqft". Everything is returned as a
+(low, high) range so callers can be conservative: a single value is a range
+with low == high. None means the string couldn't be understood.
+"""
+
+import re
+
+_NUM = r"\d[\d,]*(?:\.\d+)?"
+_PRICE_RE = re.compile(rf"\$\s*({_NUM})(?:\s*(?:-|–|to)\s*\$?\s*({_NUM}))?", re.IGNORECASE)
+_SQFT_UNIT = r"(?:sf|sq\.?\s*ft\.?|sqft|square\s*f(?:ee|oo)t|ft2|ft²)"
+_SQFT_RE = re.compile(
+    rf"({_NUM})\s*(?:(?:-|–|to)\s*({_NUM})\s*)?{_SQFT_UNIT}(?![a-z])", re.IGNORECASE
+)
+_BARE_SQFT_RE = re.compile(rf"^\s*({_NUM})(?:\s*(?:-|–|to)\s*({_NUM}))?\s*$")
+_PER_SF_RE = re.compile(rf"(?:/|per)\s*{_SQFT_UNIT}", re.IGNORECASE)
+_YEARLY_RE = re.compile(r"(?:/|per)\s*(?:yr|year|yearly|annum)|annual|yearly", re.IGNORECASE)
+_MONTHLY_RE = re.compile(r"(?:/|per)\s*(?:mo|month|monthly)|monthly", re.IGNORECASE)
+
+Range = tuple[float, float]
+
+
+def _to_float(text: str) -> float:
+    return float(text.replace(",", ""))
+
+
+def _range(match: re.Match) -> Range:
+    low = _to_float(match.group(1))
+    high = _to_float(match.group(2)) if match.group(2) else low
+    return (min(low, high), max(low, high))
+
+
+def parse_sqft(text: str) -> Range | None:
+    """Square footage from a sqft field; a bare number is taken as sqft."""
+    if not text:
+        return None
+    match = _SQFT_RE.search(text) or _BARE_SQFT_RE.match(text)
+    return _range(match) if match else None
+
+
+def parse_monthly_cost(price: str, sqft: Range | None = None) -> Range | None:
+    """Monthly rent range from a price string.
+
+    Per-square-foot prices need a sqft range and are assumed to be annual
+    unless marked monthly, which is how commercial listings quote them.
+    Totals are assumed monthly unless marked annual.
+    """
+    if not price:
+        return None
+    match = _PRICE_RE.search(price)
+    if not match:
+        return None
+    low, high = _range(match)
+    rest = price[match.end():]
+
+    if _PER_SF_RE.search(rest):
+        if sqft is None:
+            return None
+        low, high = low * sqft[0], high * sqft[1]
+        if not _MONTHLY_RE.search(rest):
+            low, high = low / 12, high / 12
+    elif _YEARLY_RE.search(rest):
+        low, high = low / 12, high / 12
+    return (low, high)
+
+
+def parse_listing_sqft(sqft: str, title: str) -> Range | None:
+    """Sqft from a sqft field, falling back to a "600 sqft"-style title."""
+    parsed = parse_sqft(sqft)
+    if parsed is None:
+        match = _SQFT_RE.search(title)
+        parsed = _range(match) if match else None
+    return parsed
+
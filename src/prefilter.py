@@ -0,0 +1,37 @@
+import logging
+from src.models import Listing, ReviewResult
+
+logger = logging.getLogger(__name__)
+
+
+def prefilter(
+    listing: Listing,
+    max_price: float,
+    min_sqft: float,
+    price_margin: float = 1.25,
+    sqft_margin: float = 0.75,
+) -> ReviewResult | None:
+    """Reject listings that are plainly over budget or too small.
+
+    Returns a rejection ReviewResult, or None when the listing passes or its
+    numbers are ambiguous and it should go to Claude.
+    """
+    cost = listing.monthly_cost
+    if cost is not None and cost[0] > max_price * price_margin:
+        return ReviewResult(
+            approved=False,
+            est_monthly_cost=f"${cost[0]:,.0f}",
+            suitability_score=0,
+            reasoning=f"Pre-filter: at least ${cost[0]:,.0f}/mo, over the ${max_price:,.0f} budget",
+        )
+
+    sqft = listing.sqft_range
+    if sqft is not None and sqft[1] < min_sqft * sqft_margin:
+        return ReviewResult(
+            approved=False,
+            est_monthly_cost=f"${cost[0]:,.0f}" if cost else "Unknown",
+            suitability_score=0,
+            reasoning=f"Pre-filter: at most {sqft[1]:,.0f} sqft, under the {min_sqft:,.0f} sqft minimum",
+        )
+
+    return None
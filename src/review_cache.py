@@ -0,0 +1,70 @@
+import hashlib
+import logging
+import re
+import time
+from dataclasses import asdict
+from src.models import Listing, ReviewResult
+from src.storage import Store, load_json, save_json
+
+logger = logging.getLogger(__name__)
+
+CACHE_KEY = "review_cache.json"
+
+
+def _normalize(text: str) -> str:
+    return re.sub(r"\s+", " ", text).strip().lower()
+
+
+def content_hash(listing: Listing) -> str:
+    """Hash of the fields that identify a listing's content, independent of its URL."""
+    parts = [
+        listing.title,
+        listing.price,
+        listing.sqft,
+        listing.address,
+        listing.full_text,
+    ]
+    joined = "\x1f".join(_normalize(p) for p in parts)
+    return hashlib.sha256(joined.encode()).hexdigest()
+
+
+class ReviewCache:
+    """Persistent map from listing content hash to its earlier ReviewResult.
+
+    Reposts of the same ad under a new URL hash the same, so they reuse the
+    cached review instead of going back to Claude. Entries older than the TTL
+    are evicted on save.
+    """
+
+    def __init__(self, store: Store, ttl_days: float = 30, clock=time.time):
+        self.store = store
+        self.ttl_seconds = ttl_days * 86400
+        self.clock = clock
+        self.entries: dict[str, dict] = load_json(store, CACHE_KEY, {})
+
+    def get(self, listing: Listing) -> ReviewResult | None:
+        entry = self.entries.get(content_hash(listing))
+        if entry is None or self._expired(entry):
+            return None
+        if listing.link not in entry["links"]:
+            entry["links"].append(listing.link)
+        return ReviewResult(**entry["result"])
+
+    def put(self, listing: Listing, result: ReviewResult) -> None:
+        if result.error:
+            return  # don't pin a parse failure; retry it next time
+        self.entries[content_hash(listing)] = {
+            "result": asdict(result),
+            "links": [listing.link],
+            "stored_at": self.clock(),
+        }
+
+    def save(self) -> None:
+        before = len(self.entries)
+        self.entries = {k: v for k, v in self.entries.items() if not self._expired(v)}
+        if before != len(self.entries):
+            logger.info(f"Evicted {before - len(self.entries)} expired review cache entries")
+        save_json(self.store, CACHE_KEY, self.entries)
+
+    def _expired(self, entry: dict) -> bool:
+        return self.clock() - entry["stored_at"] > self.ttl_seconds
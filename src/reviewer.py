@@ -1,8 +1,14 @@
 import json
 import logging
-from dataclasses import dataclass
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field, fields
+from typing import Callable
 import anthropic
-from src.models import Listing
+from src.deadline import Deadline, DeadlineExceeded
+from src.models import Listing, ReviewResult
 
 logger = logging.getLogger(__name__)
 
@@ -18,9 +24,11 @@ Your job:
 1. Parse the TRUE monthly cost from the listing (handle $/sqft pricing, ranges, negotiable terms, etc.)
 2. Estimate usable square footage
 3. Assess suitability for a carpentry workshop (score 1-10)
-4. Decide: approved (worth contacting) or rejected (clearly unsuitable)
+4. Decide: approved (worth contacting) or rejected (clearly unsuitable)"""
 
-Respond with ONLY valid JSON:
+# The answer format lives in the user message, so single and batch requests
+# share the cached system prompt without contradicting it.
+SINGLE_INSTRUCTIONS = """Respond with ONLY valid JSON:
 {
     "approved": true/false,
     "est_monthly_cost": "$X,XXX",
@@ -28,19 +36,49 @@ Respond with ONLY valid JSON:
     "reasoning": "Brief explanation"
 }"""
 
+MODEL = "claude-haiku-4-5-20251001"
+
+# The system prompt is the only static prefix (listing text comes after the
+# breakpoint), and at a couple of hundred tokens it is well below the
+# model's minimum cacheable length, so today the API ignores this marker and
+# every call pays full input price. It is kept so the prompt is cached
+# if it grows past that minimum; cache_read_input_tokens in the usage totals
+# shows whether it does.
+SYSTEM_BLOCKS = [
+    {"type": "text", "text": SYSTEM_PROMPT, "cache_control": {"type": "ephemeral"}},
+]
+
 
 @dataclass
-class ReviewResult:
-    approved: bool
-    est_monthly_cost: str
-    suitability_score: int
-    reasoning: str
+class TokenUsage:
+    """Running token totals for a run; safe to update from several threads."""
+
+    requests: int = 0
+    input_tokens: int = 0
+    output_tokens: int = 0
+    cache_creation_input_tokens: int = 0
+    cache_read_input_tokens: int = 0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    def add(self, usage) -> None:
+        def count(name: str) -> int:
+            value = getattr(usage, name, None)
+            return value if isinstance(value, int) else 0
 
+        with self._lock:
+            self.requests += 1
+            self.input_tokens += count("input_tokens")
+            self.output_tokens += count("output_tokens")
+            self.cache_creation_input_tokens += count("cache_creation_input_tokens")
+            self.cache_read_input_tokens += count("cache_read_input_tokens")
 
-def review_listing(listing: Listing, api_key: str) -> ReviewResult:
-    client = anthropic.Anthropic(api_key=api_key)
+    def as_dict(self) -> dict:
+        with self._lock:
+            return {f.name: getattr(self, f.name) for f in fields(self) if f.name != "_lock"}
 
-    user_content = f"""Title: {listing.title}
+
+def format_listing(listing: Listing) -> str:
+    return f"""Title: {listing.title}
 Listed Price: {listing.price}
 Listed Sqft: {listing.sqft}
 Address: {listing.address}
@@ -49,39 +87,281 @@ Source: {listing.source}
 Full listing text:
 {listing.full_text}"""
 
-    try:
-        response = client.messages.create(
-            model="claude-haiku-4-5-20251001",
-            max_tokens=300,
-            system=SYSTEM_PROMPT,
-            messages=[{"role": "user", "content": user_content}],
-        )
 
-        raw = response.content[0].text if response.content else ""
-        logger.info(f"Claude response (stop={response.stop_reason}, len={len(raw)}): {raw[:100]}")
-        # Strip markdown code fences if present
-        cleaned = raw.strip()
-        if cleaned.startswith("```"):
-            cleaned = cleaned.split("\n", 1)[1] if "\n" in cleaned else cleaned[3:]
-            if cleaned.endswith("```"):
-                cleaned = cleaned[:-3]
-            cleaned = cleaned.strip()
-        data = json.loads(cleaned)
+def _strip_code_fences(raw: str) -> str:
+    cleaned = raw.strip()
+    if cleaned.startswith("```"):
+        cleaned = cleaned.split("\n", 1)[1] if "\n" in cleaned else cleaned[3:]
+        if cleaned.endswith("```"):
+            cleaned = cleaned[:-3]
+        cleaned = cleaned.strip()
+    return cleaned
 
-        return ReviewResult(
-            approved=bool(data["approved"]),
-            est_monthly_cost=str(data.get("est_monthly_cost", "Unknown")),
-            suitability_score=int(data.get("suitability_score", 0)),
-            reasoning=str(data.get("reasoning", "")),
-        )
-    except (json.JSONDecodeError, KeyError, IndexError) as e:
+
+def _result_from_data(data: dict) -> ReviewResult:
+    return ReviewResult(
+        approved=bool(data["approved"]),
+        est_monthly_cost=str(data.get("est_monthly_cost", "Unknown")),
+        suitability_score=int(data.get("suitability_score", 0)),
+        reasoning=str(data.get("reasoning", "")),
+    )
+
+
+def _response_text(response) -> str:
+    raw = response.content[0].text if response.content else ""
+    logger.info(f"Claude response (stop={response.stop_reason}, len={len(raw)}): {raw[:100]}")
+    return raw
+
+
+def build_request(listing: Listing) -> dict:
+    """messages.create parameters for reviewing a single listing."""
+    return {
+        "model": MODEL,
+        "max_tokens": 300,
+        "system": SYSTEM_BLOCKS,
+        "messages": [
+            {"role": "user", "content": format_listing(listing) + "\n\n" + SINGLE_INSTRUCTIONS}
+        ],
+    }
+
+
+def parse_review(raw: str) -> ReviewResult:
+    """Parse Claude's JSON answer for one listing; unparseable answers become rejections."""
+    try:
+        return _result_from_data(json.loads(_strip_code_fences(raw)))
+    except (KeyError, IndexError, TypeError, ValueError) as e:
         logger.error(f"Failed to parse Claude response: {e}, raw: {raw[:200] if raw else '(empty)'}")
         return ReviewResult(
             approved=False,
             est_monthly_cost="Unknown",
             suitability_score=0,
             reasoning=f"Error parsing Claude response: {e}",
+            error=True,
         )
+
+
+def review_listing(
+    listing: Listing,
+    api_key: str | None = None,
+    client: anthropic.Anthropic | None = None,
+    usage: TokenUsage | None = None,
+) -> ReviewResult:
+    if client is None:
+        client = anthropic.Anthropic(api_key=api_key)
+
+    try:
+        response = client.messages.create(**build_request(listing))
     except anthropic.APIError as e:
         logger.error(f"Anthropic API error: {e}")
         raise
+    if usage is not None:
+        usage.add(response.usage)
+
+    return parse_review(_response_text(response))
+
+
+BATCH_INSTRUCTIONS = """Evaluate each of the {count} listings below independently, using the same criteria.
+
+Respond with ONLY a valid JSON array containing one object per listing, each with the listing's "index" plus the usual fields:
+[{{"index": 0, "approved": true/false, "est_monthly_cost": "$X,XXX", "suitability_score": 1-10, "reasoning": "Brief explanation"}}]"""
+
+
+def review_batch(
+    listings: list[Listing],
+    client: anthropic.Anthropic,
+    usage: TokenUsage | None = None,
+) -> list[ReviewResult | None]:
+    """Review several listings in one request.
+
+    Returns one entry per listing, in order; an entry is None when Claude's
+    answer for that listing was missing or malformed, so the caller can retry
+    just that listing on its own.
+    """
+    sections = [f"=== Listing {i} ===\n{format_listing(l)}" for i, l in enumerate(listings)]
+    user_content = BATCH_INSTRUCTIONS.format(count=len(listings)) + "\n\n" + "\n\n".join(sections)
+
+    response = client.messages.create(
+        model=MODEL,
+        max_tokens=300 * len(listings),
+        system=SYSTEM_BLOCKS,
+        messages=[{"role": "user", "content": user_content}],
+    )
+    if usage is not None:
+        usage.add(response.usage)
+
+    results: list[ReviewResult | None] = [None] * len(listings)
+    raw = _response_text(response)
+    try:
+        entries = json.loads(_strip_code_fences(raw))
+    except json.JSONDecodeError as e:
+        logger.error(f"Failed to parse batch response: {e}, raw: {raw[:200] if raw else '(empty)'}")
+        return results
+    if not isinstance(entries, list):
+        logger.error(f"Batch response is not a JSON array: {raw[:200]}")
+        return results
+
+    for entry in entries:
+        try:
+            index = int(entry["index"])
+            if 0 <= index < len(listings) and results[index] is None:
+                results[index] = _result_from_data(entry)
+        except (KeyError, TypeError, ValueError) as e:
+            logger.warning(f"Skipping malformed batch entry {entry!r}: {e}")
+    return results
+
+
+# HTTP statuses worth retrying: rate limited, server errors, overloaded.
+RETRYABLE_STATUS = {429, 500, 502, 503, 504, 529}
+
+
+def _is_retryable(e: Exception) -> bool:
+    if isinstance(e, anthropic.APIConnectionError):
+        return True
+    return isinstance(e, anthropic.APIStatusError) and e.status_code in RETRYABLE_STATUS
+
+
+def _retry_delay(e: Exception, attempt: int) -> float:
+    """Seconds to wait before retrying: the server's retry-after, else exponential backoff."""
+    response = getattr(e, "response", None)
+    if response is not None:
+        retry_after = response.headers.get("retry-after")
+        if retry_after:
+            try:
+                return max(float(retry_after), 0.0)
+            except ValueError:
+                pass
+    return min(2**attempt, 60) + random.uniform(0, 1)
+
+
+class ReviewEngine:
+    """Reviews many listings concurrently through one pooled Anthropic client.
+
+    Retries are handled here rather than in the SDK so that a 429 pauses every
+    worker until the server's retry-after has passed, instead of each thread
+    hammering the API on its own schedule. With batch_size > 1, each request
+    reviews up to batch_size listings at once.
+    """
+
+    def __init__(
+        self,
+        api_key: str,
+        concurrency: int = 8,
+        max_retries: int = 5,
+        batch_size: int = 1,
+        estimate_seconds: float = 15.0,
+        client: anthropic.Anthropic | None = None,
+    ):
+        self.client = client or anthropic.Anthropic(api_key=api_key, max_retries=0)
+        self.concurrency = max(1, concurrency)
+        self.max_retries = max_retries
+        self.batch_size = max(1, batch_size)
+        self.usage = TokenUsage()
+        self._lock = threading.Lock()
+        self._resume_at = 0.0
+        # Moving average of how long one request takes, used to decide whether
+        # there's still time to start another before the deadline.
+        self._estimate = estimate_seconds
+
+    def _pause(self, seconds: float) -> None:
+        with self._lock:
+            self._resume_at = max(self._resume_at, time.monotonic() + seconds)
+
+    def _wait_for_rate_limit(self) -> None:
+        with self._lock:
+            delay = self._resume_at - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+
+    def _with_retries(self, fn, description: str, deadline: Deadline | None = None):
+        attempt = 0
+        while True:
+            self._wait_for_rate_limit()
+            try:
+                started = time.monotonic()
+                result = fn()
+                self._record_duration(time.monotonic() - started)
+                return result
+            except anthropic.APIError as e:
+                if attempt >= self.max_retries or not _is_retryable(e):
+                    raise
+                delay = _retry_delay(e, attempt)
+                if deadline is not None and not deadline.can_start(delay + self._estimate):
+                    raise DeadlineExceeded(f"no time left to retry {description}") from e
+                logger.warning(f"Retrying {description} in {delay:.1f}s: {e}")
+                self._pause(delay)
+                attempt += 1
+
+    def _record_duration(self, seconds: float) -> None:
+        with self._lock:
+            self._estimate = 0.7 * self._estimate + 0.3 * seconds
+
+    def review(self, listing: Listing, deadline: Deadline | None = None) -> ReviewResult:
+        logger.info(f"Reviewing: {listing.title}")
+        return self._with_retries(
+            lambda: review_listing(listing, client=self.client, usage=self.usage),
+            f"review of {listing.link}",
+            deadline,
+        )
+
+    def review_batch(
+        self, listings: list[Listing], deadline: Deadline | None = None
+    ) -> list[ReviewResult | None]:
+        """Review listings in one request, retrying missing entries one by one."""
+        if len(listings) == 1:
+            return [self.review(listings[0], deadline)]
+        logger.info(f"Reviewing batch of {len(listings)}: {listings[0].title} ...")
+        results = self._with_retries(
+            lambda: review_batch(listings, self.client, usage=self.usage),
+            f"batch of {len(listings)} reviews",
+            deadline,
+        )
+        missing = [i for i, r in enumerate(results) if r is None]
+        if missing:
+            logger.warning(f"{len(missing)} of {len(listings)} batch entries missing, retrying individually")
+        for i in missing:
+            try:
+                results[i] = self.review(listings[i], deadline)
+            except DeadlineExceeded:
+                break  # leave the rest deferred
+        return results
+
+    def _review_chunk(
+        self,
+        chunk: list[Listing],
+        deadline: Deadline | None,
+        on_result: Callable[[Listing, ReviewResult], None] | None,
+    ) -> list[ReviewResult | None]:
+        if deadline is not None and not deadline.can_start(self._estimate):
+            return [None] * len(chunk)
+        try:
+            results = self.review_batch(chunk, deadline)
+        except DeadlineExceeded as e:
+            logger.warning(f"Deferring {len(chunk)} reviews: {e}")
+            return [None] * len(chunk)
+        if on_result is not None:
+            for listing, result in zip(chunk, results):
+                if result is not None:
+                    on_result(listing, result)
+        return results
+
+    def review_all(
+        self,
+        listings: list[Listing],
+        deadline: Deadline | None = None,
+        on_result: Callable[[Listing, ReviewResult], None] | None = None,
+    ) -> list[ReviewResult | None]:
+        """Review every listing, returning results in the same order as the input.
+
+        With a deadline, no new request is started once the projected finish
+        would run past it; those listings come back as None (deferred).
+        on_result is called from the worker threads as each review completes.
+        """
+        if not listings:
+            return []
+        chunks = [
+            listings[i:i + self.batch_size] for i in range(0, len(listings), self.batch_size)
+        ]
+        workers = min(self.concurrency, len(chunks))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="review") as pool:
+            reviewed = pool.map(lambda chunk: self._review_chunk(chunk, deadline, on_result), chunks)
+            return [result for chunk in reviewed for result in chunk]
@@ -0,0 +1,69 @@
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
+from typing import Callable
+from src.models import Listing
+
+logger = logging.getLogger(__name__)
+
+# Extra time a source gets to return its partial results after being told to stop.
+STOP_GRACE_SECONDS = 5.0
+
+ScrapeFn = Callable[[threading.Event], list[Listing]]
+
+
+def scrape_all(
+    sources: dict[str, ScrapeFn],
+    budgets: dict[str, float],
+    on_complete: Callable[[str], None] | None = None,
+) -> dict[str, list[Listing]]:
+    """Run every source concurrently, each bounded by its own time budget.
+
+    Each source is called with a stop event. When a source overruns its budget
+    the event is set so it can return what it has; if it still doesn't finish
+    within STOP_GRACE_SECONDS its results are dropped. One source failing or
+    timing out never affects the others. on_complete is called with the name
+    of each source whose results were kept (not failed or dropped).
+    """
+    results: dict[str, list[Listing]] = {}
+    if not sources:
+        return results
+
+    executor = ThreadPoolExecutor(max_workers=len(sources), thread_name_prefix="scrape")
+    start = time.monotonic()
+    stops = {name: threading.Event() for name in sources}
+    futures = {name: executor.submit(fn, stops[name]) for name, fn in sources.items()}
+
+    def stop_source(name: str) -> None:
+        if not futures[name].done():
+            logger.warning(f"{name} exceeded its {budgets.get(name, 0.0):.0f}s budget, stopping")
+            stops[name].set()
+
+    # Each source is stopped at its own budget, however long the others take
+    timers = [threading.Timer(budgets.get(name, 0.0), stop_source, args=(name,)) for name in sources]
+    for timer in timers:
+        timer.daemon = True
+        timer.start()
+
+    try:
+        for name, future in futures.items():
+            ends_at = start + budgets.get(name, 0.0) + STOP_GRACE_SECONDS
+            try:
+                results[name] = future.result(timeout=max(ends_at - time.monotonic(), 0.0))
+                if on_complete:
+                    on_complete(name)
+            except TimeoutError:
+                future.cancel()
+                logger.warning(f"{name} did not stop in time, dropping its results")
+                results[name] = []
+            except Exception as e:
+                logger.error(f"{name} scraper failed: {e}")
+                results[name] = []
+    finally:
+        for timer in timers:
+            timer.cancel()
+
+    # Don't block on stragglers; their threads are abandoned.
+    executor.shutdown(wait=False, cancel_futures=True)
+    return results
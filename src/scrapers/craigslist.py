@@ -1,61 +1,198 @@
-import time
-import random
 import logging
-from bs4 import BeautifulSoup
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable
+from urllib.parse import urlencode
 import requests
+from src.config import CRAIGSLIST_DETAIL_CONFIG
 from src.models import Listing
+from src.scrapers.http_cache import ResponseCache
+from src.scrapers.parsing import elements_with_class, parse_html
+from src.scrapers.scheduler import RequestScheduler, make_scheduler
 
 logger = logging.getLogger(__name__)
 
+# Only the result cards are parsed out of a search page
+RESULT_CARDS = elements_with_class("li", "cl-static-search-result")
+
 SEARCH_PATHS = [
     "/search/san-francisco-ca/off",
 ]
 
+# JSON search endpoint used by the Craigslist web app. Unlike the static HTML
+# results it carries coordinates for every posting.
+SEARCH_API_URL = "https://sapi.craigslist.org/web/v8/postings/search/full"
+JSON_SEARCH_PATH = "off"
+AREA_IDS = {"sfbay": 1}
+
+# Sentinel for a search page the response cache says hasn't changed
+UNCHANGED = object()
+
 MAX_DETAIL_FETCHES = 50
 
+# Craigslist pacing inside a scheduler shared with other scrapers
+HOST_LIMITS = {
+    "craigslist.org": (
+        CRAIGSLIST_DETAIL_CONFIG["rate_per_second"],
+        CRAIGSLIST_DETAIL_CONFIG["max_in_flight"],
+    ),
+}
+
 
 class CraigslistScraper:
     BASE_URL = "https://sfbay.craigslist.org"
 
-    def __init__(self, region: str = "sfbay", max_price: int | None = None):
+    def __init__(
+        self,
+        region: str = "sfbay",
+        max_price: int | None = None,
+        is_seen: Callable[[str], bool] | None = None,
+        scheduler: RequestScheduler | None = None,
+        cache: ResponseCache | None = None,
+        search_mode: str = "html",
+        in_area: Callable[[float, float], bool] | None = None,
+    ):
         self.region = region
         self.max_price = max_price
+        # Listings whose unique_key is already seen skip the detail fetch, so
+        # the detail budget goes to listings we have never reviewed.
+        self.is_seen = is_seen or (lambda key: False)
+        self.scheduler = scheduler or make_scheduler(host_limits=HOST_LIMITS)
+        self.cache = cache
+        # "json" tries the JSON search endpoint first and falls back to HTML
+        self.search_mode = search_mode
+        self.in_area = in_area or (lambda lat, lng: True)
+        # How long the last scrape took; deferred detail fetches get the rest
+        # of the Craigslist budget
+        self.search_seconds = 0.0
         self.session = requests.Session()
         self.session.headers.update(
             {"User-Agent": "ShopSeeker/1.0 (workshop space finder)"}
         )
 
-    def scrape(self) -> list[Listing]:
+    def scrape(self, stop: threading.Event | None = None) -> list[Listing]:
+        stop = stop or threading.Event()
+        started = time.monotonic()
+        try:
+            return self._scrape(stop)
+        finally:
+            self.search_seconds = time.monotonic() - started
+
+    def _scrape(self, stop: threading.Event) -> list[Listing]:
+        listings = None
+        if self.search_mode == "json":
+            listings = self._search_json(stop)
+            if listings is None and not stop.is_set():
+                logger.warning("Craigslist JSON search failed, falling back to HTML")
+        from_json = listings is not None
+        if listings is None:
+            listings = self._search_html(stop)
+
+        # Out-of-area listings are dropped by the handler anyway; don't spend
+        # detail fetches on them
+        to_fetch = [
+            l for l in listings
+            if not self.is_seen(l.unique_key)
+            and (l.lat is None or l.lng is None or self.in_area(l.lat, l.lng))
+        ][:MAX_DETAIL_FETCHES]
+        if from_json:
+            # Coordinates came with the search results, so the detail page is
+            # only needed for its text; fetch it once the listing reaches review
+            for listing in to_fetch:
+                listing.text_loader = self._read_detail
+        else:
+            self._fetch_details(to_fetch, stop)
+        return listings
+
+    def _search_page(self, url: str, params: dict, stop: threading.Event):
+        """Fetch one search page; None on failure, "unchanged" if the cache says so."""
+        logger.info(f"Scraping {url} params={params}")
+        # The price filter is part of what the page shows, so key on it too
+        cache_key = f"{url}?{urlencode(params)}"
+        headers = self.cache.headers_for(cache_key) if self.cache else {}
+        resp = self._get(url, stop, params=params, headers=headers)
+        if resp is None:
+            return None
+        if self.cache and self.cache.unchanged(cache_key, resp, "craigslist"):
+            logger.info(f"{url} unchanged since last run, skipping")
+            return UNCHANGED
+        return resp
+
+    def _search_html(self, stop: threading.Event) -> list[Listing]:
         listings = []
-        detail_count = 0
         for path in SEARCH_PATHS:
-            url = f"{self.BASE_URL}{path}"
-            params = {}
-            if self.max_price:
-                params["max_price"] = self.max_price
-            logger.info(f"Scraping {url} params={params}")
-            try:
-                resp = self.session.get(url, params=params, timeout=30)
-                resp.raise_for_status()
-            except requests.RequestException as e:
-                logger.error(f"Failed to fetch {url}: {e}")
+            if stop.is_set():
+                break
+            params = {"max_price": self.max_price} if self.max_price else {}
+            resp = self._search_page(f"{self.BASE_URL}{path}", params, stop)
+            if resp is None or resp is UNCHANGED:
                 continue
 
-            soup = BeautifulSoup(resp.text, "html.parser")
+            soup = parse_html(resp.text, only=RESULT_CARDS)
             result_items = soup.select("li.cl-static-search-result")
             logger.info(f"Found {len(result_items)} search results")
 
             for item in result_items:
                 listing = self._parse_result(item)
                 if listing:
-                    if detail_count < MAX_DETAIL_FETCHES:
-                        self._fetch_detail(listing)
-                        detail_count += 1
-                        time.sleep(random.uniform(1, 2))
                     listings.append(listing)
+        return listings
+
+    def _search_json(self, stop: threading.Event) -> list[Listing] | None:
+        """Search through the JSON endpoint, which has coordinates for every result.
+
+        Returns None if the endpoint fails or its payload isn't in the shape
+        we know, so the caller can fall back to the HTML search.
+        """
+        area_id = AREA_IDS.get(self.region)
+        if area_id is None:
+            return None
+        params = {"batch": f"{area_id}-0-360-0-0", "cc": "US", "lang": "en", "searchPath": JSON_SEARCH_PATH}
+        if self.max_price:
+            params["max_price"] = self.max_price
+        resp = self._search_page(SEARCH_API_URL, params, stop)
+        if resp is None:
+            return None
+        if resp is UNCHANGED:
+            return []
+
+        try:
+            data = resp.json()["data"]
+            decode, items = data["decode"], list(data["items"])
+        except (ValueError, KeyError, TypeError) as e:
+            logger.warning(f"Unexpected Craigslist JSON search payload: {e}")
+            return None
 
+        listings = []
+        for item in items:
+            # One odd result (e.g. no location) shouldn't cost the whole page
+            try:
+                listing = self._parse_json_item(item, decode)
+            except (ValueError, KeyError, TypeError, IndexError, AttributeError) as e:
+                logger.warning(f"Skipping malformed Craigslist result {str(item)[:100]}: {e}")
+                continue
+            if listing:
+                listings.append(listing)
+        logger.info(f"Found {len(listings)} search results")
         return listings
 
+    def _get(self, url: str, stop: threading.Event | None = None, **kwargs) -> requests.Response | None:
+        """GET through the shared scheduler; None on failure or if stopped first."""
+        try:
+            return self.scheduler.get(self.session, url, stop, timeout=30, **kwargs)
+        except requests.RequestException as e:
+            logger.error(f"Failed to fetch {url}: {e}")
+            return None
+
+    def _fetch_details(self, listings: list[Listing], stop: threading.Event | None = None) -> None:
+        """Fetch detail pages with a small worker pool; the scheduler sets the pace."""
+        if not listings:
+            return
+        workers = min(CRAIGSLIST_DETAIL_CONFIG["workers"], len(listings))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            list(pool.map(lambda l: self._fetch_detail(l, stop), listings))
+
     def _parse_result(self, item) -> Listing | None:
         link_tag = item.select_one("a")
         if not link_tag:
@@ -80,27 +217,71 @@ class CraigslistScraper:
             source="craigslist",
         )
 
-    def _fetch_detail(self, listing: Listing) -> None:
-        try:
-            resp = self.session.get(listing.link, timeout=30)
-            resp.raise_for_status()
-        except requests.RequestException as e:
-            logger.error(f"Failed to fetch detail {listing.link}: {e}")
-            return
+    def _parse_json_item(self, item: list, decode: dict) -> Listing | None:
+        """Build a Listing from one JSON search result.
+
+        A result is a list: [posting id - decode.minPostingId, posted date
+        offset, category id, price, "location index~lat~lng", ...], followed
+        by tagged lists ([6, slug], [10, formatted price], ...) and the title
+        as the last string.
+        """
+        post_id = decode["minPostingId"] + item[0]
+        tagged = {part[0]: part[1:] for part in item[5:] if isinstance(part, list) and part}
+        strings = [part for part in item[5:] if isinstance(part, str)]
+        if 6 not in tagged or not strings:
+            return None
+
+        location, _, coords = item[4].partition("~")
+        location_index = int(location.split(":")[0])
+        _, hostname, *subarea = decode["locations"][location_index]
+        prefix = f"/{subarea[0]}" if subarea and subarea[0] else ""
+        link = f"https://{hostname}.craigslist.org{prefix}/{JSON_SEARCH_PATH}/d/{tagged[6][0]}/{post_id}.html"
+
+        lat = lng = None
+        if coords:
+            lat_str, _, lng_str = coords.partition("~")
+            lat, lng = float(lat_str), float(lng_str)
+
+        if 10 in tagged:
+            price = tagged[10][0]
+        else:
+            price = f"${item[3]:,}" if item[3] and item[3] > 0 else ""
+
+        return Listing(
+            title=strings[-1],
+            price=price,
+            sqft="",
+            address="",
+            link=link,
+            source="craigslist",
+            lat=lat,
+            lng=lng,
+        )
+
+    def _fetch_detail(self, listing: Listing, stop: threading.Event | None = None) -> None:
+        listing.update(self._read_detail(listing, stop))
+
+    def _read_detail(self, listing: Listing, stop: threading.Event | None = None) -> dict:
+        """Fetch a detail page and return the fields it has, leaving the listing as is."""
+        resp = self._get(listing.link, stop)
+        if resp is None:
+            return {}
 
-        soup = BeautifulSoup(resp.text, "html.parser")
+        detail = {}
+        soup = parse_html(resp.text)
         body = soup.select_one("#postingbody")
         if body:
-            listing.full_text = body.get_text(strip=True)
+            detail["full_text"] = body.get_text(strip=True)
 
         map_tag = soup.select_one("#map")
         if map_tag:
             lat = map_tag.get("data-latitude")
             lng = map_tag.get("data-longitude")
             if lat and lng:
-                listing.lat = float(lat)
-                listing.lng = float(lng)
+                detail["lat"] = float(lat)
+                detail["lng"] = float(lng)
 
         addr_tag = soup.select_one(".mapaddress")
         if addr_tag:
-            listing.address = addr_tag.get_text(strip=True)
+            detail["address"] = addr_tag.get_text(strip=True)
+        return detail
@@ -0,0 +1,60 @@
+import hashlib
+import logging
+import threading
+from src.storage import Store, load_json, save_json
+
+logger = logging.getLogger(__name__)
+
+CACHE_KEY = "http_cache.json"
+
+
+class ResponseCache:
+    """ETag, Last-Modified and body hash of each search page from the last run.
+
+    Scrapers send the validators as a conditional GET and skip a page whose
+    server answered 304 or whose body hashes the same as last time. A changed
+    page's new validators are staged under its source and only become part
+    of the cache when commit(source) is called, once that source's listings
+    were accepted. Nothing is written until save(), which the handler calls
+    only once the run's results are in the sheet. So a page is never marked
+    as handled by a source that failed or a run that died before reviewing it.
+    """
+
+    def __init__(self, store: Store):
+        self.store = store
+        self.entries: dict[str, dict] = load_json(store, CACHE_KEY, {})
+        self.staged: dict[str, dict[str, dict]] = {}
+        self._lock = threading.Lock()
+
+    def headers_for(self, url: str) -> dict[str, str]:
+        entry = self.entries.get(url, {})
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def unchanged(self, url: str, resp, source: str) -> bool:
+        """True if resp shows url hasn't changed since the last run; otherwise stage it for source."""
+        if resp.status_code == 304:
+            return True
+        digest = hashlib.sha256(resp.text.encode()).hexdigest()
+        with self._lock:
+            if self.entries.get(url, {}).get("hash") == digest:
+                return True
+            self.staged.setdefault(source, {})[url] = {
+                "etag": resp.headers.get("ETag"),
+                "last_modified": resp.headers.get("Last-Modified"),
+                "hash": digest,
+            }
+        return False
+
+    def commit(self, source: str) -> None:
+        """Keep the pages staged by source; call once its listings were accepted."""
+        with self._lock:
+            self.entries.update(self.staged.pop(source, {}))
+
+    def save(self) -> None:
+        with self._lock:
+            save_json(self.store, CACHE_KEY, self.entries)
@@ -1,50 +1,90 @@
 import logging
 import re
-import time
-from bs4 import BeautifulSoup
+import threading
+from typing import Callable
 from curl_cffi import requests
+from src.config import SCRAPER_CONFIG
 from src.models import Listing
+from src.scrapers.http_cache import ResponseCache
+from src.scrapers.parsing import elements_with_class, parse_html
+from src.scrapers.scheduler import RequestScheduler, make_scheduler
 
 logger = logging.getLogger(__name__)
 
+# Only the result cards are parsed out of a search page
+RESULT_CARDS = elements_with_class("article", "placard")
+
 SEARCH_URL = "https://www.loopnet.com/search/commercial-real-estate/san-francisco-ca/for-lease/"
 
 
+def _page_url(page: int) -> str:
+    return SEARCH_URL if page == 1 else f"{SEARCH_URL}{page}/"
+
+
 class LoopNetScraper:
-    def __init__(self):
+    def __init__(
+        self,
+        is_seen: Callable[[str], bool] | None = None,
+        max_pages: int | None = None,
+        scheduler: RequestScheduler | None = None,
+        cache: ResponseCache | None = None,
+    ):
+        # Paging stops at the first page made up only of seen listings
+        self.is_seen = is_seen or (lambda key: False)
+        self.max_pages = max_pages or SCRAPER_CONFIG["max_pages"]
+        self.cache = cache
         self.session = requests.Session(impersonate="chrome136", timeout=30)
+        self.scheduler = scheduler or make_scheduler()
 
     def _warmup(self):
         """Hit the homepage to establish cookies before searching."""
         try:
-            self.session.get("https://www.loopnet.com")
+            self.scheduler.get(self.session, "https://www.loopnet.com", retries=0)
         except Exception:
             pass
 
-    def scrape(self) -> list[Listing]:
-        logger.info(f"Scraping {SEARCH_URL}")
+    def scrape(self, stop: threading.Event | None = None) -> list[Listing]:
         self._warmup()
-        try:
-            resp = self.session.get(SEARCH_URL)
-            resp.raise_for_status()
-        except Exception as e:
-            logger.error(f"Failed to fetch {SEARCH_URL}: {e}")
-            return []
-
-        time.sleep(3)
-
-        soup = BeautifulSoup(resp.text, "html.parser")
-
-        # LoopNet uses Akamai bot protection; detect and bail out gracefully
-        if soup.select_one("#sec-if-cpt-container"):
-            logger.warning("LoopNet returned bot challenge page, skipping")
-            return []
-
         listings = []
-        for card in soup.select("article.placard"):
-            listing = self._parse_card(card)
-            if listing:
-                listings.append(listing)
+        keys = set()
+        for page in range(1, self.max_pages + 1):
+            url = _page_url(page)
+            logger.info(f"Scraping {url}")
+            headers = self.cache.headers_for(url) if self.cache else {}
+            try:
+                resp = self.scheduler.get(self.session, url, stop, headers=headers)
+            except Exception as e:
+                logger.error(f"Failed to fetch {url}: {e}")
+                break
+            if resp is None:
+                break
+            # LoopNet uses Akamai bot protection; detect and bail out gracefully.
+            # The challenge container isn't a result card, so check the raw text,
+            # and do it first so the challenge is never cached as the page.
+            if "sec-if-cpt-container" in resp.text:
+                logger.warning("LoopNet returned bot challenge page, skipping")
+                break
+            if self.cache and self.cache.unchanged(url, resp, "loopnet"):
+                # Its listings were handled when the page was recorded, so it
+                # counts as an all-seen page and ends paging like one
+                logger.info(f"LoopNet page {page} unchanged since last run, stopping")
+                break
+
+            soup = parse_html(resp.text, only=RESULT_CARDS)
+
+            page_listings = []
+            for card in soup.select("article.placard"):
+                listing = self._parse_card(card)
+                if listing and listing.unique_key not in keys:
+                    keys.add(listing.unique_key)
+                    page_listings.append(listing)
+            listings.extend(page_listings)
+
+            if not page_listings:
+                break
+            if all(self.is_seen(l.unique_key) for l in page_listings):
+                logger.info(f"LoopNet page {page} has only seen listings, stopping")
+                break
 
         logger.info(f"Found {len(listings)} LoopNet listings")
         return listings
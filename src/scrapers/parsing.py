@@ -0,0 +1,43 @@
+import re
+from functools import lru_cache
+from bs4 import BeautifulSoup, SoupStrainer
+from src.config import SCRAPER_CONFIG
+
+# BeautifulSoup tree builders, fastest first. html.parser ships with Python.
+BACKENDS = ("lxml", "html.parser")
+
+
+@lru_cache(maxsize=None)
+def available_backends() -> tuple[str, ...]:
+    available = []
+    for backend in BACKENDS:
+        if backend == "lxml":
+            try:
+                import lxml  # noqa: F401
+            except ImportError:
+                continue
+        available.append(backend)
+    return tuple(available)
+
+
+def default_backend() -> str:
+    """HTML_PARSER if set, otherwise the fastest installed backend."""
+    return SCRAPER_CONFIG["html_parser"] or available_backends()[0]
+
+
+def parse_html(markup: str, only: SoupStrainer | None = None, backend: str | None = None) -> BeautifulSoup:
+    """Parse markup, keeping only the elements matched by `only` when given.
+
+    Scoping a results page to its result cards skips building the rest of
+    the tree, which is most of the page.
+    """
+    return BeautifulSoup(markup, backend or default_backend(), parse_only=only)
+
+
+def elements_with_class(tag: str, css_class: str) -> SoupStrainer:
+    """Strainer for `tag` elements carrying css_class among their classes.
+
+    While parsing, the class attribute is still one raw string
+    ("placard tier4 landscape"), so a plain class_="placard" would not match.
+    """
+    return SoupStrainer(tag, class_=re.compile(rf"(^|\s){re.escape(css_class)}(\s|$)"))
@@ -0,0 +1,127 @@
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Callable
+
+# Longest single wait inside acquire(), so a stop event is noticed promptly.
+_POLL_SECONDS = 0.25
+
+
+@dataclass
+class _HostState:
+    base_rate: float
+    max_in_flight: int
+    rate: float
+    tokens: float
+    updated: float
+    in_flight: int = 0
+    blocked_until: float = 0.0
+
+
+@dataclass
+class HostRateLimiter:
+    """Per-host token bucket plus a cap on concurrent requests to each host.
+
+    Each host gets `rate_per_second` requests per second (bursting up to
+    `burst`) and at most `max_in_flight` at once, with up to `jitter_seconds`
+    of random extra spacing after each request. A 403/429 from a host halves
+    its rate (down to `min_rate_per_second`) and honours Retry-After; each
+    successful response wins back a tenth of the configured rate.
+
+    A rate of 0 means no pacing, only the in-flight cap.
+
+    `host_limits` gives a domain (and its subdomains) its own
+    (rate_per_second, max_in_flight), so one limiter can be shared by
+    scrapers whose sites want different pacing.
+    """
+
+    rate_per_second: float
+    max_in_flight: int = 2
+    burst: float = 1.0
+    jitter_seconds: float = 0.0
+    min_rate_per_second: float = 0.05
+    clock: Callable[[], float] = time.monotonic
+    host_limits: dict[str, tuple[float, int]] = field(default_factory=dict)
+    _hosts: dict[str, _HostState] = field(default_factory=dict, init=False, repr=False)
+    _cond: threading.Condition = field(default_factory=threading.Condition, init=False, repr=False)
+
+    def _state(self, host: str) -> _HostState:
+        if host not in self._hosts:
+            rate, max_in_flight = self._limits_for(host)
+            self._hosts[host] = _HostState(
+                base_rate=rate,
+                max_in_flight=max_in_flight,
+                rate=rate,
+                tokens=self.burst,
+                updated=self.clock(),
+            )
+        return self._hosts[host]
+
+    def _limits_for(self, host: str) -> tuple[float, int]:
+        for domain, limits in self.host_limits.items():
+            if host == domain or host.endswith("." + domain):
+                return limits
+        return self.rate_per_second, self.max_in_flight
+
+    def acquire(self, host: str, stop: threading.Event | None = None) -> bool:
+        """Block until a request to host may start; False if stop was set first."""
+        with self._cond:
+            while True:
+                if stop is not None and stop.is_set():
+                    return False
+                state = self._state(host)
+                now = self.clock()
+                state.tokens = min(self.burst, state.tokens + (now - state.updated) * state.rate)
+                state.updated = now
+
+                if now < state.blocked_until:
+                    wait = state.blocked_until - now
+                elif state.in_flight >= state.max_in_flight:
+                    wait = _POLL_SECONDS  # woken early by release()
+                elif state.rate > 0 and state.tokens < 1:
+                    wait = (1 - state.tokens) / state.rate
+                else:
+                    state.tokens -= 1 + random.uniform(0, self.jitter_seconds) * state.rate
+                    state.in_flight += 1
+                    return True
+                self._cond.wait(timeout=min(wait, _POLL_SECONDS))
+
+    def release(self, host: str) -> None:
+        with self._cond:
+            self._state(host).in_flight -= 1
+            self._cond.notify_all()
+
+    def penalize(self, host: str, retry_after: float | None = None) -> None:
+        """Back off after the host pushed back (403/429)."""
+        with self._cond:
+            state = self._state(host)
+            state.rate = max(state.rate / 2, self.min_rate_per_second)
+            state.tokens = 0
+        if retry_after:
+            self.pause(host, retry_after)
+
+    def pause(self, host: str, seconds: float) -> None:
+        """Hold every request to host for the next `seconds`."""
+        with self._cond:
+            state = self._state(host)
+            state.blocked_until = max(state.blocked_until, self.clock() + seconds)
+
+    def reward(self, host: str) -> None:
+        with self._cond:
+            state = self._state(host)
+            state.rate = min(state.base_rate, state.rate + state.base_rate / 10)
+
+    def current_rate(self, host: str) -> float:
+        with self._cond:
+            return self._state(host).rate
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """Seconds from a Retry-After header given in delta-seconds form."""
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        return None
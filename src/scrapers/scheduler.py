@@ -0,0 +1,87 @@
+import logging
+import threading
+from dataclasses import dataclass
+from urllib.parse import urlparse
+from src.config import SCRAPER_CONFIG
+from src.scrapers.ratelimit import HostRateLimiter, parse_retry_after
+
+logger = logging.getLogger(__name__)
+
+# Worth another try after a pause
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+# The host wants us to slow down
+SLOW_DOWN_STATUS = {403, 429}
+
+
+@dataclass
+class RequestScheduler:
+    """Every scraper request goes through here.
+
+    Requests are paced per host by the limiter, so a scraper only waits when
+    sending now would break the host's pacing. Connection errors and
+    retryable statuses are retried after the server's Retry-After, or after
+    an exponential backoff when it doesn't send one.
+    """
+
+    limiter: HostRateLimiter
+    max_retries: int = 2
+    backoff_seconds: float = 2.0
+    max_backoff_seconds: float = 60.0
+
+    def get(self, session, url: str, stop: threading.Event | None = None, retries: int | None = None, **kwargs):
+        """GET url with session (requests or curl_cffi).
+
+        Returns None if stop is set before the request goes out. Once retries
+        are used up, the last connection error or HTTP error is raised.
+        """
+        host = urlparse(url).netloc
+        retries = self.max_retries if retries is None else retries
+        for attempt in range(retries + 1):
+            if not self.limiter.acquire(host, stop):
+                return None
+            error = None
+            try:
+                resp = session.get(url, **kwargs)
+            except Exception as e:
+                error = e
+            finally:
+                self.limiter.release(host)
+
+            last = attempt == retries
+            if error is not None:
+                if last:
+                    raise error
+                delay = None
+                logger.warning(f"Request to {url} failed ({error}), retrying")
+            else:
+                if resp.status_code in SLOW_DOWN_STATUS:
+                    self.limiter.penalize(host)
+                if resp.status_code not in RETRYABLE_STATUS or last:
+                    resp.raise_for_status()
+                    self.limiter.reward(host)
+                    return resp
+                delay = parse_retry_after(resp.headers.get("Retry-After"))
+                logger.warning(f"{host} answered {resp.status_code}, retrying")
+
+            if delay is None:
+                delay = min(self.backoff_seconds * 2**attempt, self.max_backoff_seconds)
+            self.limiter.pause(host, delay)
+
+
+def make_scheduler(
+    rate_per_second: float | None = None,
+    max_in_flight: int | None = None,
+    host_limits: dict[str, tuple[float, int]] | None = None,
+) -> RequestScheduler:
+    """Scheduler built from SCRAPER_CONFIG, optionally with its own rate or per-domain limits."""
+    limiter = HostRateLimiter(
+        rate_per_second=SCRAPER_CONFIG["rate_per_second"] if rate_per_second is None else rate_per_second,
+        max_in_flight=SCRAPER_CONFIG["max_in_flight"] if max_in_flight is None else max_in_flight,
+        jitter_seconds=SCRAPER_CONFIG["jitter_seconds"],
+        host_limits=dict(host_limits or {}),
+    )
+    return RequestScheduler(
+        limiter,
+        max_retries=SCRAPER_CONFIG["max_retries"],
+        backoff_seconds=SCRAPER_CONFIG["backoff_seconds"],
+    )
@@ -0,0 +1,77 @@
+import logging
+from src.listing_ids import listing_id
+from src.sheets import TABS, SheetsClient
+from src.storage import Store, load_json, save_json
+
+logger = logging.getLogger(__name__)
+
+INDEX_KEY = "seen_index.json"
+# Version 1 stored raw links; version 2 stores canonical listing ids. A saved
+# index from another version is rebuilt, which re-derives ids from the links.
+INDEX_VERSION = 2
+FIRST_DATA_ROW = 2
+
+
+class SeenIndex:
+    """Persistent seen-link index, synced incrementally from the sheet tabs.
+
+    For each tab we remember a watermark: the grid row count and the link that
+    was at the top (row 2) at the last sync. New rows are always inserted at
+    row 2, so if the row count grew by N the old top link must now sit at row
+    2 + N, and only rows 2..N+1 need to be read. Anything else (rows deleted,
+    rows reordered, no saved state) triggers a full rebuild of that tab.
+    """
+
+    def __init__(self, store: Store):
+        self.store = store
+
+    def sync(self, sheets: SheetsClient) -> set[str]:
+        state = load_json(self.store, INDEX_KEY, {})
+        saved = state.get("tabs", {}) if state.get("version") == INDEX_VERSION else {}
+
+        tabs = {}
+        for tab_name in TABS:
+            rows = sheets.row_count(tab_name)
+            tab = self._pull_new(sheets, tab_name, rows, saved.get(tab_name))
+            if tab is None:
+                logger.info(f"Rebuilding seen index for {tab_name}")
+                tab = self._rebuild(sheets, tab_name, rows)
+            tabs[tab_name] = tab
+
+        save_json(self.store, INDEX_KEY, {"version": INDEX_VERSION, "tabs": tabs})
+
+        seen = set()
+        for tab in tabs.values():
+            seen.update(tab["keys"])
+        return seen
+
+    @staticmethod
+    def _pull_new(sheets: SheetsClient, tab_name: str, rows: int, saved: dict | None) -> dict | None:
+        if not saved:
+            return None
+        added = rows - saved["rows"]
+        if added < 0:
+            return None
+
+        # The new rows plus the cell the old anchor should have moved to.
+        values = sheets.get_link_range(tab_name, FIRST_DATA_ROW, FIRST_DATA_ROW + added)
+        if values[-1] != saved["anchor"]:
+            return None
+
+        new_keys = [listing_id(link) for link in values[:-1] if link]
+        if new_keys:
+            logger.info(f"Seen index: {len(new_keys)} new links in {tab_name}")
+        return {
+            "rows": rows,
+            "anchor": values[0],
+            "keys": saved["keys"] + new_keys,
+        }
+
+    @staticmethod
+    def _rebuild(sheets: SheetsClient, tab_name: str, rows: int) -> dict:
+        values = sheets.get_link_range(tab_name, FIRST_DATA_ROW, max(rows, FIRST_DATA_ROW))
+        return {
+            "rows": rows,
+            "anchor": values[0],
+            "keys": [listing_id(link) for link in values if link],
+        }
@@ -1,20 +1,72 @@
+from __future__ import annotations
+
+import logging
+import random
+import time
+from typing import TYPE_CHECKING
 import gspread
+from src.listing_ids import listing_id
+
+if TYPE_CHECKING:
+    from src.seen_index import SeenIndex
+
+logger = logging.getLogger(__name__)
 
 LINK_COL = 5  # Column E = Link
+LINK_COL_LETTER = "E"
+TABS = ("Approved", "Rejected")
+MAX_WRITE_RETRIES = 5
+RETRYABLE_STATUS = {429, 500, 503}  # quota exceeded / transient backend errors
 
 
 class SheetsClient:
+    """Reads seen links and buffers result rows, flushing one bulk insert per tab."""
+
     def __init__(self, credentials_dict: dict, sheet_id: str):
         gc = gspread.service_account_from_dict(credentials_dict)
         self.spreadsheet = gc.open_by_key(sheet_id)
+        self._worksheets: dict[str, gspread.Worksheet] = {}
+        self._pending: dict[str, list[list[str]]] = {"Approved": [], "Rejected": []}
+
+    def refresh(self) -> None:
+        """Forget cached worksheet metadata and unflushed rows before reusing this client."""
+        self._worksheets.clear()
+        for rows in self._pending.values():
+            rows.clear()
+
+    def _worksheet(self, name: str) -> gspread.Worksheet:
+        if name not in self._worksheets:
+            self._worksheets[name] = self.spreadsheet.worksheet(name)
+        return self._worksheets[name]
 
-    def get_seen_urls(self) -> set[str]:
-        urls = set()
-        for tab_name in ("Approved", "Rejected"):
-            ws = self.spreadsheet.worksheet(tab_name)
-            col = ws.col_values(LINK_COL)
-            urls.update(url for url in col[1:] if url)  # skip header
-        return urls
+    def get_seen_urls(self, index: SeenIndex | None = None) -> set[str]:
+        """Canonical ids (see src/listing_ids.py) of every listing already in the sheet."""
+        if index is not None:
+            return index.sync(self)
+        ids = set()
+        for tab_name in TABS:
+            ids.update(listing_id(link) for link in self.get_links(tab_name))
+        return ids
+
+    def get_links(self, tab_name: str) -> list[str]:
+        """Every non-empty link in a tab, top to bottom."""
+        col = self._worksheet(tab_name).col_values(LINK_COL)
+        return [url for url in col[1:] if url]  # skip header
+
+    def row_count(self, tab_name: str) -> int:
+        """Grid row count of a tab, from cached metadata (no extra API call).
+
+        Rows are only ever inserted, so this grows by exactly the number of
+        rows written since it was last read.
+        """
+        return self._worksheet(tab_name).row_count
+
+    def get_link_range(self, tab_name: str, first_row: int, last_row: int) -> list[str]:
+        """Link cells for rows first_row..last_row inclusive; blanks come back as ""."""
+        ws = self._worksheet(tab_name)
+        values = ws.get_values(f"{LINK_COL_LETTER}{first_row}:{LINK_COL_LETTER}{last_row}")
+        links = [row[0] if row else "" for row in values]
+        return links + [""] * (last_row - first_row + 1 - len(links))
 
     def append_approved(
         self,
@@ -28,13 +80,12 @@ class SheetsClient:
         suitability_score: str,
         ai_notes: str,
     ) -> None:
-        ws = self.spreadsheet.worksheet("Approved")
         row = [
             title, price, sqft, address, link, date_found,
             est_monthly_cost, suitability_score, ai_notes,
             "", "", "",  # Followed Up?, Who, Notes (human columns)
         ]
-        ws.insert_row(row, index=2)
+        self._pending["Approved"].append(row)
 
     def append_rejected(
         self,
@@ -48,10 +99,33 @@ class SheetsClient:
         suitability_score: str,
         rejection_reason: str,
     ) -> None:
-        ws = self.spreadsheet.worksheet("Rejected")
         row = [
             title, price, sqft, address, link, date_found,
             est_monthly_cost, suitability_score, rejection_reason,
             "", "",  # Reviewed By, Notes (human columns)
         ]
-        ws.insert_row(row, index=2)
+        self._pending["Rejected"].append(row)
+
+    def flush(self) -> None:
+        """Write all buffered rows, one insert per tab, newest row on top."""
+        for tab_name, rows in self._pending.items():
+            if not rows:
+                continue
+            ws = self._worksheet(tab_name)
+            # Rows were buffered oldest-first; the sheet lists newest first under the header.
+            self._with_backoff(ws.insert_rows, rows[::-1], row=2)
+            logger.info(f"Wrote {len(rows)} rows to {tab_name}")
+            rows.clear()
+
+    @staticmethod
+    def _with_backoff(fn, *args, **kwargs):
+        for attempt in range(MAX_WRITE_RETRIES + 1):
+            try:
+                return fn(*args, **kwargs)
+            except gspread.exceptions.APIError as e:
+                status = e.response.status_code
+                if attempt == MAX_WRITE_RETRIES or status not in RETRYABLE_STATUS:
+                    raise
+                delay = min(2**attempt, 32) + random.uniform(0, 1)
+                logger.warning(f"Sheets API returned {status}, retrying in {delay:.1f}s")
+                time.sleep(delay)
@@ -0,0 +1,76 @@
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Any, Protocol
+from src.config import STATE_CONFIG
+
+logger = logging.getLogger(__name__)
+
+
+class Store(Protocol):
+    """Minimal key/blob store for state that must outlive a single run."""
+
+    def get(self, key: str) -> bytes | None: ...
+
+    def put(self, key: str, data: bytes) -> None: ...
+
+
+class LocalFileStore:
+    def __init__(self, root: str):
+        self.root = Path(root)
+
+    def get(self, key: str) -> bytes | None:
+        path = self.root / key
+        if not path.exists():
+            return None
+        return path.read_bytes()
+
+    def put(self, key: str, data: bytes) -> None:
+        path = self.root / key
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Write-then-rename so a killed run never leaves a half-written file.
+        tmp = path.with_suffix(path.suffix + ".tmp")
+        tmp.write_bytes(data)
+        os.replace(tmp, path)
+
+
+class S3Store:
+    def __init__(self, bucket: str, prefix: str = "", client=None):
+        import boto3
+
+        self.bucket = bucket
+        self.prefix = prefix
+        self.client = client or boto3.client("s3")
+
+    def get(self, key: str) -> bytes | None:
+        try:
+            resp = self.client.get_object(Bucket=self.bucket, Key=self.prefix + key)
+        except self.client.exceptions.NoSuchKey:
+            return None
+        return resp["Body"].read()
+
+    def put(self, key: str, data: bytes) -> None:
+        self.client.put_object(Bucket=self.bucket, Key=self.prefix + key, Body=data)
+
+
+def get_store() -> Store:
+    """Build the store configured by STATE_BUCKET / STATE_DIR."""
+    if STATE_CONFIG["bucket"]:
+        return S3Store(STATE_CONFIG["bucket"], prefix=STATE_CONFIG["prefix"])
+    return LocalFileStore(STATE_CONFIG["dir"])
+
+
+def load_json(store: Store, key: str, default: Any = None) -> Any:
+    raw = store.get(key)
+    if raw is None:
+        return default
+    try:
+        return json.loads(raw)
+    except json.JSONDecodeError as e:
+        logger.warning(f"Discarding corrupt state {key}: {e}")
+        return default
+
+
+def save_json(store: Store, key: str, value: Any) -> None:
+    store.put(key, json.dumps(value).encode())
@@ -1,4 +1,5 @@
 import os
+import pytest
 
 os.environ.setdefault("CENTER_LAT", "37.7767")
 os.environ.setdefault("CENTER_LNG", "-122.4173")
@@ -7,3 +8,27 @@ os.environ.setdefault("MAX_PRICE", "2400")
 os.environ.setdefault("MIN_SQFT", "400")
 os.environ.setdefault("CRAIGSLIST_REGION", "sfbay")
 os.environ.setdefault("GOOGLE_SHEET_ID", "test-sheet-id")
+# Don't pace scraper tests like a live crawl
+os.environ.setdefault("CRAIGSLIST_DETAIL_RATE", "100")
+os.environ.setdefault("SCRAPER_RATE", "100")
+os.environ.setdefault("SCRAPER_JITTER_SECONDS", "0")
+os.environ.setdefault("SCRAPER_BACKOFF_SECONDS", "0.01")
+
+
+@pytest.fixture(autouse=True)
+def _isolated_state(tmp_path, monkeypatch):
+    """Give each test its own state directory so caches never leak between tests."""
+    from src.config import STATE_CONFIG
+
+    monkeypatch.setitem(STATE_CONFIG, "dir", str(tmp_path / "state"))
+    monkeypatch.setitem(STATE_CONFIG, "bucket", "")
+
+
+@pytest.fixture(autouse=True)
+def _reset_cached_clients():
+    """Secrets and clients are cached per process; start every test cold."""
+    from src import clients
+
+    clients.reset()
+    yield
+    clients.reset()
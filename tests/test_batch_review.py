@@ -0,0 +1,109 @@
+import json
+from types import SimpleNamespace
+from src.batch_review import BatchReviewer, LocalBatchBackend
+from src.models import Listing
+from src.reviewer import TokenUsage
+from src.storage import LocalFileStore
+
+
+def _make_listing(n: int) -> Listing:
+    return Listing(
+        title=f"Space {n}",
+        price="$1800",
+        sqft="600",
+        address="123 Folsom St",
+        link=f"https://example.com/{n}",
+        source="craigslist",
+        full_text="Ground floor workshop.",
+    )
+
+
+def _respond(params: dict) -> str | None:
+    content = params["messages"][0]["content"]
+    if "Space 2" in content:
+        return None  # simulate an errored request
+    return json.dumps(
+        {
+            "approved": "Space 0" in content,
+            "est_monthly_cost": "$1800",
+            "suitability_score": 6,
+            "reasoning": content.split("\n", 1)[0],
+        }
+    )
+
+
+def test_submit_records_pending_batch(tmp_path):
+    backend = LocalBatchBackend(_respond)
+    reviewer = BatchReviewer(backend, LocalFileStore(str(tmp_path)))
+
+    batch_id = reviewer.submit([_make_listing(0), _make_listing(1)])
+
+    requests = backend.batches[batch_id]["requests"]
+    assert [r["custom_id"] for r in requests] == ["listing-0", "listing-1"]
+    assert requests[0]["params"]["system"][0]["cache_control"] == {"type": "ephemeral"}
+    assert reviewer.pending_links() == {"https://example.com/0", "https://example.com/1"}
+
+
+def test_collect_waits_for_unfinished_batch(tmp_path):
+    store = LocalFileStore(str(tmp_path))
+    backend = LocalBatchBackend(_respond, polls_until_done=1)
+    BatchReviewer(backend, store).submit([_make_listing(0)])
+
+    assert BatchReviewer(backend, store).collect() == []
+    assert BatchReviewer(backend, store).pending_links() == {"https://example.com/0"}
+
+    reviewer = BatchReviewer(backend, store)
+    collected = reviewer.collect()
+    assert [(l.link, r.approved) for l, r in collected] == [("https://example.com/0", True)]
+    reviewer.finish_collected()
+    assert BatchReviewer(backend, store).pending_links() == set()
+
+
+def test_collected_batch_stays_pending_until_finished(tmp_path):
+    store = LocalFileStore(str(tmp_path))
+    backend = LocalBatchBackend(_respond)
+    BatchReviewer(backend, store).submit([_make_listing(0)])
+
+    # A run that dies before writing its results collects the batch again
+    assert len(BatchReviewer(backend, store).collect()) == 1
+    reviewer = BatchReviewer(backend, store)
+    assert len(reviewer.collect()) == 1
+
+    # Batches submitted after collecting survive finish_collected()
+    reviewer.submit([_make_listing(1)])
+    reviewer.finish_collected()
+    assert BatchReviewer(backend, store).pending_links() == {"https://example.com/1"}
+
+
+def test_collect_adds_batch_token_usage(tmp_path):
+    class UsageBackend(LocalBatchBackend):
+        def results(self, batch_id):
+            for entry in super().results(batch_id):
+                entry.usage = SimpleNamespace(input_tokens=100, output_tokens=20)
+                yield entry
+
+    store = LocalFileStore(str(tmp_path))
+    backend = UsageBackend(_respond)
+    reviewer = BatchReviewer(backend, store)
+    reviewer.submit([_make_listing(0), _make_listing(1)])
+
+    usage = TokenUsage()
+    reviewer.collect(usage=usage)
+
+    assert usage.as_dict()["requests"] == 2
+    assert usage.as_dict()["input_tokens"] == 200
+    assert usage.as_dict()["output_tokens"] == 40
+
+
+def test_collect_drops_errored_requests(tmp_path):
+    store = LocalFileStore(str(tmp_path))
+    backend = LocalBatchBackend(_respond)
+    reviewer = BatchReviewer(backend, store)
+    reviewer.submit([_make_listing(0), _make_listing(1), _make_listing(2)])
+
+    collected = reviewer.collect()
+
+    assert [l.title for l, _ in collected] == ["Space 0", "Space 1"]
+    assert collected[1][1].reasoning == "Title: Space 1"
+    reviewer.finish_collected()
+    assert reviewer.pending_links() == set()
@@ -0,0 +1,110 @@
+from src.checkpoint import Checkpoint
+from src.models import Listing, ReviewResult
+from src.storage import LocalFileStore
+
+
+def _make_listing(n: int) -> Listing:
+    return Listing(
+        title=f"Space {n}",
+        price="$1800",
+        sqft="600",
+        address="",
+        link=f"https://example.com/{n}",
+        source="craigslist",
+        lat=37.78,
+        lng=-122.40,
+    )
+
+
+RESULT = ReviewResult(
+    approved=True,
+    est_monthly_cost="$1800",
+    suitability_score=7,
+    reasoning="Good.",
+)
+
+
+def test_no_checkpoint_to_resume(tmp_path):
+    assert Checkpoint(LocalFileStore(str(tmp_path))).load() is False
+
+
+def test_resume_restores_candidates_and_finished_reviews(tmp_path):
+    store = LocalFileStore(str(tmp_path))
+    checkpoint = Checkpoint(store)
+    checkpoint.start([_make_listing(1), _make_listing(2)])
+    checkpoint.record(_make_listing(1), RESULT)
+    checkpoint.flush()
+
+    resumed = Checkpoint(store)
+    assert resumed.load() is True
+    assert resumed.candidates == [_make_listing(1), _make_listing(2)]
+    assert resumed.result_for(_make_listing(1)) == RESULT
+    assert resumed.result_for(_make_listing(2)) is None
+
+
+def test_finish_clears_or_narrows(tmp_path):
+    store = LocalFileStore(str(tmp_path))
+    checkpoint = Checkpoint(store)
+    checkpoint.start([_make_listing(1), _make_listing(2)])
+
+    checkpoint.finish(remaining=[_make_listing(2)])
+    resumed = Checkpoint(store)
+    assert resumed.load() is True
+    assert resumed.candidates == [_make_listing(2)]
+
+    resumed.finish()
+    assert Checkpoint(store).load() is False
+
+
+def test_stale_checkpoint_is_ignored(tmp_path):
+    now = [1_000_000.0]
+    store = LocalFileStore(str(tmp_path))
+    Checkpoint(store, clock=lambda: now[0]).start([_make_listing(1)])
+
+    now[0] += 49 * 3600
+    assert Checkpoint(store, max_age_hours=48, clock=lambda: now[0]).load() is False
+
+
+class CountingStore(LocalFileStore):
+    def __init__(self, path):
+        super().__init__(path)
+        self.puts = 0
+
+    def put(self, key, data):
+        self.puts += 1
+        super().put(key, data)
+
+
+def test_record_batches_writes(tmp_path):
+    store = CountingStore(str(tmp_path))
+    checkpoint = Checkpoint(store, save_every=3, save_interval=3600)
+    checkpoint.start([_make_listing(n) for n in range(5)])
+    store.puts = 0
+
+    for n in range(5):
+        checkpoint.record(_make_listing(n), RESULT)
+    assert store.puts == 1
+    resumed = Checkpoint(store)
+    resumed.load()
+    assert len(resumed.results) == 3
+
+    checkpoint.flush()
+    checkpoint.flush()  # nothing new to write
+    assert store.puts == 2
+    resumed.load()
+    assert len(resumed.results) == 5
+
+
+def test_record_saves_after_interval(tmp_path):
+    now = [0.0]
+    store = LocalFileStore(str(tmp_path))
+    checkpoint = Checkpoint(store, save_every=100, save_interval=30, clock=lambda: now[0])
+    checkpoint.start([_make_listing(1), _make_listing(2)])
+
+    checkpoint.record(_make_listing(1), RESULT)
+    now[0] = 31
+    checkpoint.record(_make_listing(2), RESULT)
+
+    resumed = Checkpoint(store, clock=lambda: now[0])
+    assert resumed.load() is True
+    assert len(resumed.results) == 2
@@ -0,0 +1,122 @@
+import json
+from unittest.mock import patch
+from src import clients
+from src.clients import SecretsCache, get_anthropic_client, get_sheets_client
+
+SECRET_STRINGS = {
+    "shop-seeker/google-creds": json.dumps({"type": "service_account"}),
+    "shop-seeker/anthropic-key": json.dumps({"api_key": "sk-test"}),
+    "shop-seeker/google-sheet-id": json.dumps({"sheet_id": "sheet-123"}),
+}
+
+
+class StubSecretsManager:
+    """Local stand-in for the Secrets Manager client."""
+
+    def __init__(self, batch_supported: bool = True):
+        self.batch_supported = batch_supported
+        self.calls: list[str] = []
+
+    def get_secret_value(self, SecretId):
+        self.calls.append("get_secret_value")
+        return {"Name": SecretId, "SecretString": SECRET_STRINGS[SecretId]}
+
+    def batch_get_secret_value(self, SecretIdList):
+        self.calls.append("batch_get_secret_value")
+        if not self.batch_supported:
+            raise RuntimeError("AccessDeniedException")
+        return {
+            "SecretValues": [
+                {"Name": i, "SecretString": SECRET_STRINGS[i]} for i in SecretIdList
+            ],
+            "Errors": [],
+        }
+
+
+EXPECTED = {
+    "google_creds": {"type": "service_account"},
+    "anthropic_key": "sk-test",
+    "sheet_id": "sheet-123",
+}
+
+
+def test_secrets_fetched_in_one_batched_call():
+    stub = StubSecretsManager()
+    cache = SecretsCache(client_factory=lambda: stub)
+
+    assert cache.get() == EXPECTED
+    assert stub.calls == ["batch_get_secret_value"]
+
+
+def test_secrets_fall_back_to_individual_fetches():
+    stub = StubSecretsManager(batch_supported=False)
+    cache = SecretsCache(client_factory=lambda: stub)
+
+    assert cache.get() == EXPECTED
+    assert stub.calls == ["batch_get_secret_value"] + ["get_secret_value"] * 3
+
+
+def test_secrets_cached_until_ttl_expires():
+    now = [0.0]
+    stub = StubSecretsManager()
+    cache = SecretsCache(client_factory=lambda: stub, ttl_seconds=60, clock=lambda: now[0])
+
+    cache.get()
+    now[0] += 30
+    cache.get()
+    assert len(stub.calls) == 1
+
+    now[0] += 31
+    cache.get()
+    assert len(stub.calls) == 2
+
+
+@patch("src.sheets.gspread.service_account_from_dict")
+def test_sheets_client_reused_and_refreshed(mock_auth):
+    first = get_sheets_client({"type": "service_account"}, "sheet-123")
+    first.append_rejected(
+        title="t", price="", sqft="", address="", link="https://example.com/1",
+        date_found="2026-02-15", est_monthly_cost="", suitability_score="0",
+        rejection_reason="",
+    )
+    second = get_sheets_client({"type": "service_account"}, "sheet-123")
+
+    assert second is first
+    mock_auth.assert_called_once()
+    assert second._pending["Rejected"] == []
+
+    other = get_sheets_client({"type": "service_account"}, "other-sheet")
+    assert other is not first
+
+
+@patch("anthropic.Anthropic")
+def test_anthropic_client_shared(mock_anthropic_cls):
+    assert get_anthropic_client("sk-test") is get_anthropic_client("sk-test")
+    mock_anthropic_cls.assert_called_once_with(api_key="sk-test", max_retries=0)
+    clients.reset()
+    get_anthropic_client("sk-test")
+    assert mock_anthropic_cls.call_count == 2
+
+
+def test_is_credential_error_recognises_rejected_keys():
+    from types import SimpleNamespace
+    import anthropic
+    import httpx
+    from google.auth.exceptions import RefreshError
+    from src.clients import is_credential_error
+
+    request = httpx.Request("POST", "https://api.anthropic.com/v1/messages")
+    auth = anthropic.AuthenticationError(
+        "bad key", response=httpx.Response(401, request=request), body=None
+    )
+    overloaded = anthropic.InternalServerError(
+        "overloaded", response=httpx.Response(529, request=request), body=None
+    )
+    sheets_denied = RuntimeError("denied")
+    sheets_denied.response = SimpleNamespace(status_code=403)
+
+    assert is_credential_error(auth)
+    assert is_credential_error(sheets_denied)
+    assert is_credential_error(RefreshError("invalid_grant"))
+    assert not is_credential_error(overloaded)
+    assert not is_credential_error(ValueError("boom"))
@@ -21,9 +21,10 @@ def test_scrape_returns_listings(MockSession, _mock_sleep):
     results_html = (FIXTURES / "commercialcafe_results.html").read_text()
     warmup_resp = _make_response("<html></html>")
     search_resp = _make_response(results_html)
+    last_page = _make_response("<html><body><ul class='listings'></ul></body></html>")
 
     mock_session = MagicMock()
-    mock_session.get.side_effect = [warmup_resp, search_resp]
+    mock_session.get.side_effect = [warmup_resp, search_resp, last_page]
     MockSession.return_value = mock_session
 
     scraper = CommercialCafeScraper()
@@ -82,3 +83,17 @@ def test_scrape_handles_network_error(MockSession, _mock_sleep):
     scraper = CommercialCafeScraper()
     listings = scraper.scrape()
     assert listings == []
+
+
+@patch("src.scrapers.commercialcafe.requests.Session")
+def test_scrape_stops_when_page_is_all_seen(MockSession):
+    results_html = (FIXTURES / "commercialcafe_results.html").read_text()
+    mock_session = MagicMock()
+    mock_session.get.side_effect = [_make_response("<html></html>"), _make_response(results_html)]
+    MockSession.return_value = mock_session
+
+    scraper = CommercialCafeScraper(is_seen=lambda key: True)
+    listings = scraper.scrape()
+
+    assert len(listings) == 2
+    assert mock_session.get.call_count == 2
@@ -1,6 +1,10 @@
+import json
 import pathlib
 import responses
+from src.listing_ids import listing_id
 from src.scrapers.craigslist import CraigslistScraper
+from src.scrapers.ratelimit import HostRateLimiter
+from src.scrapers.scheduler import RequestScheduler
 
 FIXTURES = pathlib.Path(__file__).parent / "fixtures"
 
@@ -84,3 +88,181 @@ def test_scrape_handles_empty_results():
     scraper = CraigslistScraper(region="sfbay")
     listings = scraper.scrape()
     assert listings == []
+
+
+@responses.activate
+def test_scrape_skips_detail_fetch_for_seen_listings():
+    results_html = (FIXTURES / "craigslist_results.html").read_text()
+    detail_html = (FIXTURES / "craigslist_detail.html").read_text()
+
+    responses.get(
+        "https://sfbay.craigslist.org/search/san-francisco-ca/off",
+        body=results_html,
+        status=200,
+    )
+    responses.get(
+        "https://sfbay.craigslist.org/sfc/off/d/office-suite/3333.html",
+        body=detail_html,
+        status=200,
+    )
+
+    seen = {
+        listing_id("https://sfbay.craigslist.org/sfc/off/d/warehouse-space/1111.html"),
+        listing_id("https://sfbay.craigslist.org/sfc/off/d/workshop-loft/2222.html"),
+    }
+    scraper = CraigslistScraper(region="sfbay", is_seen=seen.__contains__)
+    listings = scraper.scrape()
+
+    assert len(listings) == 3
+    assert len(responses.calls) == 2
+    fetched = [l for l in listings if l.full_text]
+    assert [l.link for l in fetched] == ["https://sfbay.craigslist.org/sfc/off/d/office-suite/3333.html"]
+
+
+@responses.activate
+def test_scrape_backs_off_when_host_rate_limits():
+    results_html = (FIXTURES / "craigslist_results.html").read_text()
+    detail_html = (FIXTURES / "craigslist_detail.html").read_text()
+
+    responses.get(
+        "https://sfbay.craigslist.org/search/san-francisco-ca/off",
+        body=results_html,
+        status=200,
+    )
+    responses.get(
+        "https://sfbay.craigslist.org/sfc/off/d/warehouse-space/1111.html",
+        status=429,
+    )
+    responses.get(
+        "https://sfbay.craigslist.org/sfc/off/d/workshop-loft/2222.html",
+        body=detail_html,
+        status=200,
+    )
+    responses.get(
+        "https://sfbay.craigslist.org/sfc/off/d/office-suite/3333.html",
+        body=detail_html,
+        status=200,
+    )
+
+    limiter = HostRateLimiter(rate_per_second=100, max_in_flight=1)
+    scheduler = RequestScheduler(limiter, max_retries=1, backoff_seconds=0.01)
+    scraper = CraigslistScraper(region="sfbay", scheduler=scheduler)
+    listings = scraper.scrape()
+
+    assert len(listings) == 3
+    assert sum(1 for l in listings if l.full_text) == 2
+    # The 429 was retried once before giving up
+    assert len(responses.calls) == 5
+    assert limiter.current_rate("sfbay.craigslist.org") < 100
+
+
+SEARCH_API_URL = "https://sapi.craigslist.org/web/v8/postings/search/full"
+
+
+@responses.activate
+def test_json_search_returns_listings_with_coordinates():
+    responses.get(SEARCH_API_URL, body=(FIXTURES / "craigslist_search.json").read_text(), status=200)
+
+    seen = {
+        listing_id("https://sfbay.craigslist.org/sfc/off/d/warehouse-space/1111.html"),
+        listing_id("https://sfbay.craigslist.org/sfc/off/d/workshop-loft/2222.html"),
+        listing_id("https://sfbay.craigslist.org/sfc/off/d/office-suite/3333.html"),
+        listing_id("https://sfbay.craigslist.org/eby/off/d/oakland-shop/4444.html"),
+    }
+    scraper = CraigslistScraper(region="sfbay", max_price=2400, search_mode="json", is_seen=seen.__contains__)
+    listings = scraper.scrape()
+
+    assert [l.link for l in listings] == [
+        "https://sfbay.craigslist.org/sfc/off/d/warehouse-space/1111.html",
+        "https://sfbay.craigslist.org/sfc/off/d/workshop-loft/2222.html",
+        "https://sfbay.craigslist.org/sfc/off/d/office-suite/3333.html",
+        "https://sfbay.craigslist.org/eby/off/d/oakland-shop/4444.html",
+    ]
+    assert (listings[0].lat, listings[0].lng) == (37.7785, -122.395)
+    assert listings[0].price == "$1,800"
+    assert listings[0].title == "Warehouse Space 600sqft Ground Floor"
+    # Everything was seen, so the one search request is all that was sent
+    assert len(responses.calls) == 1
+    assert "max_price=2400" in responses.calls[0].request.url
+
+
+@responses.activate
+def test_json_search_matches_html_search():
+    responses.get(SEARCH_API_URL, body=(FIXTURES / "craigslist_search.json").read_text(), status=200)
+    responses.get(
+        "https://sfbay.craigslist.org/search/san-francisco-ca/off",
+        body=(FIXTURES / "craigslist_results.html").read_text(),
+        status=200,
+    )
+
+    def summary(mode):
+        scraper = CraigslistScraper(region="sfbay", search_mode=mode, is_seen=lambda key: True)
+        return [(l.title, l.price, l.link) for l in scraper.scrape()]
+
+    assert summary("json")[:3] == summary("html")
+
+
+@responses.activate
+def test_json_search_defers_detail_fetch_and_skips_outside_area():
+    detail_html = (FIXTURES / "craigslist_detail.html").read_text()
+    responses.get(SEARCH_API_URL, body=(FIXTURES / "craigslist_search.json").read_text(), status=200)
+    responses.get("https://sfbay.craigslist.org/sfc/off/d/warehouse-space/1111.html", body=detail_html, status=200)
+
+    seen = {
+        listing_id("https://sfbay.craigslist.org/sfc/off/d/workshop-loft/2222.html"),
+        listing_id("https://sfbay.craigslist.org/sfc/off/d/office-suite/3333.html"),
+    }
+    scraper = CraigslistScraper(
+        region="sfbay",
+        search_mode="json",
+        is_seen=seen.__contains__,
+        in_area=lambda lat, lng: lng < -122.3,
+    )
+    listings = scraper.scrape()
+
+    assert len(listings) == 4
+    # Detail pages wait until a listing reaches review
+    assert len(responses.calls) == 1
+    for listing in listings:
+        listing.load_text()
+
+    # Only the unseen in-area listing got a detail fetch; Oakland did not
+    assert [c.request.url for c in responses.calls[1:]] == [
+        "https://sfbay.craigslist.org/sfc/off/d/warehouse-space/1111.html"
+    ]
+    assert listings[0].full_text
+
+
+@responses.activate
+def test_json_search_falls_back_to_html():
+    responses.get(SEARCH_API_URL, json={"error": "unexpected"}, status=200)
+    responses.get(
+        "https://sfbay.craigslist.org/search/san-francisco-ca/off",
+        body=(FIXTURES / "craigslist_results.html").read_text(),
+        status=200,
+    )
+
+    scraper = CraigslistScraper(region="sfbay", search_mode="json", is_seen=lambda key: True)
+    listings = scraper.scrape()
+
+    assert len(listings) == 3
+    assert all(l.lat is None for l in listings)
+
+
+@responses.activate
+def test_json_search_skips_malformed_item():
+    payload = json.loads((FIXTURES / "craigslist_search.json").read_text())
+    payload["data"]["items"][1][4] = None
+    responses.get(SEARCH_API_URL, json=payload, status=200)
+
+    scraper = CraigslistScraper(region="sfbay", search_mode="json", is_seen=lambda key: True)
+    listings = scraper.scrape()
+
+    # The bad result is dropped on its own; the rest of the page survives
+    assert [l.link for l in listings] == [
+        "https://sfbay.craigslist.org/sfc/off/d/warehouse-space/1111.html",
+        "https://sfbay.craigslist.org/sfc/off/d/office-suite/3333.html",
+        "https://sfbay.craigslist.org/eby/off/d/oakland-shop/4444.html",
+    ]
+    # No fallback to the HTML search
+    assert len(responses.calls) == 1
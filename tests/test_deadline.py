@@ -0,0 +1,20 @@
+from unittest.mock import MagicMock
+from src.deadline import Deadline
+
+
+def test_deadline_without_context_never_expires():
+    deadline = Deadline(None)
+    assert deadline.can_start(10_000)
+
+
+def test_deadline_uses_lambda_remaining_time():
+    now = [100.0]
+    context = MagicMock()
+    context.get_remaining_time_in_millis.return_value = 60_000
+
+    deadline = Deadline(context, reserve_seconds=20, clock=lambda: now[0])
+
+    assert deadline.remaining() == 40
+    assert deadline.can_start(30)
+    now[0] += 15
+    assert not deadline.can_start(30)
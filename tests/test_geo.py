@@ -1,4 +1,7 @@
-from src.geo import is_within_radius, bounding_box
+import os
+import time
+import pytest
+from src.geo import SearchRegion, bounding_box, haversine_miles, is_within_radius
 
 
 def test_bounding_box_returns_four_floats():
@@ -29,3 +32,98 @@ def test_is_within_radius_outside():
 def test_is_within_radius_edge():
     # Bayview: ~3.5 miles, should be inside
     assert is_within_radius(37.7340, -122.3910, 37.7767, -122.4173, 4) is True
+
+
+def test_haversine_known_distance():
+    # 1390 Market to the Ferry Building is about 1.8 miles
+    d = haversine_miles(37.7767, -122.4173, 37.7955, -122.3937)
+    assert 1.7 < d < 1.9
+
+
+def test_is_within_radius_excludes_box_corner():
+    # Inside the 4-mile bounding box but ~5 miles away along the diagonal
+    south, north, west, east = bounding_box(37.7767, -122.4173, 4)
+    corner_lat, corner_lng = north - 0.005, east - 0.005
+    assert is_within_radius(corner_lat, corner_lng, 37.7767, -122.4173, 4) is False
+
+
+# Rough box around the Mission, as (lat, lng) vertices
+MISSION = [(37.7700, -122.4270), (37.7700, -122.4050), (37.7480, -122.4050), (37.7480, -122.4270)]
+SOMA = (37.7785, -122.3950)
+MISSION_POINT = (37.7599, -122.4148)
+
+
+def test_region_filter_reports_distances():
+    region = SearchRegion(37.7767, -122.4173, 4)
+    mask, distances = region.filter([SOMA[0], 37.7535], [SOMA[1], -122.5050])
+    assert mask.tolist() == [True, False]
+    assert abs(distances[0] - haversine_miles(*SOMA, 37.7767, -122.4173)) < 1e-9
+    assert distances[1] > 4
+
+
+def test_region_exclude_zone():
+    region = SearchRegion(37.7767, -122.4173, 4, exclude=[MISSION])
+    assert region.contains(*MISSION_POINT) is False
+    assert region.contains(*SOMA) is True
+
+
+def test_region_include_zone():
+    region = SearchRegion(37.7767, -122.4173, 4, include=[MISSION])
+    assert region.contains(*MISSION_POINT) is True
+    assert region.contains(*SOMA) is False
+
+
+def test_region_include_zone_still_needs_radius():
+    # A zone reaching past the circle doesn't widen it
+    wide = [(38.5, -123.5), (38.5, -121.5), (37.0, -121.5), (37.0, -123.5)]
+    region = SearchRegion(37.7767, -122.4173, 4, include=[wide])
+    assert region.contains(37.7535, -122.5050) is False
+
+
+def test_region_widens_radius_and_skips_zones_for_approximate_points():
+    region = SearchRegion(37.7767, -122.4173, 4, exclude=[MISSION])
+    # ~4.4 miles out, and inside an excluded zone
+    far, mission = (37.7441, -122.4863), MISSION_POINT
+
+    mask, _ = region.filter([far[0], mission[0]], [far[1], mission[1]], [1.3, 1.3])
+    assert mask.tolist() == [True, True]
+    mask, _ = region.filter([far[0], mission[0]], [far[1], mission[1]])
+    assert mask.tolist() == [False, False]
+    assert region.contains(*far, error=1.3) is True
+    assert region.contains(*far, error=0.2) is False
+
+
+def _random_points(n):
+    import numpy as np
+
+    rng = np.random.default_rng(0)
+    return rng.uniform(37.65, 37.90, n), rng.uniform(-122.55, -122.30, n)
+
+
+def test_region_filter_matches_scalar_check():
+    lats, lngs = _random_points(2_000)
+    region = SearchRegion(37.7767, -122.4173, 4, include=[MISSION[:3] + [(37.70, -122.50)]], exclude=[MISSION])
+    mask, distances = region.filter(lats, lngs)
+
+    assert mask.tolist() == [region.contains(lat, lng) for lat, lng in zip(lats, lngs)]
+    assert abs(distances[0] - haversine_miles(lats[0], lngs[0], 37.7767, -122.4173)) < 1e-9
+
+
+@pytest.mark.skipif(not os.environ.get("BENCHMARK"), reason="set BENCHMARK=1 to run benchmarks")
+def test_benchmark_region_filter_20k_points():
+    lats, lngs = _random_points(20_000)
+    region = SearchRegion(37.7767, -122.4173, 4, include=[MISSION], exclude=[MISSION[:3]])
+    region.filter(lats[:10], lngs[:10])  # warm up the numpy import
+
+    start = time.perf_counter()
+    for _ in range(10):
+        _, distances = region.filter(lats, lngs)
+    vectorized = (time.perf_counter() - start) / 10
+
+    start = time.perf_counter()
+    for lat, lng in zip(lats, lngs):
+        region.contains(lat, lng)
+    scalar = time.perf_counter() - start
+
+    assert distances.shape == (20_000,)
+    assert vectorized < scalar, f"batch {vectorized * 1000:.1f}ms vs per-point {scalar * 1000:.1f}ms"
@@ -0,0 +1,87 @@
+import pytest
+from src.geocode import Geocoder, chain, make_resolver, zip_centroid
+from src.models import Listing
+from src.storage import LocalFileStore
+
+
+def _make_listing(**kwargs) -> Listing:
+    defaults = {
+        "title": "Flex Space",
+        "price": "$2,000/mo",
+        "sqft": "800",
+        "address": "1 Main St, San Francisco, CA 94105",
+        "link": "https://www.loopnet.com/Listing/1-Main-St-San-Francisco-CA/111/",
+        "source": "loopnet",
+    }
+    defaults.update(kwargs)
+    return Listing(**defaults)
+
+
+def test_zip_centroid_finds_sf_zip():
+    lat, lng, error = zip_centroid("2130 Harrison St, San Francisco, CA 94110")
+    assert 37.74 < lat < 37.76
+    assert -122.43 < lng < -122.40
+    assert 0 < error < 3
+
+
+def test_zip_centroid_handles_zip_plus_four_and_unknown_zips():
+    assert zip_centroid("1 Main St, San Francisco, CA 94105-1234") is not None
+    assert zip_centroid("1 Broadway, Oakland, CA 94607") is not None
+    assert zip_centroid("1 Capitol Mall, Sacramento, CA 95814") is None
+    assert zip_centroid("123 Folsom St") is None
+
+
+def test_make_resolver_chains_in_order():
+    resolve = make_resolver("zip")
+    assert resolve("San Francisco, CA 94103") == zip_centroid("94103")
+    assert chain(lambda a: None, lambda a: (1.0, 2.0, 0.0))("anything") == (1.0, 2.0, 0.0)
+    with pytest.raises(ValueError):
+        make_resolver("zip, nominatim")
+
+
+def test_locate_sets_coordinates_only_where_missing(tmp_path):
+    geocoder = Geocoder(LocalFileStore(tmp_path), zip_centroid)
+    address_only = _make_listing()
+    already = _make_listing(lat=37.0, lng=-122.0)
+    no_address = _make_listing(address="")
+
+    assert geocoder.locate([address_only, already, no_address]) == 1
+    assert (address_only.lat, address_only.lng, address_only.location_error_miles) == zip_centroid("94105")
+    assert (already.lat, already.lng) == (37.0, -122.0)
+    assert already.location_error_miles == 0
+    assert no_address.lat is None
+
+
+def test_cache_makes_repeat_runs_free(tmp_path):
+    calls = []
+
+    def resolver(address):
+        calls.append(address)
+        return zip_centroid(address)
+
+    store = LocalFileStore(tmp_path)
+    first = Geocoder(store, resolver)
+    first.locate([_make_listing(), _make_listing(address="Somewhere, CA")])
+    first.save()
+
+    second = Geocoder(store, resolver)
+    again = _make_listing(address="1  Main St, SAN FRANCISCO, CA 94105")
+    second.locate([again, _make_listing(address="Somewhere, CA")])
+
+    # Hits and misses both came from the cache
+    assert len(calls) == 2
+    assert again.lat is not None
+
+
+def test_expired_entries_are_resolved_again(tmp_path):
+    now = [0.0]
+    calls = []
+    store = LocalFileStore(tmp_path)
+    geocoder = Geocoder(store, lambda a: calls.append(a), ttl_days=1, clock=lambda: now[0])
+    geocoder.lookup("Somewhere, CA")
+    geocoder.save()
+
+    now[0] = 2 * 86400
+    geocoder = Geocoder(store, lambda a: calls.append(a), ttl_days=1, clock=lambda: now[0])
+    geocoder.lookup("Somewhere, CA")
+    assert len(calls) == 2
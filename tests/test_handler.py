@@ -1,4 +1,6 @@
+import json
 from unittest.mock import MagicMock, patch
+from src.config import SEARCH_CONFIG
 from src.models import Listing
 
 
@@ -19,15 +21,15 @@ def _make_listing(**kwargs) -> Listing:
 
 
 @patch("src.handler.get_secrets")
-@patch("src.handler.SheetsClient")
-@patch("src.handler.CommercialCafeScraper")
-@patch("src.handler.LoopNetScraper")
-@patch("src.handler.CraigslistScraper")
-@patch("src.handler.review_listing")
+@patch("src.sheets.SheetsClient")
+@patch("src.scrapers.commercialcafe.CommercialCafeScraper")
+@patch("src.scrapers.loopnet.LoopNetScraper")
+@patch("src.scrapers.craigslist.CraigslistScraper")
+@patch("src.reviewer.review_listing")
 def test_handler_skips_seen_urls(mock_review, mock_cl, mock_ln, mock_cc, mock_sheets_cls, mock_secrets):
     from src.handler import lambda_handler
 
-    mock_secrets.return_value = {"google_creds": {}, "anthropic_key": "k"}
+    mock_secrets.return_value = {"google_creds": {}, "anthropic_key": "k", "sheet_id": "s"}
 
     mock_sheets = MagicMock()
     mock_sheets.get_seen_urls.return_value = {"https://example.com/1"}
@@ -45,18 +47,18 @@ def test_handler_skips_seen_urls(mock_review, mock_cl, mock_ln, mock_cc, mock_sh
 
 
 @patch("src.handler.get_secrets")
-@patch("src.handler.SheetsClient")
-@patch("src.handler.CommercialCafeScraper")
-@patch("src.handler.LoopNetScraper")
-@patch("src.handler.CraigslistScraper")
-@patch("src.handler.review_listing")
+@patch("src.sheets.SheetsClient")
+@patch("src.scrapers.commercialcafe.CommercialCafeScraper")
+@patch("src.scrapers.loopnet.LoopNetScraper")
+@patch("src.scrapers.craigslist.CraigslistScraper")
+@patch("src.reviewer.review_listing")
 def test_handler_sends_approved_to_sheet(
     mock_review, mock_cl, mock_ln, mock_cc, mock_sheets_cls, mock_secrets
 ):
     from src.handler import lambda_handler
     from src.reviewer import ReviewResult
 
-    mock_secrets.return_value = {"google_creds": {}, "anthropic_key": "k"}
+    mock_secrets.return_value = {"google_creds": {}, "anthropic_key": "k", "sheet_id": "s"}
 
     mock_sheets = MagicMock()
     mock_sheets.get_seen_urls.return_value = set()
@@ -77,21 +79,22 @@ def test_handler_sends_approved_to_sheet(
 
     mock_sheets.append_approved.assert_called_once()
     mock_sheets.append_rejected.assert_not_called()
+    mock_sheets.flush.assert_called_once()
 
 
 @patch("src.handler.get_secrets")
-@patch("src.handler.SheetsClient")
-@patch("src.handler.CommercialCafeScraper")
-@patch("src.handler.LoopNetScraper")
-@patch("src.handler.CraigslistScraper")
-@patch("src.handler.review_listing")
+@patch("src.sheets.SheetsClient")
+@patch("src.scrapers.commercialcafe.CommercialCafeScraper")
+@patch("src.scrapers.loopnet.LoopNetScraper")
+@patch("src.scrapers.craigslist.CraigslistScraper")
+@patch("src.reviewer.review_listing")
 def test_handler_sends_rejected_to_sheet(
     mock_review, mock_cl, mock_ln, mock_cc, mock_sheets_cls, mock_secrets
 ):
     from src.handler import lambda_handler
     from src.reviewer import ReviewResult
 
-    mock_secrets.return_value = {"google_creds": {}, "anthropic_key": "k"}
+    mock_secrets.return_value = {"google_creds": {}, "anthropic_key": "k", "sheet_id": "s"}
 
     mock_sheets = MagicMock()
     mock_sheets.get_seen_urls.return_value = set()
@@ -115,17 +118,17 @@ def test_handler_sends_rejected_to_sheet(
 
 
 @patch("src.handler.get_secrets")
-@patch("src.handler.SheetsClient")
-@patch("src.handler.CommercialCafeScraper")
-@patch("src.handler.LoopNetScraper")
-@patch("src.handler.CraigslistScraper")
-@patch("src.handler.review_listing")
+@patch("src.sheets.SheetsClient")
+@patch("src.scrapers.commercialcafe.CommercialCafeScraper")
+@patch("src.scrapers.loopnet.LoopNetScraper")
+@patch("src.scrapers.craigslist.CraigslistScraper")
+@patch("src.reviewer.review_listing")
 def test_handler_filters_out_of_radius(
     mock_review, mock_cl, mock_ln, mock_cc, mock_sheets_cls, mock_secrets
 ):
     from src.handler import lambda_handler
 
-    mock_secrets.return_value = {"google_creds": {}, "anthropic_key": "k"}
+    mock_secrets.return_value = {"google_creds": {}, "anthropic_key": "k", "sheet_id": "s"}
 
     mock_sheets = MagicMock()
     mock_sheets.get_seen_urls.return_value = set()
@@ -144,18 +147,18 @@ def test_handler_filters_out_of_radius(
 
 
 @patch("src.handler.get_secrets")
-@patch("src.handler.SheetsClient")
-@patch("src.handler.CommercialCafeScraper")
-@patch("src.handler.LoopNetScraper")
-@patch("src.handler.CraigslistScraper")
-@patch("src.handler.review_listing")
+@patch("src.sheets.SheetsClient")
+@patch("src.scrapers.commercialcafe.CommercialCafeScraper")
+@patch("src.scrapers.loopnet.LoopNetScraper")
+@patch("src.scrapers.craigslist.CraigslistScraper")
+@patch("src.reviewer.review_listing")
 def test_handler_passes_no_coords_to_claude(
     mock_review, mock_cl, mock_ln, mock_cc, mock_sheets_cls, mock_secrets
 ):
     from src.handler import lambda_handler
     from src.reviewer import ReviewResult
 
-    mock_secrets.return_value = {"google_creds": {}, "anthropic_key": "k"}
+    mock_secrets.return_value = {"google_creds": {}, "anthropic_key": "k", "sheet_id": "s"}
 
     mock_sheets = MagicMock()
     mock_sheets.get_seen_urls.return_value = set()
@@ -177,3 +180,513 @@ def test_handler_passes_no_coords_to_claude(
     lambda_handler({}, None)
 
     mock_review.assert_called_once()
+
+
+@patch("src.handler.get_secrets")
+@patch("src.sheets.SheetsClient")
+@patch("src.scrapers.commercialcafe.CommercialCafeScraper")
+@patch("src.scrapers.loopnet.LoopNetScraper")
+@patch("src.scrapers.craigslist.CraigslistScraper")
+@patch("src.reviewer.review_listing")
+def test_handler_reuses_cached_review_for_repost(
+    mock_review, mock_cl, mock_ln, mock_cc, mock_sheets_cls, mock_secrets
+):
+    from src.handler import lambda_handler
+    from src.reviewer import ReviewResult
+
+    mock_secrets.return_value = {"google_creds": {}, "anthropic_key": "k", "sheet_id": "s"}
+
+    mock_sheets = MagicMock()
+    mock_sheets.get_seen_urls.return_value = set()
+    mock_sheets_cls.return_value = mock_sheets
+
+    mock_ln.return_value.scrape.return_value = []
+    mock_cc.return_value.scrape.return_value = []
+    mock_review.return_value = ReviewResult(
+        approved=True,
+        est_monthly_cost="$1800",
+        suitability_score=8,
+        reasoning="Great space.",
+    )
+
+    mock_cl.return_value.scrape.return_value = [_make_listing()]
+    lambda_handler({}, None)
+
+    # Same ad reposted under a new URL
+    mock_cl.return_value.scrape.return_value = [_make_listing(link="https://example.com/2")]
+    response = lambda_handler({}, None)
+
+    mock_review.assert_called_once()
+    assert mock_sheets.append_approved.call_count == 2
+    assert json.loads(response["body"])["cached"] == 1
+
+
+@patch("src.handler.get_secrets")
+@patch("src.sheets.SheetsClient")
+@patch("src.scrapers.commercialcafe.CommercialCafeScraper")
+@patch("src.scrapers.loopnet.LoopNetScraper")
+@patch("src.scrapers.craigslist.CraigslistScraper")
+@patch("src.reviewer.review_listing")
+def test_handler_prefilter_rejects_without_claude(
+    mock_review, mock_cl, mock_ln, mock_cc, mock_sheets_cls, mock_secrets
+):
+    from src.handler import lambda_handler
+
+    mock_secrets.return_value = {"google_creds": {}, "anthropic_key": "k", "sheet_id": "s"}
+
+    mock_sheets = MagicMock()
+    mock_sheets.get_seen_urls.return_value = set()
+    mock_sheets_cls.return_value = mock_sheets
+
+    mock_cl.return_value.scrape.return_value = [_make_listing(price="$25,000")]
+    mock_ln.return_value.scrape.return_value = []
+    mock_cc.return_value.scrape.return_value = []
+
+    response = lambda_handler({}, None)
+
+    mock_review.assert_not_called()
+    mock_sheets.append_rejected.assert_called_once()
+    body = json.loads(response["body"])
+    assert body["prefiltered"] == 1
+    assert body["usage"]["requests"] == 0
+
+
+@patch("src.batch_review.AnthropicBatchBackend")
+@patch("src.handler.get_secrets")
+@patch("src.sheets.SheetsClient")
+@patch("src.scrapers.commercialcafe.CommercialCafeScraper")
+@patch("src.scrapers.loopnet.LoopNetScraper")
+@patch("src.scrapers.craigslist.CraigslistScraper")
+@patch("src.reviewer.review_listing")
+def test_handler_async_review_submits_then_collects(
+    mock_review, mock_cl, mock_ln, mock_cc, mock_sheets_cls, mock_secrets, mock_backend_cls
+):
+    from src.batch_review import LocalBatchBackend
+    from src.handler import lambda_handler
+
+    mock_secrets.return_value = {"google_creds": {}, "anthropic_key": "k", "sheet_id": "s"}
+
+    mock_sheets = MagicMock()
+    mock_sheets.get_seen_urls.return_value = set()
+    mock_sheets_cls.return_value = mock_sheets
+
+    mock_cl.return_value.scrape.return_value = [_make_listing()]
+    mock_ln.return_value.scrape.return_value = []
+    mock_cc.return_value.scrape.return_value = []
+
+    backend = LocalBatchBackend(
+        lambda params: json.dumps(
+            {"approved": True, "est_monthly_cost": "$1800", "suitability_score": 8, "reasoning": "ok"}
+        )
+    )
+    mock_backend_cls.return_value = backend
+
+    first = json.loads(lambda_handler({"async_review": True}, None)["body"])
+    assert first["batch_submitted"] == 1
+    mock_sheets.append_approved.assert_not_called()
+
+    # The listing is still on the site, but it's pending in the batch
+    second = json.loads(lambda_handler({}, None)["body"])
+    assert second["batch_collected"] == 1
+    assert second["candidates"] == 0
+    mock_sheets.append_approved.assert_called_once()
+    mock_review.assert_not_called()
+
+
+@patch("src.handler.get_secrets")
+@patch("src.sheets.SheetsClient")
+@patch("src.scrapers.commercialcafe.CommercialCafeScraper")
+@patch("src.scrapers.loopnet.LoopNetScraper")
+@patch("src.scrapers.craigslist.CraigslistScraper")
+@patch("src.reviewer.review_listing")
+def test_handler_defers_reviews_when_out_of_time(
+    mock_review, mock_cl, mock_ln, mock_cc, mock_sheets_cls, mock_secrets
+):
+    from src.handler import lambda_handler
+
+    mock_secrets.return_value = {"google_creds": {}, "anthropic_key": "k", "sheet_id": "s"}
+
+    mock_sheets = MagicMock()
+    mock_sheets.get_seen_urls.return_value = set()
+    mock_sheets_cls.return_value = mock_sheets
+
+    mock_cl.return_value.scrape.return_value = [_make_listing()]
+    mock_ln.return_value.scrape.return_value = []
+    mock_cc.return_value.scrape.return_value = []
+
+    # Only the wrap-up reserve is left
+    context = MagicMock()
+    context.get_remaining_time_in_millis.return_value = 30_000
+
+    body = json.loads(lambda_handler({}, context)["body"])
+
+    mock_review.assert_not_called()
+    assert body["partial"] is True
+    assert body["deferred"] == ["https://example.com/1"]
+    mock_sheets.flush.assert_called_once()
+
+
+@patch("src.handler.get_secrets")
+@patch("src.sheets.SheetsClient")
+@patch("src.scrapers.commercialcafe.CommercialCafeScraper")
+@patch("src.scrapers.loopnet.LoopNetScraper")
+@patch("src.scrapers.craigslist.CraigslistScraper")
+@patch("src.reviewer.review_listing")
+def test_handler_resumes_from_checkpoint_after_api_error(
+    mock_review, mock_cl, mock_ln, mock_cc, mock_sheets_cls, mock_secrets
+):
+    import anthropic
+    import httpx
+    import pytest
+    from src.handler import lambda_handler
+    from src.reviewer import ReviewResult
+
+    mock_secrets.return_value = {"google_creds": {}, "anthropic_key": "k", "sheet_id": "s"}
+
+    mock_sheets = MagicMock()
+    mock_sheets.get_seen_urls.return_value = set()
+    mock_sheets_cls.return_value = mock_sheets
+
+    mock_cl.return_value.scrape.return_value = [
+        _make_listing(link="https://example.com/1", title="Space 1"),
+        _make_listing(link="https://example.com/2", title="Space 2"),
+    ]
+    mock_ln.return_value.scrape.return_value = []
+    mock_cc.return_value.scrape.return_value = []
+
+    failures = {"https://example.com/2": 1}
+
+    def review(listing, **kwargs):
+        if failures.get(listing.link):
+            failures[listing.link] -= 1
+            request = httpx.Request("POST", "https://api.anthropic.com/v1/messages")
+            raise anthropic.APIError("boom", request=request, body=None)
+        return ReviewResult(
+            approved=True, est_monthly_cost="$1800", suitability_score=7, reasoning="ok"
+        )
+
+    mock_review.side_effect = review
+
+    with pytest.raises(anthropic.APIError):
+        lambda_handler({}, None)
+    mock_sheets.flush.assert_not_called()
+
+    body = json.loads(lambda_handler({}, None)["body"])
+
+    assert body["resumed"] is True
+    assert mock_cl.return_value.scrape.call_count == 1
+    reviewed_links = [c.args[0].link for c in mock_review.call_args_list]
+    assert reviewed_links.count("https://example.com/1") == 1
+    assert mock_sheets.append_approved.call_count == 2
+
+
+@patch("src.handler.get_secrets")
+@patch("src.sheets.SheetsClient")
+@patch("src.scrapers.commercialcafe.CommercialCafeScraper")
+@patch("src.scrapers.loopnet.LoopNetScraper")
+@patch("src.scrapers.craigslist.CraigslistScraper")
+@patch("src.reviewer.review_listing")
+def test_handler_reviews_cross_source_duplicates_once(
+    mock_review, mock_cl, mock_ln, mock_cc, mock_sheets_cls, mock_secrets
+):
+    from src.handler import lambda_handler
+    from src.reviewer import ReviewResult
+
+    mock_secrets.return_value = {"google_creds": {}, "anthropic_key": "k", "sheet_id": "s"}
+
+    mock_sheets = MagicMock()
+    mock_sheets.get_seen_urls.return_value = set()
+    mock_sheets_cls.return_value = mock_sheets
+
+    mock_cl.return_value.scrape.return_value = []
+    mock_ln.return_value.scrape.return_value = [
+        _make_listing(source="loopnet", link="https://loopnet/1", address="123 Folsom Street, San Francisco, CA")
+    ]
+    mock_cc.return_value.scrape.return_value = [
+        _make_listing(source="commercialcafe", link="https://cc/1", address="123 Folsom St, Ste 4")
+    ]
+    mock_review.return_value = ReviewResult(
+        approved=True, est_monthly_cost="$1800", suitability_score=8, reasoning="Great space."
+    )
+
+    body = json.loads(lambda_handler({}, None)["body"])
+
+    mock_review.assert_called_once()
+    assert mock_sheets.append_approved.call_count == 1
+    assert body["duplicates"] == 1
+
+    # Next run: the merged copy counts as seen before any scraping
+    mock_sheets.get_seen_urls.return_value = {"https://loopnet/1"}
+    lambda_handler({}, None)
+    is_seen = mock_cc.call_args.kwargs["is_seen"]
+    assert is_seen("https://cc/1")
+
+
+@patch("src.handler.get_secrets")
+@patch("src.sheets.SheetsClient")
+@patch("src.scrapers.commercialcafe.CommercialCafeScraper")
+@patch("src.scrapers.loopnet.LoopNetScraper")
+@patch("src.scrapers.craigslist.CraigslistScraper")
+@patch("src.reviewer.review_listing")
+def test_handler_shares_one_scheduler_across_scrapers(
+    mock_review, mock_cl, mock_ln, mock_cc, mock_sheets_cls, mock_secrets
+):
+    from src.handler import lambda_handler
+
+    mock_secrets.return_value = {"google_creds": {}, "anthropic_key": "k", "sheet_id": "s"}
+    mock_sheets_cls.return_value.get_seen_urls.return_value = set()
+    for scraper in (mock_cl, mock_ln, mock_cc):
+        scraper.return_value.scrape.return_value = []
+
+    lambda_handler({}, None)
+
+    schedulers = {id(m.call_args.kwargs["scheduler"]) for m in (mock_cl, mock_ln, mock_cc)}
+    assert len(schedulers) == 1
+    assert "craigslist.org" in mock_cl.call_args.kwargs["scheduler"].limiter.host_limits
+
+
+def test_filter_by_area_sorts_nearest_first():
+    from src.handler import _filter_by_area
+
+    far = _make_listing(title="Bayview", lat=37.7340, lng=-122.3910)
+    unknown = _make_listing(title="No coords", lat=None, lng=None)
+    near = _make_listing(title="SoMa", lat=37.7785, lng=-122.3950)
+    outside = _make_listing(title="Outer Sunset", lat=37.7535, lng=-122.5050)
+
+    kept = _filter_by_area([far, unknown, near, outside])
+
+    assert [l.title for l in kept] == ["SoMa", "Bayview", "No coords"]
+    assert near.distance_miles < far.distance_miles < 4
+    assert unknown.distance_miles is None
+
+
+@patch("src.handler.get_secrets")
+@patch("src.sheets.SheetsClient")
+@patch("src.scrapers.commercialcafe.CommercialCafeScraper")
+@patch("src.scrapers.loopnet.LoopNetScraper")
+@patch("src.scrapers.craigslist.CraigslistScraper")
+@patch("src.reviewer.review_listing")
+def test_handler_geocodes_address_only_listings(
+    mock_review, mock_cl, mock_ln, mock_cc, mock_sheets_cls, mock_secrets, monkeypatch
+):
+    from src.geo import SearchRegion
+    from src.handler import lambda_handler
+    from src.reviewer import ReviewResult
+
+    # A 2-mile radius: the Lake Merced ZIP can't reach it even with its margin
+    region = SearchRegion(SEARCH_CONFIG["center_lat"], SEARCH_CONFIG["center_lng"], 2)
+    monkeypatch.setattr("src.handler._search_region", lambda: region)
+
+    mock_secrets.return_value = {"google_creds": {}, "anthropic_key": "k", "sheet_id": "s"}
+
+    mock_sheets = MagicMock()
+    mock_sheets.get_seen_urls.return_value = set()
+    mock_sheets_cls.return_value = mock_sheets
+
+    far = _make_listing(
+        title="Far", address="1650 Holloway Ave, San Francisco, CA 94132",
+        link="https://www.loopnet.com/Listing/1650-Holloway-Ave/222/", source="loopnet",
+        lat=None, lng=None,
+    )
+    near = _make_listing(
+        title="Near", address="500 Howard St, San Francisco, CA 94105",
+        link="https://www.loopnet.com/Listing/500-Howard-St/333/", source="loopnet",
+        lat=None, lng=None,
+    )
+    mock_cl.return_value.scrape.return_value = []
+    mock_ln.return_value.scrape.return_value = [far, near]
+    mock_cc.return_value.scrape.return_value = []
+
+    mock_review.return_value = ReviewResult(
+        approved=True, est_monthly_cost="$1800", suitability_score=8, reasoning="Good."
+    )
+
+    body = json.loads(lambda_handler({}, None)["body"])
+
+    assert body["candidates"] == 1
+    assert [c.args[0].title for c in mock_review.call_args_list] == ["Near"]
+
+
+@patch("src.handler.get_secrets")
+@patch("src.sheets.SheetsClient")
+@patch("src.scrapers.commercialcafe.CommercialCafeScraper")
+@patch("src.scrapers.loopnet.LoopNetScraper")
+@patch("src.scrapers.craigslist.CraigslistScraper")
+@patch("src.reviewer.review_listing")
+def test_handler_drops_address_only_listings_outside_the_city(
+    mock_review, mock_cl, mock_ln, mock_cc, mock_sheets_cls, mock_secrets
+):
+    from src.handler import lambda_handler
+    from src.reviewer import ReviewResult
+
+    mock_secrets.return_value = {"google_creds": {}, "anthropic_key": "k", "sheet_id": "s"}
+
+    mock_sheets = MagicMock()
+    mock_sheets.get_seen_urls.return_value = set()
+    mock_sheets_cls.return_value = mock_sheets
+
+    # Default search area; neither ZIP can reach it even with its margin
+    oakland = _make_listing(
+        title="Oakland", address="1 Broadway, Oakland, CA 94612",
+        link="https://www.loopnet.com/Listing/1-Broadway/444/", source="loopnet",
+        lat=None, lng=None,
+    )
+    south_sf = _make_listing(
+        title="South SF", address="100 Gateway Blvd, South San Francisco, CA 94080",
+        link="https://www.commercialcafe.com/commercial-property/us/ca/south-san-francisco/100-gateway/",
+        source="commercialcafe", lat=None, lng=None,
+    )
+    near = _make_listing(
+        title="Near", address="500 Howard St, San Francisco, CA 94105",
+        link="https://www.loopnet.com/Listing/500-Howard-St/333/", source="loopnet",
+        lat=None, lng=None,
+    )
+    mock_cl.return_value.scrape.return_value = []
+    mock_ln.return_value.scrape.return_value = [oakland, near]
+    mock_cc.return_value.scrape.return_value = [south_sf]
+
+    mock_review.return_value = ReviewResult(
+        approved=True, est_monthly_cost="$1800", suitability_score=8, reasoning="Good."
+    )
+
+    body = json.loads(lambda_handler({}, None)["body"])
+
+    assert body["candidates"] == 1
+    assert [c.args[0].title for c in mock_review.call_args_list] == ["Near"]
+
+
+def test_load_texts_stops_at_deadline():
+    import threading
+    import time
+    from src.deadline import Deadline
+    from src.handler import _load_texts
+
+    stopped = threading.Event()
+
+    def slow_loader(listing, stop):
+        if stop.wait(5):
+            stopped.set()
+            return {}
+        return {"full_text": "late"}
+
+    def fast_loader(listing, stop):
+        return {"full_text": "fetched"}
+
+    fast = _make_listing(full_text="", text_loader=fast_loader)
+    slow = _make_listing(full_text="", text_loader=slow_loader)
+    context = MagicMock()
+    context.get_remaining_time_in_millis.return_value = 200
+
+    start = time.monotonic()
+    _load_texts([fast, slow], Deadline(context, reserve_seconds=0), budget=60)
+
+    assert time.monotonic() - start < 1
+    assert fast.full_text == "fetched"
+    assert slow.full_text == ""
+    assert slow.text_loader is None
+    assert stopped.wait(1)
+
+
+def test_load_texts_ignores_fetches_that_finish_late():
+    import threading
+    import time
+    from src.deadline import Deadline
+    from src.handler import _load_texts
+
+    finished = threading.Event()
+
+    def stubborn_loader(listing, stop):
+        # Ignores stop, as a request already on the wire would
+        time.sleep(0.3)
+        finished.set()
+        return {"full_text": "late", "address": "1 Late St", "lat": 1.0, "lng": 2.0}
+
+    listing = _make_listing(full_text="", text_loader=stubborn_loader)
+
+    start = time.monotonic()
+    # Unlimited deadline: the remaining Craigslist budget is what runs out
+    _load_texts([listing], Deadline(), budget=0.05)
+
+    assert time.monotonic() - start < 0.3
+    assert finished.wait(1)
+    assert (listing.full_text, listing.address, listing.lat, listing.lng) == ("", "123 Folsom St", 37.785, -122.395)
+
+
+@patch("src.handler.get_secrets")
+@patch("src.sheets.SheetsClient")
+@patch("src.scrapers.commercialcafe.CommercialCafeScraper")
+@patch("src.scrapers.loopnet.LoopNetScraper")
+@patch("src.scrapers.craigslist.CraigslistScraper")
+@patch("src.reviewer.review_listing")
+def test_handler_loads_text_only_for_listings_past_the_prefilter(
+    mock_review, mock_cl, mock_ln, mock_cc, mock_sheets_cls, mock_secrets
+):
+    from src.reviewer import ReviewResult
+    from src.handler import lambda_handler
+
+    mock_secrets.return_value = {"google_creds": {}, "anthropic_key": "k", "sheet_id": "s"}
+    mock_sheets = MagicMock()
+    mock_sheets.get_seen_urls.return_value = set()
+    mock_sheets_cls.return_value = mock_sheets
+
+    loaded = []
+
+    def loader(listing, stop):
+        loaded.append(listing.title)
+        return {"full_text": "Fetched text."}
+
+    pricey = _make_listing(
+        title="Pricey", price="$9000", full_text="", link="https://example.com/2", text_loader=loader
+    )
+    cheap = _make_listing(title="Cheap", full_text="", text_loader=loader)
+    mock_cl.return_value.scrape.return_value = [pricey, cheap]
+    mock_cl.return_value.search_seconds = 1.0
+    mock_ln.return_value.scrape.return_value = []
+    mock_cc.return_value.scrape.return_value = []
+    mock_review.return_value = ReviewResult(
+        approved=True, est_monthly_cost="$1800", suitability_score=8, reasoning="Good."
+    )
+
+    body = json.loads(lambda_handler({}, None)["body"])
+
+    assert body["prefiltered"] == 1
+    assert loaded == ["Cheap"]
+    assert mock_review.call_args.args[0].full_text == "Fetched text."
+
+
+def test_filter_by_area_gives_zip_centroids_their_margin():
+    from src.geocode import zip_centroid
+    from src.handler import _filter_by_area
+
+    # The Visitacion Valley centroid is just past 4 miles, but most of the ZIP is inside
+    lat, lng, error = zip_centroid("CA 94134")
+    approx = _make_listing(title="Visitacion Valley", lat=lat, lng=lng, location_error_miles=error)
+    exact = _make_listing(title="Exact", lat=lat, lng=lng)
+
+    kept = _filter_by_area([approx, exact])
+
+    assert [l.title for l in kept] == ["Visitacion Valley"]
+    assert approx.distance_miles > 4
+
+
+@patch("src.handler.reset_clients")
+@patch("src.handler.get_secrets")
+@patch("src.sheets.SheetsClient")
+def test_handler_drops_cached_clients_on_credential_error(mock_sheets_cls, mock_secrets, mock_reset):
+    from types import SimpleNamespace
+    import pytest
+    from src.handler import lambda_handler
+
+    mock_secrets.return_value = {"google_creds": {}, "anthropic_key": "k", "sheet_id": "s"}
+    error = RuntimeError("PERMISSION_DENIED")
+    error.response = SimpleNamespace(status_code=403)
+    mock_sheets_cls.return_value.get_seen_urls.side_effect = error
+
+    with pytest.raises(RuntimeError):
+        lambda_handler({}, None)
+    mock_reset.assert_called_once()
+
+    mock_sheets_cls.return_value.get_seen_urls.side_effect = RuntimeError("flaky")
+    with pytest.raises(RuntimeError):
+        lambda_handler({}, None)
+    mock_reset.assert_called_once()
@@ -0,0 +1,116 @@
+from unittest.mock import MagicMock, patch
+from src.scrapers.http_cache import ResponseCache
+from src.scrapers.loopnet import LoopNetScraper
+from src.storage import LocalFileStore
+
+URL = "https://a.example/search"
+
+
+def _make_response(body="<html>page</html>", status_code=200, headers=None):
+    resp = MagicMock()
+    resp.text = body
+    resp.status_code = status_code
+    resp.headers = headers or {}
+    return resp
+
+
+def test_first_response_is_recorded_and_reported_changed(tmp_path):
+    cache = ResponseCache(LocalFileStore(str(tmp_path)))
+    resp = _make_response(headers={"ETag": '"v1"', "Last-Modified": "Mon, 05 Oct 2026 10:00:00 GMT"})
+
+    assert cache.headers_for(URL) == {}
+    assert cache.unchanged(URL, resp, "loopnet") is False
+    cache.commit("loopnet")
+    assert cache.headers_for(URL) == {
+        "If-None-Match": '"v1"',
+        "If-Modified-Since": "Mon, 05 Oct 2026 10:00:00 GMT",
+    }
+
+
+def test_same_body_is_unchanged_across_runs(tmp_path):
+    store = LocalFileStore(str(tmp_path))
+    first = ResponseCache(store)
+    first.unchanged(URL, _make_response(), "loopnet")
+    first.commit("loopnet")
+    first.save()
+
+    cache = ResponseCache(store)
+    assert cache.unchanged(URL, _make_response(), "loopnet") is True
+    assert cache.unchanged(URL, _make_response("<html>new</html>"), "loopnet") is False
+
+
+def test_not_modified_is_unchanged(tmp_path):
+    cache = ResponseCache(LocalFileStore(str(tmp_path)))
+    assert cache.unchanged(URL, _make_response("", status_code=304), "loopnet") is True
+
+
+def test_nothing_persists_without_save(tmp_path):
+    store = LocalFileStore(str(tmp_path))
+    cache = ResponseCache(store)
+    cache.unchanged(URL, _make_response(), "loopnet")
+    cache.commit("loopnet")
+    assert ResponseCache(store).entries == {}
+
+
+def test_uncommitted_source_is_not_saved(tmp_path):
+    store = LocalFileStore(str(tmp_path))
+    cache = ResponseCache(store)
+    cache.unchanged(URL, _make_response(), "loopnet")
+    cache.unchanged("https://b.example/search", _make_response(), "commercialcafe")
+    cache.commit("commercialcafe")
+    cache.save()
+
+    # loopnet's results never came back, so its page is read again next run
+    assert set(ResponseCache(store).entries) == {"https://b.example/search"}
+
+
+@patch("src.scrapers.loopnet.requests.Session")
+def test_scraper_skips_unchanged_page_without_parsing(MockSession, tmp_path):
+    cache = ResponseCache(LocalFileStore(str(tmp_path)))
+    cache.entries["https://www.loopnet.com/search/commercial-real-estate/san-francisco-ca/for-lease/"] = {
+        "etag": '"v1"',
+        "last_modified": None,
+        "hash": "x",
+    }
+    mock_session = MagicMock()
+    mock_session.get.side_effect = [_make_response(), _make_response("", status_code=304)]
+    MockSession.return_value = mock_session
+
+    with patch("src.scrapers.loopnet.parse_html") as mock_parse:
+        listings = LoopNetScraper(cache=cache, max_pages=1).scrape()
+
+    assert listings == []
+    mock_parse.assert_not_called()
+    assert mock_session.get.call_args.kwargs["headers"] == {"If-None-Match": '"v1"'}
+
+
+@patch("src.scrapers.loopnet.requests.Session")
+def test_steady_state_run_reads_one_page(MockSession, tmp_path):
+    store = LocalFileStore(str(tmp_path))
+    url = "https://www.loopnet.com/search/commercial-real-estate/san-francisco-ca/for-lease/"
+    cache = ResponseCache(store)
+    cache.entries[url] = {"etag": '"v1"', "last_modified": None, "hash": "x"}
+    mock_session = MagicMock()
+    mock_session.get.side_effect = [_make_response()] + [_make_response("", status_code=304)] * 5
+    MockSession.return_value = mock_session
+
+    assert LoopNetScraper(cache=cache, max_pages=5).scrape() == []
+    # Warmup plus page 1
+    assert mock_session.get.call_count == 2
+
+
+@patch("src.scrapers.loopnet.requests.Session")
+def test_bot_challenge_is_not_cached(MockSession, tmp_path):
+    cache = ResponseCache(LocalFileStore(str(tmp_path)))
+    url = "https://www.loopnet.com/search/commercial-real-estate/san-francisco-ca/for-lease/"
+    cache.entries[url] = {"etag": None, "last_modified": None, "hash": "real-page"}
+    mock_session = MagicMock()
+    mock_session.get.side_effect = [
+        _make_response(),
+        _make_response('<div id="sec-if-cpt-container"></div>'),
+    ]
+    MockSession.return_value = mock_session
+
+    assert LoopNetScraper(cache=cache).scrape() == []
+    cache.commit("loopnet")
+    assert cache.entries[url]["hash"] == "real-page"
@@ -0,0 +1,120 @@
+import pytest
+from src.identity import ListingIndex, merge_duplicates, normalize_address
+from src.models import Listing
+from src.storage import LocalFileStore
+
+
+def _make_listing(**kwargs) -> Listing:
+    defaults = {
+        "title": "Industrial Warehouse",
+        "price": "$2,000/mo",
+        "sqft": "800 SF",
+        "address": "100 Mission St, San Francisco, CA 94105",
+        "link": "https://www.loopnet.com/Listing/12345/",
+        "source": "loopnet",
+    }
+    defaults.update(kwargs)
+    return Listing(**defaults)
+
+
+@pytest.mark.parametrize(
+    "address, expected",
+    [
+        ("100 Mission St, San Francisco, CA 94105", "100 mission st"),
+        ("100 Mission Street", "100 mission st"),
+        ("100 MISSION ST., Suite 200", "100 mission st"),
+        ("100 Mission St #3", "100 mission st"),
+        ("100-110 Mission Street, 2nd Floor", "100 mission st"),
+        ("1 South Park Avenue Unit B", "1 s park ave"),
+        ("123 Folsom St near 2nd St", "123 folsom st"),
+        ("Mission District", None),
+        ("", None),
+    ],
+)
+def test_normalize_address(address, expected):
+    assert normalize_address(address) == expected
+
+
+def test_cross_source_copies_merge_keeping_richest_text(tmp_path):
+    index = ListingIndex(LocalFileStore(str(tmp_path)))
+    loopnet = _make_listing(full_text="Short.")
+    cafe = _make_listing(
+        source="commercialcafe",
+        link="https://www.commercialcafe.com/commercial-property/us/ca/san-francisco/100-mission-st/",
+        address="100 Mission Street, Suite 200, San Francisco, CA",
+        sqft="750 Sqft",
+        full_text="A much longer description of the same warehouse.",
+        lat=37.79,
+        lng=-122.39,
+    )
+
+    unique, dropped = merge_duplicates([loopnet, cafe], index)
+
+    assert unique == [loopnet]
+    assert dropped == 1
+    assert loopnet.full_text == "A much longer description of the same warehouse."
+    assert (loopnet.lat, loopnet.lng) == (37.79, -122.39)
+
+
+def test_different_sqft_or_same_source_stays_separate(tmp_path):
+    index = ListingIndex(LocalFileStore(str(tmp_path)))
+    small = _make_listing()
+    large = _make_listing(source="commercialcafe", link="https://cc/2", sqft="5,000 Sqft")
+    repost = _make_listing(link="https://www.loopnet.com/Listing/99999/")
+
+    unique, dropped = merge_duplicates([small, large, repost], index)
+
+    assert unique == [small, large, repost]
+    assert dropped == 0
+
+
+def test_copy_of_space_from_earlier_run_is_dropped(tmp_path):
+    store = LocalFileStore(str(tmp_path))
+    first = ListingIndex(store)
+    merge_duplicates([_make_listing()], first)
+    first.save()
+
+    cafe = _make_listing(source="commercialcafe", link="https://cc/1")
+    second = ListingIndex(store)
+    unique, dropped = merge_duplicates([cafe], second)
+    second.save()
+
+    assert unique == []
+    assert dropped == 1
+    # Next run knows the copy by id, before its text is fetched
+    assert cafe.unique_key in ListingIndex(store).copy_ids()
+
+
+def test_match_does_not_keep_space_alive(tmp_path):
+    store = LocalFileStore(str(tmp_path))
+    now = [0.0]
+    index = ListingIndex(store, ttl_days=1, clock=lambda: now[0])
+    index.add(_make_listing())
+    now[0] = 0.9 * 86400
+    assert index.match(_make_listing(source="commercialcafe", link="https://cc/1")) is not None
+    now[0] = 1.5 * 86400
+    index.save()
+
+    assert ListingIndex(store).spaces == {}
+
+
+def test_save_evicts_stale_spaces(tmp_path):
+    store = LocalFileStore(str(tmp_path))
+    now = [0.0]
+    index = ListingIndex(store, ttl_days=1, clock=lambda: now[0])
+    index.add(_make_listing())
+    now[0] = 2 * 86400
+    index.save()
+
+    assert ListingIndex(store).spaces == {}
+
+
+def test_merge_prefers_exact_location_over_geocoded(tmp_path):
+    index = ListingIndex(LocalFileStore(str(tmp_path)))
+    geocoded = _make_listing(lat=37.7898, lng=-122.3942, location_error_miles=0.7)
+    exact = _make_listing(source="commercialcafe", link="https://cc/1", lat=37.7911, lng=-122.3990)
+
+    unique, _ = merge_duplicates([geocoded, exact], index)
+
+    assert unique == [geocoded]
+    assert (geocoded.lat, geocoded.lng, geocoded.location_error_miles) == (37.7911, -122.3990, 0.0)
@@ -0,0 +1,35 @@
+import pytest
+from src.listing_ids import listing_id
+from src.models import Listing
+
+
+@pytest.mark.parametrize(
+    "link, expected",
+    [
+        ("https://sfbay.craigslist.org/sfc/off/d/warehouse-space/7712345678.html", "craigslist:7712345678"),
+        ("http://sfbay.craigslist.org/off/d/warehouse-space/7712345678.html?utm_source=x", "craigslist:7712345678"),
+        ("https://sanfrancisco.craigslist.org/sfc/off/7712345678.html", "craigslist:7712345678"),
+        ("https://www.loopnet.com/Listing/12345/100-Mission-St-San-Francisco-CA-94105/", "loopnet:12345"),
+        ("https://loopnet.com/Listing/100-Mission-St-San-Francisco-CA/12345/?ref=abc", "loopnet:12345"),
+        (
+            "https://www.commercialcafe.com/commercial-property/us/ca/san-francisco/100-Bryant-St/",
+            "commercialcafe:/commercial-property/us/ca/san-francisco/100-bryant-st",
+        ),
+        ("http://www.Example.com/listings/1/?utm_medium=mail&b=2&a=1", "https://example.com/listings/1?a=1&b=2"),
+        ("not a url", "not a url"),
+    ],
+)
+def test_listing_id(link, expected):
+    assert listing_id(link) == expected
+
+
+def test_unique_key_is_canonical_id():
+    a = Listing(
+        title="t", price="", sqft="", address="", source="craigslist",
+        link="https://sfbay.craigslist.org/sfc/off/d/space/7712345678.html",
+    )
+    b = Listing(
+        title="t", price="", sqft="", address="", source="craigslist",
+        link="http://sfbay.craigslist.org/off/d/space/7712345678.html?utm_campaign=x",
+    )
+    assert a.unique_key == b.unique_key == "craigslist:7712345678"
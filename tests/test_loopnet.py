@@ -1,6 +1,6 @@
 import pathlib
 from unittest.mock import patch, MagicMock
-from src.scrapers.loopnet import LoopNetScraper
+from src.scrapers.loopnet import SEARCH_URL, LoopNetScraper
 
 FIXTURES = pathlib.Path(__file__).parent / "fixtures"
 
@@ -21,9 +21,10 @@ def test_scrape_returns_listings(MockSession, _mock_sleep):
     results_html = (FIXTURES / "loopnet_results.html").read_text()
     warmup_resp = _make_response("<html></html>")
     search_resp = _make_response(results_html)
+    last_page = _make_response("<html><body></body></html>")
 
     mock_session = MagicMock()
-    mock_session.get.side_effect = [warmup_resp, search_resp]
+    mock_session.get.side_effect = [warmup_resp, search_resp, last_page]
     MockSession.return_value = mock_session
 
     scraper = LoopNetScraper()
@@ -89,3 +90,37 @@ def test_scrape_handles_network_error(MockSession, _mock_sleep):
     scraper = LoopNetScraper()
     listings = scraper.scrape()
     assert listings == []
+
+
+@patch("src.scrapers.loopnet.requests.Session")
+def test_scrape_walks_pages_until_one_is_all_seen(MockSession):
+    results_html = (FIXTURES / "loopnet_results.html").read_text()
+    page_1 = results_html.replace("/Listing/", "/Listing/new-")
+    mock_session = MagicMock()
+    mock_session.get.side_effect = [
+        _make_response("<html></html>"),
+        _make_response(page_1),
+        _make_response(results_html),
+    ]
+    MockSession.return_value = mock_session
+
+    scraper = LoopNetScraper(is_seen=lambda key: "/new-" not in key)
+    listings = scraper.scrape()
+
+    assert len(listings) == 4
+    urls = [c.args[0] for c in mock_session.get.call_args_list[1:]]
+    assert urls == [SEARCH_URL, f"{SEARCH_URL}2/"]
+
+
+@patch("src.scrapers.loopnet.requests.Session")
+def test_scrape_stops_at_page_cap(MockSession):
+    results_html = (FIXTURES / "loopnet_results.html").read_text()
+    pages = [results_html.replace("/Listing/", f"/Listing/p{i}-") for i in range(3)]
+    mock_session = MagicMock()
+    mock_session.get.side_effect = [_make_response("<html></html>")] + [_make_response(p) for p in pages]
+    MockSession.return_value = mock_session
+
+    listings = LoopNetScraper(max_pages=2).scrape()
+
+    assert len(listings) == 4
+    assert mock_session.get.call_count == 3
@@ -39,3 +39,76 @@ def test_listing_unique_key_is_link():
         source="craigslist",
     )
     assert listing.unique_key == "https://example.com/1"
+
+
+def _make_listing(**kwargs) -> Listing:
+    defaults = {
+        "title": "Warehouse Space 600sqft",
+        "price": "$2.50/SF/MO",
+        "sqft": "",
+        "address": "123 Folsom St",
+        "link": "https://example.com/1",
+        "source": "craigslist",
+    }
+    defaults.update(kwargs)
+    return Listing(**defaults)
+
+
+def test_listing_is_slotted():
+    listing = _make_listing()
+    assert not hasattr(listing, "__dict__")
+
+
+def test_listing_parses_numbers_at_construction():
+    listing = _make_listing()
+    assert listing.sqft_range == (600, 600)
+    assert listing.monthly_cost == (1500, 1500)
+    # The strings stay as scraped for the sheet
+    assert listing.price == "$2.50/SF/MO"
+
+
+def test_listing_reparses_when_price_or_sqft_change():
+    listing = _make_listing(price="", title="Warehouse")
+    assert listing.monthly_cost is None
+
+    listing.sqft = "1,000 SF"
+    listing.price = "$24/SF/YR"
+
+    assert listing.sqft_range == (1000, 1000)
+    assert listing.monthly_cost == (2000, 2000)
+
+
+def test_listing_round_trips_without_loader():
+    listing = _make_listing(lat=37.78, lng=-122.39, full_text="text")
+    listing.text_loader = lambda l: None
+
+    data = listing.to_dict()
+
+    assert "text_loader" not in data and "monthly_cost" not in data
+    assert Listing.from_dict({**data, "unknown": 1}) == listing
+
+
+def test_load_text_runs_deferred_fetch_once():
+    calls = []
+
+    def loader(listing, stop):
+        calls.append(listing.link)
+        return {"full_text": "Fetched text."}
+
+    listing = _make_listing(text_loader=loader)
+    listing.load_text()
+    listing.load_text()
+
+    assert listing.full_text == "Fetched text."
+    assert calls == ["https://example.com/1"]
+
+
+def test_fetch_text_leaves_listing_unchanged():
+    listing = _make_listing(full_text="", text_loader=lambda l, stop: {"full_text": "Fetched text."})
+
+    detail = listing.fetch_text()
+
+    assert detail == {"full_text": "Fetched text."}
+    assert listing.full_text == ""
+    listing.update(detail)
+    assert listing.full_text == "Fetched text."
@@ -0,0 +1,43 @@
+from src.models import Listing
+from src.normalize import parse_monthly_cost, parse_sqft
+
+
+def test_parse_sqft_forms():
+    assert parse_sqft("1,200 SF") == (1200, 1200)
+    assert parse_sqft("700 Sqft") == (700, 700)
+    assert parse_sqft("500 - 1,200 SF") == (500, 1200)
+    assert parse_sqft("600") == (600, 600)
+    assert parse_sqft("") is None
+    assert parse_sqft("Call for details") is None
+
+
+def test_parse_monthly_cost_totals():
+    assert parse_monthly_cost("$1800") == (1800, 1800)
+    assert parse_monthly_cost("$2,000/mo") == (2000, 2000)
+    assert parse_monthly_cost("$36,000/yr") == (3000, 3000)
+    assert parse_monthly_cost("$1,500 - $2,000/mo") == (1500, 2000)
+    assert parse_monthly_cost("Upon Request") is None
+
+
+def test_parse_monthly_cost_per_sqft():
+    assert parse_monthly_cost("$2.50/SF/MO", (1200, 1200)) == (3000, 3000)
+    assert parse_monthly_cost("$30/Sqft/Yearly", (700, 700)) == (1750, 1750)
+    # Annual is the default for $/SF quotes
+    assert parse_monthly_cost("$24/SF", (1000, 1000)) == (2000, 2000)
+    assert parse_monthly_cost("$24 - $36 /SF/YR", (500, 1000)) == (1000, 3000)
+
+
+def test_parse_monthly_cost_per_sqft_needs_sqft():
+    assert parse_monthly_cost("$2.50/SF/MO") is None
+
+
+def test_listing_sqft_falls_back_to_title():
+    listing = Listing(
+        title="Warehouse Space 600sqft Ground Floor",
+        price="$1,800",
+        sqft="",
+        address="",
+        link="https://example.com/1",
+        source="craigslist",
+    )
+    assert listing.sqft_range == (600, 600)
@@ -0,0 +1,77 @@
+import importlib
+import pathlib
+from unittest.mock import MagicMock
+import pytest
+from src.scrapers.commercialcafe import CommercialCafeScraper
+from src.scrapers.craigslist import CraigslistScraper
+from src.scrapers.loopnet import LoopNetScraper
+from src.scrapers.parsing import available_backends, default_backend, parse_html
+
+FIXTURES = pathlib.Path(__file__).parent / "fixtures"
+
+SCRAPERS = {
+    "craigslist_results.html": CraigslistScraper,
+    "loopnet_results.html": LoopNetScraper,
+    "commercialcafe_results.html": CommercialCafeScraper,
+}
+
+
+def _listings(fixture, backend, scoped, monkeypatch):
+    from src.config import SCRAPER_CONFIG
+    from src.scrapers import parsing
+
+    monkeypatch.setitem(SCRAPER_CONFIG, "html_parser", backend)
+    scraper = SCRAPERS[fixture](is_seen=lambda key: True)
+    module = importlib.import_module(type(scraper).__module__)
+    if scoped:
+        monkeypatch.setattr(module, "parse_html", parsing.parse_html)
+    else:
+        monkeypatch.setattr(module, "parse_html", lambda markup, only=None: parsing.parse_html(markup))
+
+    resp = MagicMock(text=(FIXTURES / fixture).read_text(), status_code=200)
+    scraper.scheduler = MagicMock()
+    scraper.scheduler.get.side_effect = lambda *a, **kw: resp
+    scraper.session = MagicMock()
+    return scraper.scrape()
+
+
+@pytest.mark.parametrize("fixture", sorted(SCRAPERS))
+@pytest.mark.parametrize("backend", available_backends())
+def test_backends_and_scoping_produce_identical_listings(fixture, backend, monkeypatch):
+    reference = _listings(fixture, "html.parser", scoped=False, monkeypatch=monkeypatch)
+    assert reference
+    assert _listings(fixture, backend, scoped=True, monkeypatch=monkeypatch) == reference
+
+
+@pytest.mark.parametrize("backend", available_backends())
+def test_detail_page_parity(backend, monkeypatch):
+    from src.config import SCRAPER_CONFIG
+    from src.models import Listing
+
+    monkeypatch.setitem(SCRAPER_CONFIG, "html_parser", backend)
+    scraper = CraigslistScraper()
+    resp = MagicMock(text=(FIXTURES / "craigslist_detail.html").read_text())
+    scraper._get = lambda url, stop=None: resp
+    listing = Listing(title="t", price="", sqft="", address="", link="https://x", source="craigslist")
+
+    scraper._fetch_detail(listing)
+
+    assert listing.address == "123 Folsom St"
+    assert (listing.lat, listing.lng) == (37.7785, -122.3950)
+    assert listing.full_text.startswith("600 sqft warehouse")
+
+
+def test_default_backend_prefers_fastest_installed(monkeypatch):
+    from src.config import SCRAPER_CONFIG
+
+    monkeypatch.setitem(SCRAPER_CONFIG, "html_parser", "")
+    assert default_backend() == available_backends()[0]
+    monkeypatch.setitem(SCRAPER_CONFIG, "html_parser", "html.parser")
+    assert default_backend() == "html.parser"
+
+
+def test_parse_html_keeps_only_scoped_elements():
+    from bs4 import SoupStrainer
+
+    soup = parse_html("<div><p class='a'>x</p><p>y</p></div>", only=SoupStrainer("p", class_="a"), backend="html.parser")
+    assert [p.get_text() for p in soup.find_all("p")] == ["x"]
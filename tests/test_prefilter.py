@@ -0,0 +1,53 @@
+from src.models import Listing
+from src.prefilter import prefilter
+
+
+def _make_listing(**kwargs) -> Listing:
+    defaults = {
+        "title": "Warehouse",
+        "price": "$1,800",
+        "sqft": "600 SF",
+        "address": "123 Folsom St",
+        "link": "https://example.com/1",
+        "source": "loopnet",
+    }
+    defaults.update(kwargs)
+    return Listing(**defaults)
+
+
+def test_passing_listing_goes_to_claude():
+    assert prefilter(_make_listing(), max_price=2400, min_sqft=400) is None
+
+
+def test_rejects_plainly_over_budget():
+    result = prefilter(_make_listing(price="$24,000/mo"), max_price=2400, min_sqft=400)
+    assert result.approved is False
+    assert result.est_monthly_cost == "$24,000"
+    assert "budget" in result.reasoning
+
+
+def test_rejects_per_sqft_price_over_budget():
+    result = prefilter(
+        _make_listing(price="$48/SF/YR", sqft="5,000 SF"), max_price=2400, min_sqft=400
+    )
+    assert result is not None
+    assert result.est_monthly_cost == "$20,000"
+
+
+def test_slightly_over_budget_is_left_for_claude():
+    assert prefilter(_make_listing(price="$2,600"), max_price=2400, min_sqft=400) is None
+
+
+def test_rejects_too_small():
+    result = prefilter(_make_listing(sqft="150 SF"), max_price=2400, min_sqft=400)
+    assert result is not None
+    assert "sqft" in result.reasoning
+
+
+def test_range_with_affordable_low_end_is_kept():
+    listing = _make_listing(price="$1,500 - $9,000/mo", sqft="300 - 2,000 SF")
+    assert prefilter(listing, max_price=2400, min_sqft=400) is None
+
+
+def test_unparseable_price_is_kept():
+    assert prefilter(_make_listing(price="Call for pricing", sqft=""), max_price=2400, min_sqft=400) is None
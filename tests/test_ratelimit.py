@@ -0,0 +1,120 @@
+import threading
+import time
+from src.scrapers.ratelimit import HostRateLimiter, parse_retry_after
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_acquire_spaces_requests_to_rate():
+    limiter = HostRateLimiter(rate_per_second=20, max_in_flight=5)
+    start = time.monotonic()
+    for _ in range(5):
+        assert limiter.acquire("a.example")
+        limiter.release("a.example")
+    # One token up front, then one every 50ms
+    assert time.monotonic() - start >= 0.2
+
+
+def test_hosts_have_separate_buckets():
+    clock = FakeClock()
+    limiter = HostRateLimiter(rate_per_second=1, clock=clock)
+    assert limiter.acquire("a.example")
+    assert limiter.acquire("b.example")
+
+
+def test_max_in_flight_caps_concurrency():
+    limiter = HostRateLimiter(rate_per_second=1000, burst=10, max_in_flight=2)
+    lock = threading.Lock()
+    active = peak = 0
+
+    def work():
+        nonlocal active, peak
+        limiter.acquire("a.example")
+        with lock:
+            active += 1
+            peak = max(peak, active)
+        time.sleep(0.02)
+        with lock:
+            active -= 1
+        limiter.release("a.example")
+
+    threads = [threading.Thread(target=work) for _ in range(6)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert peak == 2
+
+
+def test_acquire_returns_false_when_stopped():
+    clock = FakeClock()
+    limiter = HostRateLimiter(rate_per_second=0.01, clock=clock)
+    assert limiter.acquire("a.example")
+    stop = threading.Event()
+    stop.set()
+    assert limiter.acquire("a.example", stop) is False
+
+
+def test_penalize_halves_rate_and_reward_restores_it():
+    limiter = HostRateLimiter(rate_per_second=1.0, min_rate_per_second=0.2, clock=FakeClock())
+    limiter.penalize("a.example")
+    assert limiter.current_rate("a.example") == 0.5
+    for _ in range(3):
+        limiter.penalize("a.example")
+    assert limiter.current_rate("a.example") == 0.2
+    for _ in range(20):
+        limiter.reward("a.example")
+    assert limiter.current_rate("a.example") == 1.0
+
+
+def test_penalize_honours_retry_after():
+    clock = FakeClock()
+    limiter = HostRateLimiter(rate_per_second=1000, clock=clock)
+    limiter.penalize("a.example", retry_after=30)
+    stop = threading.Event()
+    threading.Timer(0.3, stop.set).start()
+    # Still blocked: the fake clock never reaches the retry-after time
+    assert limiter.acquire("a.example", stop) is False
+    clock.now = 31
+    assert limiter.acquire("a.example")
+
+
+def test_parse_retry_after():
+    assert parse_retry_after("12") == 12.0
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") is None
+
+
+def test_host_limits_apply_to_domain_and_subdomains():
+    limiter = HostRateLimiter(
+        rate_per_second=2, max_in_flight=2, host_limits={"craigslist.org": (0.5, 1)}
+    )
+    assert limiter.current_rate("sfbay.craigslist.org") == 0.5
+    assert limiter.current_rate("craigslist.org") == 0.5
+    assert limiter.current_rate("www.loopnet.com") == 2
+
+    assert limiter.acquire("sapi.craigslist.org")
+    stop = threading.Event()
+    stop.set()
+    # In-flight cap of 1 for the overridden domain
+    assert limiter.acquire("sapi.craigslist.org", stop) is False
+
+    limiter.penalize("sfbay.craigslist.org")
+    for _ in range(20):
+        limiter.reward("sfbay.craigslist.org")
+    assert limiter.current_rate("sfbay.craigslist.org") == 0.5
+
+
+def test_zero_rate_means_unpaced():
+    limiter = HostRateLimiter(rate_per_second=0, max_in_flight=5)
+    start = time.monotonic()
+    for _ in range(20):
+        assert limiter.acquire("a.example")
+        limiter.release("a.example")
+    assert time.monotonic() - start < 0.1
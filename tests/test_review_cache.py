@@ -0,0 +1,72 @@
+from src.models import Listing, ReviewResult
+from src.review_cache import ReviewCache, content_hash
+from src.storage import LocalFileStore
+
+
+def _make_listing(**kwargs) -> Listing:
+    defaults = {
+        "title": "Warehouse Space",
+        "price": "$1800/mo",
+        "sqft": "600",
+        "address": "123 Folsom St",
+        "link": "https://sfbay.craigslist.org/sfc/off/d/warehouse/1111.html",
+        "source": "craigslist",
+        "full_text": "600 sqft warehouse, roll-up door.",
+    }
+    defaults.update(kwargs)
+    return Listing(**defaults)
+
+
+RESULT = ReviewResult(
+    approved=True,
+    est_monthly_cost="$1800",
+    suitability_score=8,
+    reasoning="Good space.",
+)
+
+
+def test_content_hash_ignores_link_case_and_whitespace():
+    a = _make_listing()
+    b = _make_listing(
+        link="https://sfbay.craigslist.org/sfc/off/d/warehouse/2222.html",
+        title="  warehouse   SPACE ",
+    )
+    assert content_hash(a) == content_hash(b)
+    assert content_hash(a) != content_hash(_make_listing(price="$2500/mo"))
+
+
+def test_repost_hits_cache_and_records_link(tmp_path):
+    store = LocalFileStore(str(tmp_path))
+    cache = ReviewCache(store)
+    cache.put(_make_listing(), RESULT)
+    cache.save()
+
+    repost = _make_listing(link="https://sfbay.craigslist.org/sfc/off/d/warehouse/2222.html")
+    reloaded = ReviewCache(store)
+    assert reloaded.get(repost) == RESULT
+    entry = next(iter(reloaded.entries.values()))
+    assert repost.link in entry["links"]
+
+
+def test_expired_entries_miss_and_are_evicted(tmp_path):
+    now = [1_000_000.0]
+    cache = ReviewCache(LocalFileStore(str(tmp_path)), ttl_days=1, clock=lambda: now[0])
+    cache.put(_make_listing(), RESULT)
+
+    now[0] += 2 * 86400
+    assert cache.get(_make_listing()) is None
+    cache.save()
+    assert cache.entries == {}
+
+
+def test_parse_errors_are_not_cached(tmp_path):
+    cache = ReviewCache(LocalFileStore(str(tmp_path)))
+    failed = ReviewResult(
+        approved=False,
+        est_monthly_cost="Unknown",
+        suitability_score=0,
+        reasoning="Error parsing Claude response",
+        error=True,
+    )
+    cache.put(_make_listing(), failed)
+    assert cache.get(_make_listing()) is None
@@ -1,6 +1,11 @@
 import json
+from types import SimpleNamespace
 from unittest.mock import MagicMock, patch
-from src.reviewer import ReviewResult, review_listing
+import anthropic
+import httpx
+import pytest
+from src.deadline import Deadline
+from src.reviewer import SYSTEM_PROMPT, ReviewEngine, ReviewResult, review_listing
 from src.models import Listing
 
 
@@ -109,3 +114,235 @@ def test_review_listing_handles_malformed_json(mock_anthropic_cls):
     # Should default to rejected on parse failure
     assert result.approved is False
     assert "parse" in result.reasoning.lower() or "error" in result.reasoning.lower()
+
+
+def _json_response(approved: bool, reasoning: str) -> MagicMock:
+    response = MagicMock()
+    response.content = [
+        MagicMock(
+            text=json.dumps(
+                {
+                    "approved": approved,
+                    "est_monthly_cost": "$1800",
+                    "suitability_score": 5,
+                    "reasoning": reasoning,
+                }
+            )
+        )
+    ]
+    return response
+
+
+def _rate_limit_error(retry_after: str) -> anthropic.RateLimitError:
+    request = httpx.Request("POST", "https://api.anthropic.com/v1/messages")
+    response = httpx.Response(429, headers={"retry-after": retry_after}, request=request)
+    return anthropic.RateLimitError("rate limited", response=response, body=None)
+
+
+@patch("src.reviewer.anthropic.Anthropic")
+def test_review_engine_reuses_client_and_preserves_order(mock_anthropic_cls):
+    mock_client = MagicMock()
+    mock_anthropic_cls.return_value = mock_client
+
+    def create(**kwargs):
+        content = kwargs["messages"][0]["content"]
+        title = content.split("\n", 1)[0].removeprefix("Title: ")
+        return _json_response(True, title)
+
+    mock_client.messages.create.side_effect = create
+
+    listings = [_make_listing(title=f"Space {i}", link=f"https://example.com/{i}") for i in range(20)]
+    engine = ReviewEngine(api_key="test-key", concurrency=4)
+    results = engine.review_all(listings)
+
+    mock_anthropic_cls.assert_called_once()
+    assert [r.reasoning for r in results] == [f"Space {i}" for i in range(20)]
+
+
+@patch("src.reviewer.time.sleep")
+@patch("src.reviewer.anthropic.Anthropic")
+def test_review_engine_retries_after_rate_limit(mock_anthropic_cls, mock_sleep):
+    mock_client = MagicMock()
+    mock_anthropic_cls.return_value = mock_client
+    mock_client.messages.create.side_effect = [
+        _rate_limit_error("7"),
+        _json_response(False, "Over budget."),
+    ]
+
+    engine = ReviewEngine(api_key="test-key", concurrency=1)
+    results = engine.review_all([_make_listing()])
+
+    assert results[0].reasoning == "Over budget."
+    assert mock_client.messages.create.call_count == 2
+    assert mock_sleep.call_args[0][0] > 6
+
+
+@patch("src.reviewer.time.sleep")
+@patch("src.reviewer.anthropic.Anthropic")
+def test_review_engine_gives_up_after_max_retries(mock_anthropic_cls, _mock_sleep):
+    mock_client = MagicMock()
+    mock_anthropic_cls.return_value = mock_client
+    mock_client.messages.create.side_effect = _rate_limit_error("1")
+
+    engine = ReviewEngine(api_key="test-key", concurrency=1, max_retries=2)
+    with pytest.raises(anthropic.RateLimitError):
+        engine.review_all([_make_listing()])
+
+    assert mock_client.messages.create.call_count == 3
+
+
+@patch("src.reviewer.anthropic.Anthropic")
+def test_review_listing_marks_system_prompt_cacheable(mock_anthropic_cls):
+    mock_client = MagicMock()
+    mock_anthropic_cls.return_value = mock_client
+    mock_client.messages.create.return_value = _json_response(True, "ok")
+
+    review_listing(_make_listing(), api_key="test-key")
+
+    system = mock_client.messages.create.call_args.kwargs["system"]
+    assert system[0]["text"] == SYSTEM_PROMPT
+    assert system[0]["cache_control"] == {"type": "ephemeral"}
+
+
+def test_single_and_batch_requests_share_system_prompt_without_format_clash():
+    from src.reviewer import review_batch
+
+    client = MagicMock()
+    client.messages.create.return_value = _json_response(True, "ok")
+    review_listing(_make_listing(), client=client)
+    single = client.messages.create.call_args.kwargs
+
+    client.messages.create.return_value.content[0].text = "[]"
+    review_batch([_make_listing(), _make_listing()], client=client)
+    batch = client.messages.create.call_args.kwargs
+
+    assert single["system"] == batch["system"]
+    assert "JSON" not in SYSTEM_PROMPT
+    assert "ONLY valid JSON:" in single["messages"][0]["content"]
+    assert "JSON array" in batch["messages"][0]["content"]
+
+
+@patch("src.reviewer.anthropic.Anthropic")
+def test_review_engine_totals_token_usage(mock_anthropic_cls):
+    mock_client = MagicMock()
+    mock_anthropic_cls.return_value = mock_client
+
+    def create(**kwargs):
+        response = _json_response(True, "ok")
+        response.usage = SimpleNamespace(
+            input_tokens=20,
+            output_tokens=50,
+            cache_creation_input_tokens=0,
+            cache_read_input_tokens=300,
+        )
+        return response
+
+    mock_client.messages.create.side_effect = create
+
+    engine = ReviewEngine(api_key="test-key", concurrency=3)
+    engine.review_all([_make_listing(link=f"https://example.com/{i}") for i in range(4)])
+
+    assert engine.usage.as_dict() == {
+        "requests": 4,
+        "input_tokens": 80,
+        "output_tokens": 200,
+        "cache_creation_input_tokens": 0,
+        "cache_read_input_tokens": 1200,
+    }
+
+
+def _batch_response(entries) -> MagicMock:
+    response = MagicMock()
+    response.content = [MagicMock(text=json.dumps(entries))]
+    return response
+
+
+@patch("src.reviewer.anthropic.Anthropic")
+def test_review_engine_batches_listings_per_request(mock_anthropic_cls):
+    mock_client = MagicMock()
+    mock_anthropic_cls.return_value = mock_client
+
+    def create(**kwargs):
+        content = kwargs["messages"][0]["content"]
+        count = content.count("=== Listing ")
+        if count == 0:
+            return _json_response(True, "single")
+        entries = [
+            {"index": i, "approved": True, "est_monthly_cost": "$1800",
+             "suitability_score": 7, "reasoning": f"entry {i}"}
+            for i in reversed(range(count))
+        ]
+        return _batch_response(entries)
+
+    mock_client.messages.create.side_effect = create
+
+    listings = [_make_listing(link=f"https://example.com/{i}") for i in range(7)]
+    engine = ReviewEngine(api_key="test-key", concurrency=2, batch_size=3)
+    results = engine.review_all(listings)
+
+    assert mock_client.messages.create.call_count == 3
+    assert [r.reasoning for r in results] == [
+        "entry 0", "entry 1", "entry 2", "entry 0", "entry 1", "entry 2", "single",
+    ]
+
+
+@patch("src.reviewer.anthropic.Anthropic")
+def test_review_engine_retries_missing_batch_entries_individually(mock_anthropic_cls):
+    mock_client = MagicMock()
+    mock_anthropic_cls.return_value = mock_client
+    mock_client.messages.create.side_effect = [
+        _batch_response([
+            {"index": 0, "approved": True, "est_monthly_cost": "$1800",
+             "suitability_score": 7, "reasoning": "batched"},
+            {"index": 2, "est_monthly_cost": "$1800"},  # malformed: no "approved"
+        ]),
+        _json_response(False, "single 1"),
+        _json_response(False, "single 2"),
+    ]
+
+    listings = [_make_listing(link=f"https://example.com/{i}") for i in range(3)]
+    engine = ReviewEngine(api_key="test-key", concurrency=1, batch_size=3)
+    results = engine.review_all(listings)
+
+    assert [r.reasoning for r in results] == ["batched", "single 1", "single 2"]
+    assert mock_client.messages.create.call_count == 3
+
+
+@patch("src.reviewer.anthropic.Anthropic")
+def test_review_engine_retries_unparseable_batch_individually(mock_anthropic_cls):
+    mock_client = MagicMock()
+    mock_anthropic_cls.return_value = mock_client
+    mock_client.messages.create.side_effect = [
+        _batch_response({"not": "an array"}),
+        _json_response(True, "a"),
+        _json_response(True, "b"),
+    ]
+
+    listings = [_make_listing(link=f"https://example.com/{i}") for i in range(2)]
+    engine = ReviewEngine(api_key="test-key", concurrency=1, batch_size=2)
+    results = engine.review_all(listings)
+
+    assert [r.reasoning for r in results] == ["a", "b"]
+
+
+@patch("src.reviewer.anthropic.Anthropic")
+def test_review_engine_defers_reviews_past_deadline(mock_anthropic_cls):
+    now = [0.0]
+    mock_client = MagicMock()
+    mock_anthropic_cls.return_value = mock_client
+
+    def create(**kwargs):
+        now[0] += 10
+        return _json_response(True, "ok")
+
+    mock_client.messages.create.side_effect = create
+    context = MagicMock()
+    context.get_remaining_time_in_millis.return_value = 80_000
+    deadline = Deadline(context, reserve_seconds=45, clock=lambda: now[0])
+
+    listings = [_make_listing(link=f"https://example.com/{i}") for i in range(5)]
+    engine = ReviewEngine(api_key="test-key", concurrency=1, estimate_seconds=10)
+    with patch("src.reviewer.time.monotonic", lambda: now[0]):
+        results = engine.review_all(listings, deadline=deadline)
+
+    assert [r is not None for r in results] == [True, True, True, False, False]
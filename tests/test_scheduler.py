@@ -0,0 +1,102 @@
+import threading
+from unittest.mock import MagicMock
+import pytest
+from src.scrapers.ratelimit import HostRateLimiter
+from src.scrapers.scheduler import RequestScheduler
+
+
+def _make_response(status_code=200, headers=None):
+    resp = MagicMock()
+    resp.status_code = status_code
+    resp.headers = headers or {}
+    resp.raise_for_status = MagicMock()
+    if status_code >= 400:
+        resp.raise_for_status.side_effect = Exception(f"HTTP {status_code}")
+    return resp
+
+
+def _make_scheduler(**kwargs):
+    limiter = HostRateLimiter(rate_per_second=1000, burst=10)
+    return RequestScheduler(limiter, backoff_seconds=0.01, **kwargs)
+
+
+def test_get_returns_response():
+    session = MagicMock()
+    session.get.return_value = _make_response()
+    scheduler = _make_scheduler()
+
+    resp = scheduler.get(session, "https://a.example/x", timeout=5)
+
+    assert resp is session.get.return_value
+    session.get.assert_called_once_with("https://a.example/x", timeout=5)
+
+
+def test_get_retries_transient_failures():
+    session = MagicMock()
+    session.get.side_effect = [Exception("reset"), _make_response(503), _make_response()]
+    scheduler = _make_scheduler(max_retries=2)
+
+    resp = scheduler.get(session, "https://a.example/x")
+
+    assert resp.status_code == 200
+    assert session.get.call_count == 3
+
+
+def test_get_raises_after_retries_exhausted():
+    session = MagicMock()
+    session.get.return_value = _make_response(503)
+    scheduler = _make_scheduler(max_retries=1)
+
+    with pytest.raises(Exception, match="HTTP 503"):
+        scheduler.get(session, "https://a.example/x")
+    assert session.get.call_count == 2
+
+
+def test_get_does_not_retry_client_errors():
+    session = MagicMock()
+    session.get.return_value = _make_response(404)
+    scheduler = _make_scheduler(max_retries=3)
+
+    with pytest.raises(Exception, match="HTTP 404"):
+        scheduler.get(session, "https://a.example/x")
+    assert session.get.call_count == 1
+
+
+def test_rate_limited_response_slows_host_and_honours_retry_after():
+    session = MagicMock()
+    session.get.side_effect = [_make_response(429, {"Retry-After": "0.2"}), _make_response()]
+    scheduler = _make_scheduler()
+    paused = []
+    scheduler.limiter.pause = lambda host, seconds: paused.append((host, seconds))
+
+    scheduler.get(session, "https://a.example/x")
+
+    assert paused == [("a.example", 0.2)]
+    assert scheduler.limiter.current_rate("a.example") < 1000
+
+
+def test_backoff_doubles_without_retry_after():
+    session = MagicMock()
+    session.get.side_effect = [_make_response(500), _make_response(500), _make_response()]
+    scheduler = _make_scheduler(max_retries=2)
+    paused = []
+    scheduler.limiter.pause = lambda host, seconds: paused.append(seconds)
+
+    scheduler.get(session, "https://a.example/x")
+
+    assert paused == [0.01, 0.02]
+
+
+def test_get_returns_none_when_stopped():
+    session = MagicMock()
+    stop = threading.Event()
+    stop.set()
+
+    assert _make_scheduler().get(session, "https://a.example/x", stop) is None
+    session.get.assert_not_called()
+
+
+def test_make_scheduler_keeps_explicit_zero(monkeypatch):
+    from src.scrapers.scheduler import make_scheduler
+
+    assert make_scheduler(rate_per_second=0).limiter.rate_per_second == 0
@@ -0,0 +1,110 @@
+import threading
+import time
+from unittest.mock import patch
+from src.models import Listing
+from src.scrape import scrape_all
+
+
+def _listing(n: int, source: str = "craigslist") -> Listing:
+    return Listing(
+        title=f"Space {n}",
+        price="",
+        sqft="",
+        address="",
+        link=f"https://example.com/{source}/{n}",
+        source=source,
+    )
+
+
+def test_scrape_all_runs_sources_concurrently():
+    def slow(stop):
+        time.sleep(0.3)
+        return [_listing(1)]
+
+    start = time.monotonic()
+    results = scrape_all({"a": slow, "b": slow, "c": slow}, {"a": 5, "b": 5, "c": 5})
+    elapsed = time.monotonic() - start
+
+    assert [len(v) for v in results.values()] == [1, 1, 1]
+    assert elapsed < 0.8
+
+
+def test_scrape_all_stops_source_over_budget_and_keeps_partial():
+    def cooperative(stop):
+        found = []
+        for i in range(100):
+            if stop.is_set():
+                break
+            found.append(_listing(i))
+            stop.wait(0.05)
+        return found
+
+    def fast(stop):
+        return [_listing(1, "loopnet")]
+
+    results = scrape_all({"craigslist": cooperative, "loopnet": fast}, {"craigslist": 0.2, "loopnet": 5})
+
+    assert 0 < len(results["craigslist"]) < 100
+    assert results["loopnet"][0].source == "loopnet"
+
+
+@patch("src.scrape.STOP_GRACE_SECONDS", 0.1)
+def test_scrape_all_drops_blocked_source():
+    release = threading.Event()
+
+    def blocked(stop):
+        release.wait(5)
+        return [_listing(1)]
+
+    def fast(stop):
+        return [_listing(2, "loopnet")]
+
+    completed = []
+    results = scrape_all(
+        {"craigslist": blocked, "loopnet": fast},
+        {"craigslist": 0.1, "loopnet": 5},
+        on_complete=completed.append,
+    )
+    release.set()
+
+    assert results["craigslist"] == []
+    assert len(results["loopnet"]) == 1
+    assert completed == ["loopnet"]
+
+
+def test_scrape_all_isolates_failing_source():
+    def broken(stop):
+        raise RuntimeError("boom")
+
+    def fast(stop):
+        return [_listing(1, "commercialcafe")]
+
+    completed = []
+    results = scrape_all(
+        {"loopnet": broken, "commercialcafe": fast},
+        {"loopnet": 5, "commercialcafe": 5},
+        on_complete=completed.append,
+    )
+
+    assert results["loopnet"] == []
+    assert len(results["commercialcafe"]) == 1
+    assert completed == ["commercialcafe"]
+
+
+def test_scrape_all_stops_each_source_at_its_own_budget():
+    stopped_at = {}
+    start = time.monotonic()
+
+    def slow(stop):
+        time.sleep(0.6)
+        return [_listing(1)]
+
+    def blocking(stop):
+        stop.wait(5)
+        stopped_at["b"] = time.monotonic() - start
+        return []
+
+    results = scrape_all({"a": slow, "b": blocking}, {"a": 1.0, "b": 0.1})
+
+    assert len(results["a"]) == 1
+    assert stopped_at["b"] < 0.4
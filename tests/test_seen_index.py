@@ -0,0 +1,90 @@
+from src.seen_index import SeenIndex
+from src.storage import LocalFileStore
+
+
+class FakeSheets:
+    """Tabs as lists of links starting at row 2, on a grid with blank trailing rows."""
+
+    def __init__(self, approved: list[str], rejected: list[str], blank_rows: int = 5):
+        self.tabs = {"Approved": list(approved), "Rejected": list(rejected)}
+        self.blank_rows = blank_rows
+        self.range_reads: list[tuple[str, int, int]] = []
+
+    def insert(self, tab_name: str, links: list[str]) -> None:
+        self.tabs[tab_name][:0] = links
+
+    def row_count(self, tab_name: str) -> int:
+        return 1 + len(self.tabs[tab_name]) + self.blank_rows
+
+    def get_link_range(self, tab_name: str, first_row: int, last_row: int) -> list[str]:
+        self.range_reads.append((tab_name, first_row, last_row))
+        column = [""] + self.tabs[tab_name] + [""] * self.blank_rows
+        return column[first_row - 1:last_row]
+
+
+def test_first_sync_reads_everything(tmp_path):
+    sheets = FakeSheets(["a1", "a2"], ["r1"])
+    seen = SeenIndex(LocalFileStore(str(tmp_path))).sync(sheets)
+    assert seen == {"a1", "a2", "r1"}
+
+
+def test_sync_reads_only_new_rows(tmp_path):
+    store = LocalFileStore(str(tmp_path))
+    sheets = FakeSheets(["a1", "a2"], ["r1", "r2", "r3"])
+    SeenIndex(store).sync(sheets)
+
+    sheets.insert("Rejected", ["r5", "r4"])
+    sheets.range_reads.clear()
+    seen = SeenIndex(store).sync(sheets)
+
+    assert seen == {"a1", "a2", "r1", "r2", "r3", "r4", "r5"}
+    # Approved: just the anchor cell; Rejected: two new rows plus the anchor.
+    assert sheets.range_reads == [("Approved", 2, 2), ("Rejected", 2, 4)]
+
+
+def test_sync_rebuilds_when_rows_deleted(tmp_path):
+    store = LocalFileStore(str(tmp_path))
+    sheets = FakeSheets(["a1", "a2"], ["r1", "r2"])
+    SeenIndex(store).sync(sheets)
+
+    sheets.tabs["Approved"].remove("a2")
+    seen = SeenIndex(store).sync(sheets)
+
+    assert seen == {"a1", "r1", "r2"}
+
+
+def test_sync_rebuilds_when_anchor_moved(tmp_path):
+    store = LocalFileStore(str(tmp_path))
+    sheets = FakeSheets(["a1", "a2"], ["r1"])
+    SeenIndex(store).sync(sheets)
+
+    # Same row count, but a human replaced the top row.
+    sheets.tabs["Approved"][0] = "a9"
+    seen = SeenIndex(store).sync(sheets)
+
+    assert seen == {"a9", "a2", "r1"}
+
+
+def test_sync_stores_canonical_ids(tmp_path):
+    sheets = FakeSheets(["https://sfbay.craigslist.org/sfc/off/d/space/7712345678.html"], [])
+    seen = SeenIndex(LocalFileStore(str(tmp_path))).sync(sheets)
+    assert seen == {"craigslist:7712345678"}
+
+
+def test_index_of_raw_links_is_migrated_to_ids(tmp_path):
+    from src.storage import save_json
+
+    store = LocalFileStore(str(tmp_path))
+    link = "https://sfbay.craigslist.org/sfc/off/d/space/7712345678.html"
+    sheets = FakeSheets([link], [])
+    save_json(store, "seen_index.json", {
+        "version": 1,
+        "tabs": {
+            "Approved": {"rows": sheets.row_count("Approved"), "anchor": link, "keys": [link]},
+            "Rejected": {"rows": sheets.row_count("Rejected"), "anchor": "", "keys": []},
+        },
+    })
+
+    seen = SeenIndex(store).sync(sheets)
+
+    assert seen == {"craigslist:7712345678"}
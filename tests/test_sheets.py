@@ -1,4 +1,6 @@
 from unittest.mock import MagicMock, patch
+import gspread
+import pytest
 from src.sheets import SheetsClient
 
 APPROVED_HEADERS = [
@@ -63,9 +65,12 @@ def test_append_approved(mock_auth):
         suitability_score="8",
         ai_notes="Good space for woodworking",
     )
+    mock_approved.insert_rows.assert_not_called()
+    client.flush()
 
-    mock_approved.append_row.assert_called_once()
-    row = mock_approved.append_row.call_args[0][0]
+    mock_approved.insert_rows.assert_called_once()
+    assert mock_approved.insert_rows.call_args.kwargs["row"] == 2
+    row = mock_approved.insert_rows.call_args[0][0][0]
     assert row[0] == "Warehouse"
     assert row[4] == "https://example.com/1"
     assert len(row) == len(APPROVED_HEADERS)
@@ -90,9 +95,99 @@ def test_append_rejected(mock_auth):
         suitability_score="2",
         rejection_reason="Carpeted office, no ventilation",
     )
+    client.flush()
 
-    mock_rejected.append_row.assert_called_once()
-    row = mock_rejected.append_row.call_args[0][0]
+    mock_rejected.insert_rows.assert_called_once()
+    row = mock_rejected.insert_rows.call_args[0][0][0]
     assert row[0] == "Office Suite"
     assert row[8] == "Carpeted office, no ventilation"
     assert len(row) == len(REJECTED_HEADERS)
+
+
+def _rejected_kwargs(n: int) -> dict:
+    return dict(
+        title=f"Space {n}",
+        price="$2000",
+        sqft="500",
+        address="456 Market St",
+        link=f"https://example.com/{n}",
+        date_found="2026-02-15",
+        est_monthly_cost="$2000",
+        suitability_score="2",
+        rejection_reason="Carpeted office",
+    )
+
+
+def _quota_error() -> gspread.exceptions.APIError:
+    response = MagicMock()
+    response.status_code = 429
+    response.json.return_value = {
+        "error": {"code": 429, "message": "Quota exceeded", "status": "RESOURCE_EXHAUSTED"}
+    }
+    return gspread.exceptions.APIError(response)
+
+
+@patch("src.sheets.gspread.service_account_from_dict")
+def test_flush_writes_one_batch_per_tab_newest_first(mock_auth):
+    mock_sheet = MagicMock()
+    tabs = {"Approved": MagicMock(), "Rejected": MagicMock()}
+    mock_sheet.worksheet.side_effect = lambda name: tabs[name]
+    mock_auth.return_value.open_by_key.return_value = mock_sheet
+
+    client = SheetsClient(credentials_dict={}, sheet_id="test")
+    for n in range(3):
+        client.append_rejected(**_rejected_kwargs(n))
+    client.flush()
+    client.flush()  # nothing left to write
+
+    tabs["Approved"].insert_rows.assert_not_called()
+    tabs["Rejected"].insert_rows.assert_called_once()
+    rows = tabs["Rejected"].insert_rows.call_args[0][0]
+    assert [r[0] for r in rows] == ["Space 2", "Space 1", "Space 0"]
+
+
+@patch("src.sheets.time.sleep")
+@patch("src.sheets.gspread.service_account_from_dict")
+def test_flush_retries_on_quota_error(mock_auth, mock_sleep):
+    mock_sheet = MagicMock()
+    mock_rejected = MagicMock()
+    mock_rejected.insert_rows.side_effect = [_quota_error(), None]
+    mock_sheet.worksheet.return_value = mock_rejected
+    mock_auth.return_value.open_by_key.return_value = mock_sheet
+
+    client = SheetsClient(credentials_dict={}, sheet_id="test")
+    client.append_rejected(**_rejected_kwargs(1))
+    client.flush()
+
+    assert mock_rejected.insert_rows.call_count == 2
+    mock_sleep.assert_called_once()
+
+
+@patch("src.sheets.time.sleep")
+@patch("src.sheets.gspread.service_account_from_dict")
+def test_flush_raises_after_max_retries(mock_auth, _mock_sleep):
+    mock_sheet = MagicMock()
+    mock_rejected = MagicMock()
+    mock_rejected.insert_rows.side_effect = _quota_error()
+    mock_sheet.worksheet.return_value = mock_rejected
+    mock_auth.return_value.open_by_key.return_value = mock_sheet
+
+    client = SheetsClient(credentials_dict={}, sheet_id="test")
+    client.append_rejected(**_rejected_kwargs(1))
+    with pytest.raises(gspread.exceptions.APIError):
+        client.flush()
+
+
+@patch("src.sheets.gspread.service_account_from_dict")
+def test_get_link_range_pads_trailing_blanks(mock_auth):
+    mock_sheet = MagicMock()
+    mock_ws = MagicMock()
+    mock_ws.get_values.return_value = [["https://example.com/1"], [], ["https://example.com/3"]]
+    mock_sheet.worksheet.return_value = mock_ws
+    mock_auth.return_value.open_by_key.return_value = mock_sheet
+
+    client = SheetsClient(credentials_dict={}, sheet_id="test")
+    links = client.get_link_range("Rejected", 2, 6)
+
+    mock_ws.get_values.assert_called_once_with("E2:E6")
+    assert links == ["https://example.com/1", "", "https://example.com/3", "", ""]
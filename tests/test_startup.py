@@ -0,0 +1,50 @@
+"""Cold-start guard: importing the Lambda entry point must stay cheap.
+
+Runs `python -X importtime -c "import src.handler"` in a fresh interpreter
+and fails if the handler's cumulative import time exceeds the budget, or if
+any heavy dependency is imported at module load instead of on first use.
+"""
+
+import os
+import pathlib
+import subprocess
+import sys
+
+ROOT = pathlib.Path(__file__).resolve().parent.parent
+STARTUP_BUDGET_MS = float(os.environ.get("STARTUP_BUDGET_MS", "250"))
+HEAVY_MODULES = ("boto3", "botocore", "gspread", "anthropic", "curl_cffi", "bs4", "requests", "numpy")
+
+
+def _import_handler(*flags: str) -> subprocess.CompletedProcess:
+    code = "import sys, src.handler; print(' '.join(sorted(sys.modules)))"
+    return subprocess.run(
+        [sys.executable, *flags, "-c", code],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+
+def _cumulative_us(importtime_output: str, module: str) -> int:
+    for line in importtime_output.splitlines():
+        parts = [p.strip() for p in line.removeprefix("import time:").split("|")]
+        if len(parts) == 3 and parts[2] == module:
+            return int(parts[1])
+    raise AssertionError(f"{module} not found in -X importtime output")
+
+
+def test_handler_import_skips_heavy_dependencies():
+    loaded = set(_import_handler().stdout.split())
+    assert not [m for m in HEAVY_MODULES if m in loaded]
+
+
+def test_handler_import_time_within_budget():
+    # Best of three, to keep a noisy machine from failing the build
+    timings = [
+        _cumulative_us(_import_handler("-X", "importtime").stderr, "src.handler")
+        for _ in range(3)
+    ]
+    assert min(timings) / 1000 <= STARTUP_BUDGET_MS, (
+        f"src.handler import took {min(timings) / 1000:.0f}ms, budget {STARTUP_BUDGET_MS:.0f}ms"
+    )
@@ -0,0 +1,24 @@
+from src.storage import LocalFileStore, load_json, save_json
+
+
+def test_local_store_round_trip(tmp_path):
+    store = LocalFileStore(str(tmp_path / "state"))
+    store.put("nested/key.json", b"hello")
+    assert store.get("nested/key.json") == b"hello"
+
+
+def test_local_store_missing_key(tmp_path):
+    store = LocalFileStore(str(tmp_path))
+    assert store.get("missing.json") is None
+
+
+def test_load_json_default_on_corrupt_file(tmp_path):
+    store = LocalFileStore(str(tmp_path))
+    store.put("bad.json", b"{not json")
+    assert load_json(store, "bad.json", {"fresh": True}) == {"fresh": True}
+
+
+def test_save_and_load_json(tmp_path):
+    store = LocalFileStore(str(tmp_path))
+    save_json(store, "state.json", {"a": [1, 2]})
+    assert load_json(store, "state.json") == {"a": [1, 2]}